@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+KIS 체결 프레임 파싱 벤치마크 (Fast-Path vs 기존 경로)
+- 기존: body 전체 split -> MarketData(pydantic 검증) -> model_dump_json()
+- Fast: maxsplit 필드 추출 -> TickRecord -> model_dump_json()
+
+Usage:
+    PYTHONPATH=. python scripts/benchmark_frame_parser.py [iterations]
+"""
+import sys
+import time
+
+from src.data_ingestion.price.kr.real_collector import KRRealCollector
+from src.data_ingestion.price.us.real_collector import USRealCollector
+
+# H0STCNT0 43 필드 샘플 (kis_schema_mapping 참조)
+KR_BODY = "^".join([
+    "005930", "093001", "75000", "2", "500", "0.67", "74900", "74500", "75200", "74400",
+    "75100", "75000", "10", "1234567", "92345678900", "100", "200", "100", "105.3", "5000",
+    "6000", "1", "55.0", "80.1", "090000", "2", "500", "091000", "5", "-200",
+    "090500", "2", "600", "20261018", "20", "N", "1000", "2000", "300000", "400000",
+    "0.5", "1000000", "90.0",
+])
+
+# HDFSCNT0 26 필드 샘플
+US_BODY = "^".join([
+    "DNASAAPL", "AAPL", "4", "20261018", "093001", "20261018", "223001", "200.10", "201.00", "199.50",
+    "200.00", "200.50", "2.50", "1500", "1.26", "200.40", "200.60", "10", "20", "100",
+    "1234567", "246913400", "10", "20", "105.3", "1",
+])
+
+
+def measure(fn, body: str, iterations: int) -> float:
+    """ticks/sec 측정 (파싱 + 직렬화)"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(body).model_dump_json()
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    print(f"{'tr_id':<10} {'current (ticks/s)':>18} {'fast (ticks/s)':>16} {'speedup':>8}")
+    for tr_id, collector, body in [
+        ("H0STCNT0", KRRealCollector(), KR_BODY),
+        ("HDFSCNT0", USRealCollector(), US_BODY),
+    ]:
+        current = measure(collector.parse_tick, body, iterations)
+        fast = measure(collector.parse_fast, body, iterations)
+        print(f"{tr_id:<10} {current:>18,.0f} {fast:>16,.0f} {fast / current:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+최신 상태 조회 지연 벤치마크 (DB ORDER BY time DESC LIMIT vs API 메모리 캐시)
+- /api/v1/ticks, /api/v1/orderbook 조회 경로의 p50/p99 (us) 비교
+- DB 경로는 실제 market_ticks / market_orderbook 최신 데이터가 있는 종목으로 측정
+
+Usage:
+    PYTHONPATH=. python scripts/benchmark_latest_state.py [symbol] [iterations]
+"""
+import asyncio
+import sys
+from datetime import datetime
+
+import asyncpg
+
+from src.api.main import DB_HOST, DB_NAME, DB_PASSWORD, DB_PORT, DB_USER, orderbook_response
+from src.api.state_cache import LatestStateCache
+from src.core.latency import LatencyHistogram, now_ns
+
+TICKS_SQL = """
+    SELECT time, symbol, price, volume, change
+    FROM market_ticks WHERE symbol = $1 ORDER BY time DESC LIMIT $2
+"""
+ORDERBOOK_SQL = "SELECT * FROM market_orderbook WHERE symbol = $1 ORDER BY time DESC LIMIT 1"
+
+
+async def measure(fn, iterations: int) -> dict:
+    histogram = LatencyHistogram()
+    for _ in range(iterations):
+        started = now_ns()
+        await fn()
+        histogram.record((now_ns() - started) // 1000)
+    return histogram.summary()
+
+
+def warm_cache(symbol: str) -> LatestStateCache:
+    cache = LatestStateCache()
+    for i in range(cache.tick_capacity):
+        cache.update({"type": "ticker", "symbol": symbol, "price": 75000.0 + i, "volume": 1.0,
+                      "change": 0.0, "timestamp": datetime.now().isoformat()})
+    cache.update({"type": "orderbook", "symbol": symbol, "timestamp": datetime.now().isoformat(),
+                  "asks": [{"price": 75100.0 + i, "vol": 10.0} for i in range(9)],
+                  "bids": [{"price": 75000.0 - i, "vol": 20.0} for i in range(9)]})
+    return cache
+
+
+async def main():
+    symbol = sys.argv[1] if len(sys.argv) > 1 else "005930"
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    pool = await asyncpg.create_pool(user=DB_USER, password=DB_PASSWORD, database=DB_NAME, host=DB_HOST, port=DB_PORT)
+    cache = warm_cache(symbol)
+
+    async def db_ticks():
+        async with pool.acquire() as conn:
+            return [dict(r) for r in await conn.fetch(TICKS_SQL, symbol, 100)]
+
+    async def db_orderbook():
+        async with pool.acquire() as conn:
+            return await conn.fetchrow(ORDERBOOK_SQL, symbol)
+
+    async def memory_ticks():
+        return cache.recent_ticks(symbol, 100)
+
+    async def memory_orderbook():
+        return orderbook_response(cache.latest_orderbook(symbol))
+
+    results = {
+        "ticks (DB)": await measure(db_ticks, iterations),
+        "ticks (memory)": await measure(memory_ticks, iterations),
+        "orderbook (DB)": await measure(db_orderbook, iterations),
+        "orderbook (memory)": await measure(memory_orderbook, iterations),
+    }
+    await pool.close()
+
+    print(f"symbol={symbol} iterations={iterations:,}")
+    print(f"{'path':<20}{'p50 us':>10}{'p99 us':>10}{'max us':>10}")
+    for name, summary in results.items():
+        print(f"{name:<20}{summary['p50']:>10}{summary['p99']:>10}{summary['max']:>10}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
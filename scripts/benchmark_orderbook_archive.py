@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+호가 적재 경로 벤치마크 (단건 INSERT vs COPY 배치)
+- TimescaleArchiver.save_orderbook (메시지당 22-파라미터 INSERT) 와
+  copy_records_to_table 배치 적재의 처리량(rows/s) 비교
+- 저장 레이아웃 비교: 5레벨 컬럼(market_orderbook) vs 9레벨 packed 배열(market_orderbook_depth)
+  COPY 처리량 및 행당 디스크 사용량 (압축 전 기준, 압축은 하이퍼테이블에서만 적용)
+- 동일 컬럼의 TEMP 테이블에 적재 (운영 테이블 미변경)
+
+Usage:
+    PYTHONPATH=. python scripts/benchmark_orderbook_archive.py [rows] [batch_size]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+
+import asyncpg
+
+from src.data_ingestion.archiver.timescale_archiver import (
+    DB_HOST, DB_NAME, DB_PASSWORD, DB_PORT, DB_USER, DEPTH_COLUMNS, ORDERBOOK_COLUMNS, TimescaleArchiver,
+)
+
+TABLE = "bench_orderbook"
+DEPTH_TABLE = "bench_orderbook_depth"
+
+
+def snapshots(n: int, depth: int = 5):
+    base = datetime.now()
+    for i in range(n):
+        yield {
+            "symbol": f"{i % 200:06d}",
+            "timestamp": (base + timedelta(microseconds=i)).isoformat(),
+            "asks": [{"price": 75100.0 + lv * 100, "vol": 10.0 + i % 7} for lv in range(depth)],
+            "bids": [{"price": 75000.0 - lv * 100, "vol": 20.0 + i % 5} for lv in range(depth)],
+            "total_ask_vol": 1000.0 + i % 11,
+            "total_bid_vol": 2000.0 + i % 13,
+        }
+
+
+async def copy_rate(conn, table: str, records: list, columns: list, batch_size: int) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(records), batch_size):
+        await conn.copy_records_to_table(table, records=records[i:i + batch_size], columns=columns)
+    return time.perf_counter() - start
+
+
+async def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    conn = await asyncpg.connect(user=DB_USER, password=DB_PASSWORD, database=DB_NAME, host=DB_HOST, port=DB_PORT)
+    columns = ", ".join(f"{c} DOUBLE PRECISION" for c in ORDERBOOK_COLUMNS[2:])
+    await conn.execute(f"CREATE TEMP TABLE {TABLE} (time TIMESTAMPTZ NOT NULL, symbol TEXT NOT NULL, {columns})")
+    await conn.execute(f"""
+        CREATE TEMP TABLE {DEPTH_TABLE} (
+            time TIMESTAMPTZ NOT NULL, symbol TEXT NOT NULL, levels REAL[] NOT NULL,
+            total_ask_vol REAL, total_bid_vol REAL
+        )
+    """)
+
+    records = [TimescaleArchiver.orderbook_row(data) for data in snapshots(rows)]
+    placeholders = ", ".join(f"${i}" for i in range(1, len(ORDERBOOK_COLUMNS) + 1))
+    insert_sql = f"INSERT INTO {TABLE} ({', '.join(ORDERBOOK_COLUMNS)}) VALUES ({placeholders})"
+
+    start = time.perf_counter()
+    for record in records:
+        await conn.execute(insert_sql, *record)
+    insert_sec = time.perf_counter() - start
+    await conn.execute(f"TRUNCATE {TABLE}")
+
+    copy_sec = await copy_rate(conn, TABLE, records, ORDERBOOK_COLUMNS, batch_size)
+    depth_records = [TimescaleArchiver.depth_row(data) for data in snapshots(rows, depth=9)]
+    depth_sec = await copy_rate(conn, DEPTH_TABLE, depth_records, DEPTH_COLUMNS, batch_size)
+
+    assert await conn.fetchval(f"SELECT count(*) FROM {TABLE}") == rows
+    await conn.execute(f"VACUUM {TABLE}")
+    await conn.execute(f"VACUUM {DEPTH_TABLE}")
+    bytes_per_row = {
+        table: await conn.fetchval(f"SELECT pg_total_relation_size('{table}')") / rows
+        for table in (TABLE, DEPTH_TABLE)
+    }
+    await conn.close()
+
+    print(f"rows={rows:,} batch_size={batch_size}")
+    print(f"{'path':<22}{'seconds':>10}{'rows/s':>14}{'bytes/row':>12}")
+    print(f"{'INSERT 5-level cols':<22}{insert_sec:>10.3f}{rows / insert_sec:>14,.0f}{'-':>12}")
+    print(f"{'COPY 5-level cols':<22}{copy_sec:>10.3f}{rows / copy_sec:>14,.0f}{bytes_per_row[TABLE]:>12.0f}")
+    print(f"{'COPY 9-level arrays':<22}{depth_sec:>10.3f}{rows / depth_sec:>14,.0f}{bytes_per_row[DEPTH_TABLE]:>12.0f}")
+    print(f"speedup (COPY vs INSERT): {insert_sec / copy_sec:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
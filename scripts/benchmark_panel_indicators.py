@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+전 종목 기술 지표 계산 벤치마크 (종목별 루프 vs 패널 벡터 연산)
+- 기존: 종목마다 dropna() -> indicators.py RSI/MACD/볼린저 (pandas rolling/ewm) -> reindex
+- 패널: panel_indicators() 한 번 (시간 x 종목 행렬)
+
+Usage:
+    PYTHONPATH=. python scripts/benchmark_panel_indicators.py [symbols] [bars] [repeat]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import src.analysis.indicators as ind
+from src.analysis.incremental import INDICATOR_COLUMNS
+from src.analysis.panel import panel_indicators
+
+
+def make_panel(n_symbols: int, n_bars: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    values = 100 * np.exp(rng.normal(0, 0.01, (n_bars, n_symbols)).cumsum(axis=0))
+    closes = pd.DataFrame(values, index=pd.date_range("2026-01-01", periods=n_bars, freq="min"),
+                          columns=[f"SYM{i:03d}" for i in range(n_symbols)])
+    # 거래정지 구간 (종목 10%) + 산발적 결측 0.5%
+    for j in rng.choice(n_symbols, max(1, n_symbols // 10), replace=False):
+        start = rng.integers(0, n_bars // 2)
+        closes.iloc[start:start + n_bars // 20, j] = np.nan
+    closes = closes.mask(rng.random(closes.shape) < 0.005)
+    return closes
+
+
+def per_symbol_loop(closes: pd.DataFrame) -> dict:
+    frames = {column: {} for column in INDICATOR_COLUMNS}
+    for symbol in closes.columns:
+        df = closes[symbol].dropna().to_frame("close")
+        rsi = ind.calculate_rsi(df)
+        macd, macd_signal, macd_hist = ind.calculate_macd(df)
+        upper, mid, lower = ind.calculate_bollinger_bands(df)
+        for column, series in zip(INDICATOR_COLUMNS, (rsi, macd, macd_signal, macd_hist, upper, mid, lower)):
+            frames[column][symbol] = series.reindex(closes.index)
+    return {column: pd.DataFrame(frames[column], index=closes.index) for column in INDICATOR_COLUMNS}
+
+
+def bench(label: str, fn, closes: pd.DataFrame, repeat: int):
+    fn(closes)  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(closes)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<16} {elapsed * 1000:>9.2f} ms/run")
+    return result, elapsed
+
+
+def main():
+    n_symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    n_bars = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    closes = make_panel(n_symbols, n_bars)
+    print(f"📊 {n_symbols} symbols x {n_bars} bars, NaN {closes.isna().to_numpy().mean():.2%}, repeat={repeat}")
+
+    expected, loop_sec = bench("per-symbol loop", per_symbol_loop, closes, repeat)
+    result, panel_sec = bench("panel", panel_indicators, closes, repeat)
+
+    max_diff = max(
+        np.nanmax(np.abs(result[c].to_numpy() - expected[c].to_numpy()), initial=0.0) for c in INDICATOR_COLUMNS
+    )
+    same_nan = all(
+        np.array_equal(np.isnan(result[c].to_numpy()), np.isnan(expected[c].to_numpy())) for c in INDICATOR_COLUMNS
+    )
+    print(f"speedup: {loop_sec / panel_sec:.1f}x, max abs diff: {max_diff:.2e}, NaN layout identical: {same_nan}")
+
+
+if __name__ == "__main__":
+    main()
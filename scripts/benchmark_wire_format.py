@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+내부 채널 직렬화 포맷 벤치마크 (JSON vs Binary)
+- 메시지 크기(bytes) 및 인코딩/디코딩 처리량(msg/s) 비교
+
+Usage:
+    PYTHONPATH=. python scripts/benchmark_wire_format.py [iterations]
+"""
+import json
+import sys
+import time
+from datetime import datetime
+
+from src.core.schema import MarketData, OrderbookData, OrderbookUnit
+from src.core.wire_format import encode_binary, encode_json, decode_message
+
+
+def rate(fn, arg, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(arg)
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    samples = {
+        "ticker": MarketData(symbol="005930", price=75000.0, change=0.67, volume=1234567.0, timestamp=datetime.now()),
+        "orderbook": OrderbookData(
+            symbol="005930",
+            asks=[OrderbookUnit(price=75100.0 + i * 100, vol=1000.0 + i) for i in range(5)],
+            bids=[OrderbookUnit(price=75000.0 - i * 100, vol=2000.0 + i) for i in range(5)],
+        ),
+    }
+
+    print(f"{'type':<10} {'format':<7} {'bytes':>6} {'encode/s':>12} {'decode/s':>12}")
+    for name, obj in samples.items():
+        for fmt, encode, decode in [
+            ("json", encode_json, json.loads),
+            ("binary", encode_binary, decode_message),
+        ]:
+            raw = encode(obj)
+            size = len(raw.encode() if isinstance(raw, str) else raw)
+            print(f"{name:<10} {fmt:<7} {size:>6} {rate(encode, obj, iterations):>12,.0f} {rate(decode, raw, iterations):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+증분 상관관계 엔진 (/api/v1/analytics/correlation)
+- 1d 캔들 종가 -> 일별 수익률(pct_change, 휴장일은 직전 종가 유지 = 수익률 0) 행 단위 처리
+- 창(window)별 종목쌍 누적합 Σx, Σx², Σxy 유지: 새 일자 추가 / 창 밖 일자 제거 시 O(N²) 갱신 (전체 재계산 없음)
+- 상관계수: r = (nΣxy - ΣxΣy) / sqrt((nΣx² - (Σx)²)(nΣy² - (Σy)²)), 창 전체에 수익률이 있는 종목만 포함
+- 신규 캔들은 마지막 처리 일자 이후분만 조회 (마지막 일자에 늦게 도착한 캔들이 있으면 전체 재구성)
+- 결과는 창(days)별 캐시, 데이터 갱신 시 무효화
+
+기존 pandas 경로와의 차이: 창 시작일 이전 종가도 forward-fill에 사용 (창 첫날 캔들이 없는 종목도 포함)
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CORRELATION_HISTORY_DAYS = int(os.getenv("CORRELATION_HISTORY_DAYS", "60"))  # 최초 적재 기간 (달력일)
+CORRELATION_MAX_ROWS = int(os.getenv("CORRELATION_MAX_ROWS", "250"))  # 보관 수익률 행 수 (최대 창)
+CORRELATION_REFRESH_SEC = float(os.getenv("CORRELATION_REFRESH_SEC", "60"))  # 신규 캔들 조회 주기
+CORRELATION_REBUILD_SEC = float(os.getenv("CORRELATION_REBUILD_SEC", "21600"))  # 전체 재구성 주기 (백필 반영)
+LINK_THRESHOLD = 0.5  # |r| 초과 쌍만 links로 반환
+
+
+class RollingPairSums:
+    """최근 window개 수익률 행의 종목쌍 누적합 (종목 수 증가 시 자동 확장)"""
+
+    def __init__(self, window: int, size: int = 0):
+        self.window = window
+        self.rows: Deque[np.ndarray] = deque()
+        self._resize(size, reset=True)
+        self._evictions = 0
+
+    def _resize(self, size: int, reset: bool = False):
+        if reset:
+            self.sx = np.zeros(size)
+            self.sxx = np.zeros(size)
+            self.sxy = np.zeros((size, size))
+            self.count = np.zeros(size, dtype=np.int64)
+            return
+        grow = size - len(self.sx)
+        if grow > 0:
+            self.sx = np.pad(self.sx, (0, grow))
+            self.sxx = np.pad(self.sxx, (0, grow))
+            self.sxy = np.pad(self.sxy, ((0, grow), (0, grow)))
+            self.count = np.pad(self.count, (0, grow))
+
+    @staticmethod
+    def _fit(row: np.ndarray, size: int) -> np.ndarray:
+        """이전(종목 수가 적던) 행을 현재 크기로 확장 (신규 종목은 NaN)"""
+        if len(row) < size:
+            return np.concatenate([row, np.full(size - len(row), np.nan)])
+        return row
+
+    def _accumulate(self, row: np.ndarray, sign: int):
+        valid = ~np.isnan(row)
+        values = np.where(valid, row, 0.0)
+        self.sx += sign * values
+        self.sxx += sign * values * values
+        self.sxy += sign * np.outer(values, values)
+        self.count += sign * valid
+
+    def push(self, row: np.ndarray):
+        self._resize(len(row))
+        self.rows.append(row)
+        self._accumulate(row, 1)
+        if len(self.rows) > self.window:
+            self._accumulate(self._fit(self.rows.popleft(), len(self.sx)), -1)
+            self._evictions += 1
+            if self._evictions >= self.window:
+                self.rebase()
+
+    def rebase(self):
+        """누적 오차 제거: 보관 행으로 합계 재계산 (창 길이만큼 제거될 때마다)"""
+        size = len(self.sx)
+        self._resize(size, reset=True)
+        for row in self.rows:
+            self._accumulate(self._fit(row, size), 1)
+        self._evictions = 0
+
+    def correlation(self):
+        """
+        Returns:
+            (종목 인덱스 배열, 상관계수 행렬) - 창 전체에 수익률이 있는 종목만, 분산 0이면 NaN
+        """
+        n = len(self.rows)
+        idx = np.flatnonzero(self.count == n) if n >= 2 else np.array([], dtype=np.int64)
+        sx, sxx = self.sx[idx], self.sxx[idx]
+        cov = n * self.sxy[np.ix_(idx, idx)] - np.outer(sx, sx)
+        var = n * sxx - sx * sx
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.sqrt(np.outer(var, var))
+        corr[:, var <= 1e-18] = np.nan
+        corr[var <= 1e-18, :] = np.nan
+        np.clip(corr, -1.0, 1.0, out=corr)
+        return idx, corr
+
+
+class CorrelationEngine:
+    """1d 캔들 수익률 이력 + 창별 RollingPairSums + 결과 캐시"""
+
+    def __init__(self, max_rows: int = CORRELATION_MAX_ROWS):
+        self.max_rows = max_rows
+        self._lock = asyncio.Lock()  # 동시 요청의 중복 조회/적재 방지
+        self._reset()
+
+    def _reset(self):
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.last_close = np.zeros(0)
+        self.history: Deque[np.ndarray] = deque(maxlen=self.max_rows)
+        self.windows: Dict[int, RollingPairSums] = {}
+        self.last_date: Optional[datetime] = None
+        self.last_date_rows = 0  # 마지막 일자에 반영된 캔들 수 (지연 도착 감지)
+        self.version = 0
+        self.cache: Dict[int, tuple] = {}  # days -> (version, result)
+        self.refreshed_at = 0.0
+        self.rebuilt_at = 0.0
+
+    # --- 적재 ---
+
+    def _symbol_index(self, symbol: str) -> int:
+        i = self.index.get(symbol)
+        if i is None:
+            i = self.index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self.last_close = np.append(self.last_close, np.nan)
+        return i
+
+    def add_day(self, closes: Dict[str, float]):
+        """일자 1개의 종목별 종가 반영 -> 수익률 행 추가 (미수신 종목은 직전 종가 유지)"""
+        indices = [self._symbol_index(symbol) for symbol in closes]
+        prev = self.last_close.copy()
+        self.last_close[indices] = list(closes.values())
+        self.version += 1
+        if np.isnan(prev).all():
+            return  # 첫 일자: 직전 종가가 없어 수익률 행 없음 (창에 넣으면 모든 종목이 제외됨)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            row = self.last_close / prev - 1.0
+        self.history.append(row)
+        for sums in self.windows.values():
+            sums.push(row)
+
+    def ingest(self, rows) -> int:
+        """(time, symbol, close) 시간순 레코드 일괄 반영, 처리한 일자 수 반환"""
+        days = 0
+        current, closes = None, {}
+        for record in rows:
+            if record["time"] != current:
+                if closes:
+                    self.add_day(closes)
+                    days += 1
+                current, closes = record["time"], {}
+            closes[record["symbol"]] = float(record["close"])
+        if closes:
+            self.add_day(closes)
+            days += 1
+            self.last_date, self.last_date_rows = current, len(closes)
+        return days
+
+    async def refresh(self, conn, force: bool = False):
+        """신규 1d 캔들 반영 (CORRELATION_REFRESH_SEC 이내 재호출은 생략)"""
+        async with self._lock:
+            now = time.monotonic()
+            if not force and now - self.refreshed_at < CORRELATION_REFRESH_SEC:
+                return
+            await self._refresh(conn, now)
+
+    async def _refresh(self, conn, now: float):
+        self.refreshed_at = now
+
+        if self.last_date is None or now - self.rebuilt_at >= CORRELATION_REBUILD_SEC:
+            await self.rebuild(conn)
+            return
+
+        rows = await conn.fetch("""
+            SELECT time, symbol, close
+            FROM market_candles
+            WHERE interval = '1d' AND time >= $1
+            ORDER BY time ASC
+        """, self.last_date)
+        late = sum(1 for r in rows if r["time"] == self.last_date)
+        if late != self.last_date_rows:
+            # 이미 처리한 일자에 캔들이 추가됨 -> 해당 일자 수익률이 바뀌므로 전체 재구성
+            await self.rebuild(conn)
+            return
+        new_days = self.ingest([r for r in rows if r["time"] > self.last_date])
+        if new_days:
+            logger.info(f"📈 Correlation engine: +{new_days} days ({len(self.symbols)} symbols)")
+
+    async def rebuild(self, conn):
+        rows = await conn.fetch(f"""
+            SELECT time, symbol, close
+            FROM market_candles
+            WHERE interval = '1d' AND time > NOW() - INTERVAL '{CORRELATION_HISTORY_DAYS} days'
+            ORDER BY time ASC
+        """)
+        windows = list(self.windows)
+        self._reset()
+        for window in windows:
+            self.windows[window] = RollingPairSums(window)
+        self.ingest(rows)
+        self.refreshed_at = self.rebuilt_at = time.monotonic()
+        logger.info(f"📈 Correlation engine rebuilt: {len(self.history)} days, {len(self.symbols)} symbols")
+
+    # --- 조회 ---
+
+    def _window(self, days: int) -> RollingPairSums:
+        """days개 종가 -> days-1개 수익률 창 (최초 요청 시 보관 이력으로 초기화)"""
+        window = max(1, min(days - 1, self.max_rows))
+        sums = self.windows.get(window)
+        if sums is None:
+            sums = self.windows[window] = RollingPairSums(window, len(self.symbols))
+            for row in list(self.history)[-window:]:
+                sums.push(row)
+        return sums
+
+    def result(self, days: int, threshold: float = LINK_THRESHOLD) -> dict:
+        cached = self.cache.get(days)
+        if cached and cached[0] == self.version:
+            return cached[1]
+
+        idx, corr = self._window(days).correlation()
+        names = np.array(self.symbols, dtype=object)[idx] if len(idx) else np.array([], dtype=object)
+        order = np.argsort(names)
+        names, corr = names[order], corr[np.ix_(order, order)]
+
+        # Links: 상삼각(i<j) 중 |r| > threshold (벡터화 필터)
+        upper_i, upper_j = np.triu_indices(len(names), k=1)
+        values = corr[upper_i, upper_j]
+        mask = np.abs(values) > threshold
+        links = [
+            {"source": source, "target": target, "value": round(float(value), 2)}
+            for source, target, value in zip(names[upper_i[mask]], names[upper_j[mask]], values[mask])
+        ]
+
+        matrix = np.where(np.isnan(corr), None, corr).tolist()
+        result = {
+            "nodes": [{"id": symbol, "group": 1} for symbol in names],
+            "links": links,
+            "matrix": [{"symbol": symbol, **dict(zip(names, row))} for symbol, row in zip(names, matrix)],
+            "period": f"Last {days} Days",
+        }
+        self.cache[days] = (self.version, result)
+        return result
@@ -0,0 +1,250 @@
+"""
+증분(스트리밍) 기술 지표 - indicators.py의 batch 계산과 같은 정의를 봉 1개당 O(1)로 갱신
+
+- RSIState       : calculate_rsi (단순 이동평균 기반, 첫 봉의 상승/하락폭은 0으로 계산)
+- MACDState      : calculate_macd (ewm adjust=False, 첫 값으로 시작)
+- BollingerState : calculate_bollinger_bands (이동평균 ± 표본표준편차(ddof=1) x 승수)
+- IndicatorState : 위 3개 묶음, update()는 마감 봉 반영 / preview()는 진행 중 봉 값 계산(상태 불변)
+- IndicatorSeries: 시간순 봉 시계열 캐시 (새로 마감된 봉만 상태 갱신, 대시보드 재실행용)
+- batch_indicators: (시간 T x 종목 N) 2D 배열에 대해 모든 종목을 한 번에 계산
+
+값이 아직 정의되지 않는 구간(기간 미달)은 NaN (pandas 결과와 동일)
+"""
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+NAN = float("nan")
+INDICATOR_COLUMNS = ("rsi", "macd", "macd_signal", "macd_hist", "bb_upper", "bb_mid", "bb_lower")
+
+
+class RollingMean:
+    """고정 길이 창의 이동평균 (누적합 + 창 길이마다 재계산으로 오차 누적 방지)"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque()
+        self.total = 0.0
+        self._evictions = 0
+
+    def push(self, value: float):
+        self.window.append(value)
+        self.total += value
+        if len(self.window) > self.period:
+            self.total -= self.window.popleft()
+            self._evictions += 1
+            if self._evictions >= self.period:
+                self.total = sum(self.window)
+                self._evictions = 0
+
+    def peek(self, value: float) -> float:
+        """value를 추가했을 때의 평균 (상태 불변)"""
+        count = len(self.window) + 1
+        if count < self.period:
+            return NAN
+        total = self.total + value - (self.window[0] if count > self.period else 0.0)
+        return total / self.period
+
+    @property
+    def value(self) -> float:
+        return self.total / self.period if len(self.window) >= self.period else NAN
+
+
+class RSIState:
+    def __init__(self, period: int = 14):
+        self.gains = RollingMean(period)
+        self.losses = RollingMean(period)
+        self.prev: Optional[float] = None
+
+    def _moves(self, close: float):
+        delta = 0.0 if self.prev is None else close - self.prev
+        return max(delta, 0.0), max(-delta, 0.0)
+
+    @staticmethod
+    def _rsi(gain: float, loss: float) -> float:
+        if np.isnan(gain) or np.isnan(loss) or (gain == 0.0 and loss == 0.0):
+            return NAN
+        if loss == 0.0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+    def update(self, close: float) -> float:
+        gain, loss = self._moves(close)
+        self.gains.push(gain)
+        self.losses.push(loss)
+        self.prev = close
+        return self._rsi(self.gains.value, self.losses.value)
+
+    def preview(self, close: float) -> float:
+        gain, loss = self._moves(close)
+        return self._rsi(self.gains.peek(gain), self.losses.peek(loss))
+
+
+class MACDState:
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.alphas = (2.0 / (fast + 1), 2.0 / (slow + 1), 2.0 / (signal + 1))
+        self.fast: Optional[float] = None
+        self.slow: Optional[float] = None
+        self.signal: Optional[float] = None
+
+    @staticmethod
+    def _ema(prev: Optional[float], value: float, alpha: float) -> float:
+        return value if prev is None else prev + alpha * (value - prev)
+
+    def _step(self, close: float):
+        a_fast, a_slow, a_signal = self.alphas
+        fast = self._ema(self.fast, close, a_fast)
+        slow = self._ema(self.slow, close, a_slow)
+        signal = self._ema(self.signal, fast - slow, a_signal)
+        return fast, slow, signal
+
+    def update(self, close: float):
+        """Returns: (macd_line, signal_line, histogram)"""
+        self.fast, self.slow, self.signal = self._step(close)
+        macd = self.fast - self.slow
+        return macd, self.signal, macd - self.signal
+
+    def preview(self, close: float):
+        fast, slow, signal = self._step(close)
+        return fast - slow, signal, fast - slow - signal
+
+
+class BollingerState:
+    """이동 평균/분산을 창 교체 시 Welford 방식으로 갱신 (큰 가격대에서도 상쇄 오차 없음)"""
+
+    def __init__(self, period: int = 20, std_dev: float = 2):
+        self.period = period
+        self.std_dev = std_dev
+        self.window = deque()
+        self.mean = 0.0
+        self.m2 = 0.0  # 편차 제곱합
+
+    def _next(self, close: float):
+        n = len(self.window)
+        if n < self.period:
+            count = n + 1
+            mean = self.mean + (close - self.mean) / count
+            return mean, self.m2 + (close - self.mean) * (close - mean)
+        old = self.window[0]
+        mean = self.mean + (close - old) / self.period
+        return mean, self.m2 + (close - old) * (close - mean + old - self.mean)
+
+    def _bands(self, count: int, mean: float, m2: float):
+        if count < self.period:
+            return NAN, NAN, NAN
+        std = np.sqrt(max(m2, 0.0) / (self.period - 1))
+        return mean + std * self.std_dev, mean, mean - std * self.std_dev
+
+    def update(self, close: float):
+        """Returns: (upper_band, mid_band, lower_band)"""
+        self.mean, self.m2 = self._next(close)
+        self.window.append(close)
+        if len(self.window) > self.period:
+            self.window.popleft()
+        return self._bands(len(self.window), self.mean, self.m2)
+
+    def preview(self, close: float):
+        mean, m2 = self._next(close)
+        return self._bands(min(len(self.window) + 1, self.period), mean, m2)
+
+
+class IndicatorState:
+    """종목 1개의 RSI/MACD/볼린저 상태 (마감 봉마다 update, 진행 중 봉은 preview)"""
+
+    def __init__(self, rsi_period: int = 14, fast: int = 12, slow: int = 26, signal: int = 9,
+                 bb_period: int = 20, bb_std: float = 2):
+        self.rsi = RSIState(rsi_period)
+        self.macd = MACDState(fast, slow, signal)
+        self.bb = BollingerState(bb_period, bb_std)
+
+    def update(self, close: float) -> Dict[str, float]:
+        return self._pack(self.rsi.update(close), self.macd.update(close), self.bb.update(close))
+
+    def preview(self, close: float) -> Dict[str, float]:
+        return self._pack(self.rsi.preview(close), self.macd.preview(close), self.bb.preview(close))
+
+    @staticmethod
+    def _pack(rsi, macd, bands) -> Dict[str, float]:
+        return dict(zip(INDICATOR_COLUMNS, (rsi, *macd, *bands)))
+
+
+class IndicatorSeries:
+    """
+    시간순 봉 시계열의 지표 캐시
+    - 마지막 봉은 진행 중으로 보고 preview, 그 이전 봉 중 처음 보는 봉만 update (재호출 시 신규 봉만 계산)
+    - 이미 반영한 봉의 값이 나중에 바뀌어도 재계산하지 않음
+    """
+
+    def __init__(self, **params):
+        self.state = IndicatorState(**params)
+        self.last_time = None
+        self.values: Dict = {}
+
+    def update(self, times: Iterable, closes: Iterable) -> Dict[str, list]:
+        times, closes = list(times), [float(c) for c in closes]
+        if times:
+            for t, close in zip(times[:-1], closes[:-1]):
+                if self.last_time is None or t > self.last_time:
+                    self.values[t] = self.state.update(close)
+                    self.last_time = t
+            # 조회 구간 밖으로 밀려난 봉은 제거
+            self.values = {t: v for t, v in self.values.items() if t >= times[0]}
+
+        rows = []
+        for i, (t, close) in enumerate(zip(times, closes)):
+            value = self.values.get(t)
+            if value is None:
+                value = self.state.preview(close) if i == len(times) - 1 else dict.fromkeys(INDICATOR_COLUMNS, NAN)
+            rows.append(value)
+        return {column: [row[column] for row in rows] for column in INDICATOR_COLUMNS}
+
+
+def _ema(values: np.ndarray, span: int) -> np.ndarray:
+    """ewm(span, adjust=False) - 종목(열)별 첫 유효값에서 시작"""
+    return pd.DataFrame(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def batch_indicators(closes: np.ndarray, rsi_period: int = 14, fast: int = 12, slow: int = 26,
+                     signal: int = 9, bb_period: int = 20, bb_std: float = 2) -> Dict[str, np.ndarray]:
+    """
+    여러 종목의 RSI/MACD/볼린저 밴드를 한 번에 계산한다.
+
+    Args:
+        closes (np.ndarray): 종가 (시간 T x 종목 N), 종목별 상장 전 구간은 앞쪽 NaN 허용
+            (중간 결측(거래정지)은 panel.panel_indicators 사용)
+        rsi_period, fast, slow, signal, bb_period, bb_std: indicators.py와 동일한 파라미터
+
+    Returns:
+        dict: INDICATOR_COLUMNS 키별 (T x N) 배열
+    """
+    closes = np.asarray(closes, dtype=float)
+    if closes.ndim == 1:
+        closes = closes[:, None]
+
+    # RSI: 이전 값이 없는 행(첫 행/상장 전)의 상승/하락폭은 0 (pandas diff() 후 where()와 동일)
+    delta = np.zeros(closes.shape)
+    delta[1:] = np.nan_to_num(closes[1:] - closes[:-1], nan=0.0)
+    gain = pd.DataFrame(np.maximum(delta, 0.0)).rolling(rsi_period).mean().to_numpy()
+    loss = pd.DataFrame(np.maximum(-delta, 0.0)).rolling(rsi_period).mean().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+
+    macd = _ema(closes, fast) - _ema(closes, slow)
+    macd_signal = _ema(macd, signal)
+
+    # 종목 전체를 하나의 DataFrame으로 rolling (열별 반복은 pandas 내부 루프)
+    window = pd.DataFrame(closes).rolling(bb_period)
+    mid = window.mean().to_numpy()
+    std = window.std().to_numpy()
+
+    return {
+        "rsi": rsi,
+        "macd": macd,
+        "macd_signal": macd_signal,
+        "macd_hist": macd - macd_signal,
+        "bb_upper": mid + std * bb_std,
+        "bb_mid": mid,
+        "bb_lower": mid - std * bb_std,
+    }
@@ -0,0 +1,80 @@
+"""
+패널(시간 x 종목) 기술 지표 - 전체 종목의 RSI/MACD/볼린저 밴드를 한 번에 계산
+
+입력은 상관관계 엔드포인트와 같은 pivot 형태 (index=time, columns=symbol, values=close)
+- 거래정지/미상장 등으로 값이 없는 칸(NaN)은 해당 종목의 계산에서 제외
+  (종목별로 dropna() 후 indicators.py 함수를 적용하고 원래 시간축에 다시 맞춘 것과 동일)
+- 결측 칸의 지표 값은 NaN, 재개 후에는 정지 전 값에 이어서 계산
+- 휴장일처럼 직전 종가를 유지해야 하는 경우 호출 측에서 ffill() 후 전달
+"""
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+
+from .incremental import INDICATOR_COLUMNS, batch_indicators
+
+Panel = Union[pd.DataFrame, np.ndarray]
+
+
+def _compact(values: np.ndarray):
+    """종목(열)별 유효 값을 시간 순서대로 위로 모은다 (결측은 뒤로)"""
+    valid = ~np.isnan(values)
+    packed = np.arange(len(values))[:, None] < valid.sum(axis=0)
+    compacted = np.full(values.shape, np.nan)
+    compacted.T[packed.T] = values.T[valid.T]  # 열 우선 순서로 복사 (종목별 시간순 유지)
+    return compacted, valid, packed
+
+
+def _expand(compacted: np.ndarray, valid: np.ndarray, packed: np.ndarray) -> np.ndarray:
+    """_compact의 역변환 (결측 칸은 NaN)"""
+    out = np.full(compacted.shape, np.nan)
+    out.T[valid.T] = compacted.T[packed.T]
+    return out
+
+
+def panel_indicators(closes: Panel, rsi_period: int = 14, fast: int = 12, slow: int = 26,
+                     signal: int = 9, bb_period: int = 20, bb_std: float = 2) -> Dict[str, Panel]:
+    """
+    시간 x 종목 종가 행렬에 대해 모든 지표를 벡터 연산 한 번으로 계산한다.
+
+    Args:
+        closes (pd.DataFrame | np.ndarray): 종가 (index=time 오름차순, columns=symbol), 결측은 NaN
+        rsi_period, fast, slow, signal, bb_period, bb_std: indicators.py와 동일한 파라미터
+
+    Returns:
+        dict: INDICATOR_COLUMNS 키별 지표 (입력이 DataFrame이면 같은 index/columns의 DataFrame)
+    """
+    frame = closes if isinstance(closes, pd.DataFrame) else None
+    values = np.asarray(frame.to_numpy(dtype=float) if frame is not None else closes, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+
+    params = dict(rsi_period=rsi_period, fast=fast, slow=slow, signal=signal, bb_period=bb_period, bb_std=bb_std)
+    if np.isnan(values).any():
+        compacted, valid, packed = _compact(values)
+        result = {k: _expand(v, valid, packed) for k, v in batch_indicators(compacted, **params).items()}
+    else:
+        result = batch_indicators(values, **params)
+
+    if frame is None:
+        return result
+    return {k: pd.DataFrame(result[k], index=frame.index, columns=frame.columns) for k in INDICATOR_COLUMNS}
+
+
+def latest_indicators(closes: pd.DataFrame, **params) -> pd.DataFrame:
+    """
+    종목별 마지막 유효 시점의 지표 (스크리닝용).
+
+    Returns:
+        pd.DataFrame: index=symbol, columns=INDICATOR_COLUMNS (+ close)
+    """
+    result = panel_indicators(closes, **params)
+    values = closes.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    last = len(values) - 1 - np.argmax(valid[::-1], axis=0)  # 종목별 마지막 유효 행
+    cols = np.arange(values.shape[1])
+    table = {"close": np.where(valid.any(axis=0), values[last, cols], np.nan)}
+    for column in INDICATOR_COLUMNS:
+        table[column] = result[column].to_numpy()[last, cols]
+    return pd.DataFrame(table, index=closes.columns)
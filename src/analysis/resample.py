@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def resample_ohlcv(times: np.ndarray, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                   closes: np.ndarray, volumes: np.ndarray, bucket_sec: int) -> dict:
+    """
+    OHLCV 시계열을 bucket_sec 주기 캔들로 묶는다 (TimescaleDB time_bucket과 같은 UTC epoch 정렬).
+    구간 경계를 한 번에 찾고 ufunc.reduceat으로 집계하므로 행 단위 Python 루프가 없다.
+
+    Args:
+        times (np.ndarray): epoch 초 (오름차순)
+        opens, highs, lows, closes, volumes (np.ndarray): times와 같은 길이의 값 배열
+        bucket_sec (int): 캔들 주기 (초)
+
+    Returns:
+        dict: time(구간 시작 epoch 초), open, high, low, close, volume 배열
+    """
+    if len(times) == 0:
+        empty = np.array([], dtype=float)
+        return {"time": empty, "open": empty, "high": empty, "low": empty, "close": empty, "volume": empty}
+
+    buckets = np.floor_divide(times, bucket_sec) * bucket_sec
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(times)] - 1
+    return {
+        "time": buckets[starts],
+        "open": opens[starts],
+        "high": np.maximum.reduceat(highs, starts),
+        "low": np.minimum.reduceat(lows, starts),
+        "close": closes[ends],
+        "volume": np.add.reduceat(volumes, starts),
+    }
+
+
+def resample_ticks(times: np.ndarray, prices: np.ndarray, volumes: np.ndarray, bucket_sec: int) -> dict:
+    """
+    체결 틱을 bucket_sec 주기 캔들로 변환한다 (수신 순서가 뒤섞인 경우 시간순 정렬 후 집계).
+
+    Args:
+        times (np.ndarray): 틱 epoch 초
+        prices (np.ndarray): 체결가
+        volumes (np.ndarray): 체결량
+        bucket_sec (int): 캔들 주기 (초)
+
+    Returns:
+        dict: resample_ohlcv()와 동일
+    """
+    if len(times) > 1 and np.any(np.diff(times) < 0):
+        order = np.argsort(times, kind="stable")
+        times, prices, volumes = times[order], prices[order], volumes[order]
+    return resample_ohlcv(times, prices, prices, prices, prices, volumes, bucket_sec)
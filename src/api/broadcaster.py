@@ -0,0 +1,260 @@
+"""
+WebSocket Fan-out Broadcaster
+- 클라이언트별 전송 큐 + 전용 Writer Task (느린 클라이언트가 다른 클라이언트/구독 루프를 지연시키지 않음)
+- 큐는 (channel, symbol) 키 기준 Conflation: 전송 전 같은 키의 새 메시지가 오면 최신 값으로 교체
+  (ticker/orderbook만 해당, 마감 봉(candles)/뉴스/시스템 메시지는 전건 전달)
+- 큐 상한(WS_CLIENT_QUEUE) 초과 시 가장 오래된 키부터 폐기
+- 구독 필터: 클라이언트가 /ws로 채널/종목 부분집합 구독
+  (채널 미지정 시 DEFAULT_CHANNELS 수신, orderbook은 고빈도라 명시적 구독 시에만 전달)
+- 틱 Throttling: 종목별 틱을 tick_hz 프레임으로 합성 (마지막 가격 + 프레임 구간 누적 거래량)
+  연결별 협상: /ws?tick_hz=0 (원본 스트림) 또는 rate 명령, 기본 WS_TICK_HZ
+
+클라이언트 명령 (JSON 텍스트):
+    {"action": "subscribe", "channels": ["ticker", "orderbook"], "symbols": ["005930", "DNASNVDA"]}
+    {"action": "unsubscribe", "symbols": ["005930"]}
+    {"action": "reset"}  # 기본 구독(DEFAULT_CHANNELS, 전체 종목)으로 복귀
+    {"action": "rate", "tick_hz": 0}  # 0: 원본 틱 전체, >0: 초당 프레임 수
+채널: ticker, orderbook, candles, news, system
+"""
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict
+from itertools import count
+from typing import Dict, Optional
+
+from fastapi import WebSocket
+
+logger = logging.getLogger("api.broadcaster")
+
+WS_CLIENT_QUEUE = int(os.getenv("WS_CLIENT_QUEUE", "1000"))  # 클라이언트별 미전송 키 상한
+WS_TICK_HZ = float(os.getenv("WS_TICK_HZ", "4"))  # 기본 틱 프레임 레이트 (0: 원본 스트림)
+WS_MAX_TICK_HZ = 50.0
+
+# Redis 채널 -> 클라이언트 구독 채널
+CHANNEL_ALIASES = {
+    "market_ticker": "ticker",
+    "market_orderbook": "orderbook",
+    "news_alert": "news",
+    "system_alerts": "system",
+}
+CLIENT_CHANNELS = ("ticker", "orderbook", "candles", "news", "system")
+DEFAULT_CHANNELS = ("ticker", "candles", "news", "system")  # subscribe 명령 전 기본 채널 (orderbook은 opt-in)
+CONFLATED_CHANNELS = ("ticker", "orderbook")  # 최신 값만 의미 있는 채널 (마감 봉/뉴스/시스템은 전건 전달)
+
+
+def client_channel(redis_channel: str) -> str:
+    """ticker.kr -> ticker, market_orderbook -> orderbook"""
+    return CHANNEL_ALIASES.get(redis_channel) or redis_channel.split(".", 1)[0]
+
+
+def parse_tick_hz(value) -> float:
+    """요청 레이트 검증 (0: 원본, 상한 WS_MAX_TICK_HZ)"""
+    hz = float(value)
+    if hz < 0:
+        raise ValueError(f"tick_hz must be >= 0: {value}")
+    return min(hz, WS_MAX_TICK_HZ)
+
+
+class TickConflator:
+    """프레임 구간 동안 종목별 틱 합성 (price/change/timestamp: 마지막 값, volume: 누적, ticks: 건수)"""
+
+    def __init__(self, hz: float):
+        self.hz = hz
+        self.frames: Dict[str, dict] = {}
+
+    def add(self, data: dict):
+        frame = self.frames.get(data["symbol"])
+        if frame is None:
+            self.frames[data["symbol"]] = {
+                "type": data.get("type", "ticker"),
+                "symbol": data["symbol"],
+                "price": data["price"],
+                "change": data.get("change"),
+                "volume": data.get("volume", 0.0),
+                "timestamp": data.get("timestamp"),
+                "ticks": 1,
+            }
+            return
+        frame["price"] = data["price"]
+        frame["change"] = data.get("change")
+        frame["timestamp"] = data.get("timestamp")
+        frame["volume"] += data.get("volume", 0.0)
+        frame["ticks"] += 1
+
+    def drain(self) -> Dict[str, dict]:
+        frames, self.frames = self.frames, {}
+        return frames
+
+
+class ClientSession:
+    """클라이언트 1개의 구독 필터 + Conflating 전송 큐"""
+
+    _unkeyed = count()
+
+    def __init__(self, websocket: WebSocket, max_queue: int = WS_CLIENT_QUEUE, tick_hz: float = WS_TICK_HZ):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.tick_hz = tick_hz  # 0: 원본 틱
+        self.channels: Optional[set] = None  # None: DEFAULT_CHANNELS
+        self.symbols: Optional[set] = None
+        self.pending: "OrderedDict[tuple, str]" = OrderedDict()
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.sent = 0
+        self.conflated = 0
+        self.dropped = 0
+
+    def wants(self, channel: str, symbol: Optional[str]) -> bool:
+        if channel not in (self.channels if self.channels is not None else DEFAULT_CHANNELS):
+            return False
+        if self.symbols is not None and symbol is not None and symbol not in self.symbols:
+            return False
+        return True
+
+    def offer(self, channel: str, symbol: Optional[str], text: str):
+        """
+        전송 큐 적재 (Non-blocking), ticker/orderbook만 (channel, symbol) 기준 Conflation
+        원본 틱 스트림(tick_hz=0) 세션의 ticker는 전건 전달 (큐 상한만 적용)
+        """
+        raw_tick = channel == "ticker" and self.tick_hz == 0
+        if channel in CONFLATED_CHANNELS and symbol is not None and not raw_tick:
+            key = (channel, symbol)
+        else:
+            key = (channel, next(self._unkeyed))
+        if key in self.pending:
+            self.conflated += 1
+        elif len(self.pending) >= self.max_queue:
+            self.pending.popitem(last=False)
+            self.dropped += 1
+        self.pending[key] = text
+        self.ready.set()
+
+    async def writer(self):
+        while True:
+            await self.ready.wait()
+            while self.pending:
+                _, text = self.pending.popitem(last=False)
+                await self.websocket.send_text(text)
+                self.sent += 1
+            self.ready.clear()
+
+    def apply_command(self, command: dict) -> dict:
+        """구독 명령 반영 후 현재 구독 상태 반환"""
+        action = command.get("action")
+        channels = set(command.get("channels") or [])
+        symbols = set(command.get("symbols") or [])
+        unknown = channels - set(CLIENT_CHANNELS)
+        if unknown:
+            raise ValueError(f"Unknown channels: {sorted(unknown)}")
+
+        if action == "subscribe":
+            if channels:
+                self.channels = (self.channels or set()) | channels
+            if symbols:
+                self.symbols = (self.symbols or set()) | symbols
+        elif action == "unsubscribe":
+            if channels:
+                self.channels = (self.channels if self.channels is not None else set(DEFAULT_CHANNELS)) - channels
+            if symbols and self.symbols is not None:
+                self.symbols -= symbols
+        elif action == "reset":
+            self.channels = self.symbols = None
+        elif action == "rate":
+            self.tick_hz = parse_tick_hz(command.get("tick_hz", WS_TICK_HZ))
+        else:
+            raise ValueError(f"Unknown action: {action}")
+
+        return {
+            "type": "subscription",
+            "channels": sorted(self.channels if self.channels is not None else DEFAULT_CHANNELS),
+            "symbols": sorted(self.symbols) if self.symbols is not None else "*",
+            "tick_hz": self.tick_hz,
+        }
+
+    def stats(self) -> dict:
+        return {"queued": len(self.pending), "sent": self.sent, "conflated": self.conflated, "dropped": self.dropped}
+
+
+class Broadcaster:
+    """연결 관리 + 메시지 Fan-out (publish는 큐 적재만 수행)"""
+
+    def __init__(self, max_queue: int = WS_CLIENT_QUEUE):
+        self.max_queue = max_queue
+        self.sessions: Dict[WebSocket, ClientSession] = {}
+        self.conflators: Dict[float, TickConflator] = {}  # tick_hz -> 공유 합성기 (레이트별 1개)
+
+    async def connect(self, websocket: WebSocket, tick_hz: float = WS_TICK_HZ) -> ClientSession:
+        await websocket.accept()
+        session = ClientSession(websocket, self.max_queue, tick_hz)
+        session.task = asyncio.create_task(self._run_writer(session))
+        self.sessions[websocket] = session
+        self._ensure_conflator(tick_hz)
+        return session
+
+    def _ensure_conflator(self, hz: float):
+        if hz > 0 and hz not in self.conflators:
+            self.conflators[hz] = TickConflator(hz)
+            asyncio.create_task(self._frame_loop(self.conflators[hz]))
+
+    async def _frame_loop(self, conflator: TickConflator):
+        """1/hz 주기로 합성 프레임 발행 (프레임당 종목별 1회 직렬화), 해당 레이트 세션이 없으면 종료"""
+        while True:
+            await asyncio.sleep(1.0 / conflator.hz)
+            sessions = [s for s in self.sessions.values() if s.tick_hz == conflator.hz]
+            if not sessions:
+                del self.conflators[conflator.hz]
+                return
+            for symbol, frame in conflator.drain().items():
+                text = json.dumps(frame)
+                for session in sessions:
+                    if session.wants("ticker", symbol):
+                        session.offer("ticker", symbol, text)
+
+    def disconnect(self, websocket: WebSocket):
+        session = self.sessions.pop(websocket, None)
+        if session and session.task and session.task is not asyncio.current_task():
+            session.task.cancel()
+
+    async def _run_writer(self, session: ClientSession):
+        try:
+            await session.writer()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Broadcast Error: {e}")
+            self.disconnect(session.websocket)
+
+    def publish(self, redis_channel: str, symbol: Optional[str], text: str, data: Optional[dict] = None):
+        """
+        구독 조건이 맞는 클라이언트 큐에 적재 (직렬화는 호출측에서 1회)
+        ticker는 원본(tick_hz=0) 세션에만 즉시 전달, 나머지는 레이트별 합성기로 (data 필요)
+        """
+        channel = client_channel(redis_channel)
+        throttled = channel == "ticker" and data is not None and symbol is not None
+        if throttled:
+            for conflator in self.conflators.values():
+                conflator.add(data)
+        for session in list(self.sessions.values()):
+            if throttled and session.tick_hz > 0:
+                continue
+            if session.wants(channel, symbol):
+                session.offer(channel, symbol, text)
+
+    async def handle_command(self, session: ClientSession, raw: str):
+        try:
+            reply = session.apply_command(json.loads(raw))
+            self._ensure_conflator(session.tick_hz)
+        except (ValueError, TypeError, AttributeError) as e:
+            reply = {"type": "error", "detail": str(e)}
+        session.offer("system", None, json.dumps(reply))
+
+    def stats(self) -> dict:
+        totals = {"clients": len(self.sessions), "queued": 0, "sent": 0, "conflated": 0, "dropped": 0}
+        for session in self.sessions.values():
+            for key, value in session.stats().items():
+                totals[key] += value
+        return totals
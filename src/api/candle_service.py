@@ -0,0 +1,235 @@
+"""
+캔들 조회 서비스 (/api/v1/candles/{symbol})
+- 지원 주기: 1m, 3m, 5m, 15m, 1h, 1d (그 외 interval은 market_candles 저장값 그대로 조회, 기존 동작)
+- 분/시간 봉: 가장 세밀한 저장 데이터에서 time_bucket으로 생성
+    market_candles 1m 캔들 + 마지막 1m 캔들 이후 구간은 market_ticks
+    (시작 시각 미지정 시 종목의 마지막 저장 시각 기준으로 조회 -> 장 마감 후에도 최근 캔들 반환)
+  + 최근 구간은 API 메모리 틱(LatestStateCache)을 NumPy 리샘플러로 집계해 덮어씀
+    (Ring Buffer 첫 틱 이후 시작하는 캔들만, 아직 DB에 적재되지 않은 틱 반영)
+- 일봉: History Loader가 저장한 1d 캔들 (거래소 기준 일자 정렬 유지)
+
+캐시: (symbol, interval, start, end, limit) 키 LRU (CANDLE_CACHE_SIZE)
+- 종료 시각이 없는(현재까지) 분/시간 봉 항목은 틱 수신 시 증분 갱신
+  (마지막 캔들 high/low/close/volume 갱신 또는 새 캔들 추가, limit 초과분은 앞에서 제거)
+- 모든 항목은 CANDLE_CACHE_TTL 경과 시 재조회 (누락/지연 틱, 틱으로 갱신하지 않는 일봉 대비)
+"""
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.analysis.resample import resample_ticks
+from .state_cache import LatestStateCache
+
+CANDLE_INTERVALS = {"1m": 60, "3m": 180, "5m": 300, "15m": 900, "1h": 3600, "1d": 86400}
+DAILY_INTERVAL = "1d"
+CANDLE_CACHE_SIZE = int(os.getenv("CANDLE_CACHE_SIZE", "256"))  # LRU 항목 수
+CANDLE_CACHE_TTL = float(os.getenv("CANDLE_CACHE_TTL", "300"))  # 항목 최대 보관 (초)
+CANDLE_LOOKBACK_FACTOR = int(os.getenv("CANDLE_LOOKBACK_FACTOR", "3"))  # 시작 시각 미지정 시 limit x 주기 x 배수
+
+CacheKey = Tuple[str, str, Optional[datetime], Optional[datetime], int]
+
+
+def tick_epoch(timestamp: str) -> float:
+    """수집기 timestamp(ISO, tz 없으면 로컬 시각) -> epoch 초"""
+    return datetime.fromisoformat(timestamp).timestamp()
+
+
+def _candle(epoch: float, open_: float, high: float, low: float, close: float, volume: float) -> dict:
+    return {
+        "time": datetime.fromtimestamp(epoch, tz=timezone.utc),
+        "open": float(open_),
+        "high": float(high),
+        "low": float(low),
+        "close": float(close),
+        "volume": float(volume),
+    }
+
+
+async def fetch_bucketed_candles(conn, symbol: str, bucket_sec: int, limit: int,
+                                 start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[dict]:
+    """
+    1m 캔들 + 이후 틱을 time_bucket으로 bucket_sec 주기 캔들로 집계 (시간순, 최근 limit개)
+    - start 미지정 시 조회 구간은 종목의 마지막 저장 데이터(1m 캔들/틱) 기준
+      (현재 시각 기준이면 장 마감 후/주말에 빈 결과)
+    """
+    bucket = timedelta(seconds=bucket_sec)
+    if start is None:
+        latest = await conn.fetchval("""
+            SELECT GREATEST(
+                (SELECT MAX(time) FROM market_candles
+                 WHERE symbol = $1 AND interval = '1m' AND ($2::timestamptz IS NULL OR time < $2)),
+                (SELECT MAX(time) FROM market_ticks
+                 WHERE symbol = $1 AND ($2::timestamptz IS NULL OR time < $2))
+            )
+        """, symbol, end)
+        if latest is None:
+            return []
+        start = latest - bucket * limit * CANDLE_LOOKBACK_FACTOR
+    rows = await conn.fetch("""
+        WITH last_1m AS (
+            SELECT MAX(time) AS time FROM market_candles
+            WHERE symbol = $1 AND interval = '1m' AND time >= $3
+        ),
+        base AS (
+            SELECT time, open, high, low, close, volume
+            FROM market_candles
+            WHERE symbol = $1 AND interval = '1m' AND time >= $3
+              AND ($4::timestamptz IS NULL OR time < $4)
+            UNION ALL
+            SELECT time, price, price, price, price, volume
+            FROM market_ticks
+            WHERE symbol = $1 AND time >= $3
+              AND ($4::timestamptz IS NULL OR time < $4)
+              AND time >= COALESCE((SELECT time FROM last_1m) + INTERVAL '1 minute', $3)
+        )
+        SELECT time_bucket($2::interval, time) AS time,
+               first(open, time) AS open, MAX(high) AS high, MIN(low) AS low,
+               last(close, time) AS close, SUM(volume) AS volume
+        FROM base
+        GROUP BY 1
+        ORDER BY 1 DESC
+        LIMIT $5
+    """, symbol, bucket, start, end, limit)
+    return [dict(r) for r in reversed(rows)]
+
+
+class CandleSeries:
+    """캐시 항목 1개 (시간순 캔들 목록 + 증분 갱신 상태)"""
+
+    def __init__(self, rows: List[dict], bucket_sec: Optional[int], limit: Optional[int], live: bool):
+        self.rows = rows
+        self.bucket_sec = bucket_sec
+        self.limit = limit
+        self.live = live  # 틱으로 증분 갱신 대상
+        self.last_epoch = rows[-1]["time"].timestamp() if rows else None
+        self.built_at = time.monotonic()
+
+    def apply_tick(self, epoch: float, price: float, volume: float):
+        bucket = (epoch // self.bucket_sec) * self.bucket_sec
+        if self.last_epoch is not None and bucket < self.last_epoch:
+            return  # 지연 도착 틱 (이미 지난 캔들) -> TTL 재조회로 반영
+        if bucket == self.last_epoch:
+            last = self.rows[-1]
+            last["high"] = max(last["high"], price)
+            last["low"] = min(last["low"], price)
+            last["close"] = price
+            last["volume"] = (last["volume"] or 0.0) + volume
+            return
+        self.rows.append(_candle(bucket, price, price, price, price, volume))
+        self.last_epoch = bucket
+        if self.limit and len(self.rows) > self.limit:
+            del self.rows[:len(self.rows) - self.limit]
+
+
+class CandleService:
+    def __init__(self, state: Optional[LatestStateCache] = None,
+                 capacity: int = CANDLE_CACHE_SIZE, ttl: float = CANDLE_CACHE_TTL):
+        self.state = state
+        self.capacity = capacity
+        self.ttl = ttl
+        self.entries: "OrderedDict[CacheKey, CandleSeries]" = OrderedDict()
+        self.by_symbol: Dict[str, Set[CacheKey]] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.patched = 0
+
+    async def get(self, conn, symbol: str, interval: str, limit: int = 200,
+                  start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[dict]:
+        key = (symbol, interval, start, end, limit)
+        series = self.entries.get(key)
+        if series and time.monotonic() - series.built_at < self.ttl:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return list(series.rows)
+
+        self.misses += 1
+        bucket_sec = CANDLE_INTERVALS.get(interval)
+        if bucket_sec is None or interval == DAILY_INTERVAL:
+            rows = await self._fetch_stored(conn, symbol, interval, limit, start, end)
+            series = CandleSeries(rows, None, limit, live=False)
+        else:
+            rows = await fetch_bucketed_candles(conn, symbol, bucket_sec, limit, start, end)
+            if end is None:
+                rows = self._merge_memory(symbol, bucket_sec, rows)
+            if start is None:
+                rows = rows[-limit:]
+            series = CandleSeries(rows, bucket_sec, limit if start is None else None, live=end is None)
+        self._store(key, series)
+        return list(series.rows)
+
+    def _store(self, key: CacheKey, series: CandleSeries):
+        self.entries[key] = series
+        self.entries.move_to_end(key)
+        self.by_symbol.setdefault(key[0], set()).add(key)
+        while len(self.entries) > self.capacity:
+            old_key, _ = self.entries.popitem(last=False)
+            keys = self.by_symbol.get(old_key[0])
+            if keys:
+                keys.discard(old_key)
+                if not keys:
+                    del self.by_symbol[old_key[0]]
+
+    def on_tick(self, data: dict):
+        """수신 틱으로 현재 진행 중인 캐시 캔들 갱신 (redis_subscriber에서 호출)"""
+        keys = self.by_symbol.get(data["symbol"])
+        if not keys:
+            return
+        epoch = tick_epoch(data["timestamp"])
+        for key in keys:
+            series = self.entries[key]
+            if series.live:
+                series.apply_tick(epoch, data["price"], data.get("volume", 0.0))
+                self.patched += 1
+
+    def invalidate(self, symbol: Optional[str] = None):
+        if symbol is None:
+            self.entries.clear()
+            self.by_symbol.clear()
+            return
+        for key in self.by_symbol.pop(symbol, ()):
+            self.entries.pop(key, None)
+
+    def _merge_memory(self, symbol: str, bucket_sec: int, rows: List[dict]) -> List[dict]:
+        """Ring Buffer 첫 틱 이후 시작하는 캔들은 메모리 틱 집계로 교체 (DB 미적재 틱 포함)"""
+        ring = self.state.ticks.get(symbol) if self.state else None
+        if not ring:
+            return rows
+        ticks = list(ring)
+        times = np.fromiter((tick_epoch(t[0]) for t in ticks), dtype=float, count=len(ticks))
+        prices = np.fromiter((t[1] for t in ticks), dtype=float, count=len(ticks))
+        volumes = np.fromiter((t[2] for t in ticks), dtype=float, count=len(ticks))
+
+        covered_from = np.ceil(times.min() / bucket_sec) * bucket_sec  # 틱이 전부 있는 첫 캔들
+        keep = times >= covered_from
+        if not keep.any():
+            return rows
+        bars = resample_ticks(times[keep], prices[keep], volumes[keep], bucket_sec)
+        memory_rows = [
+            _candle(*values)
+            for values in zip(bars["time"], bars["open"], bars["high"], bars["low"], bars["close"], bars["volume"])
+        ]
+        return [r for r in rows if r["time"].timestamp() < covered_from] + memory_rows
+
+    @staticmethod
+    async def _fetch_stored(conn, symbol: str, interval: str, limit: int,
+                            start: Optional[datetime], end: Optional[datetime]) -> List[dict]:
+        rows = await conn.fetch("""
+            SELECT time, open, high, low, close, volume
+            FROM market_candles
+            WHERE symbol = $1 AND interval = $3
+              AND ($4::timestamptz IS NULL OR time >= $4)
+              AND ($5::timestamptz IS NULL OR time < $5)
+            ORDER BY time DESC
+            LIMIT $2
+        """, symbol, limit, interval, start, end)
+        # 시간순 정렬 (과거 -> 현재)
+        return [dict(r) for r in reversed(rows)]
+
+    def stats(self) -> dict:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses, "patched": self.patched}
@@ -1,16 +1,28 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Header, HTTPException, Depends
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Header, HTTPException, Depends, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import redis.asyncio as redis
 import asyncio
+import hashlib
 import json
 import os
 import logging
+import time
 import asyncpg
 import yaml
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import Optional, Dict
+from src.core.wire_format import to_json_text, decode_message
+from src.core.orderbook_delta import OrderbookRebuilder
+from src.core.stream_transport import StreamConsumer, consumes_streams, routed_to_stream, STREAM_CONSUMER
+from src.core.latency import LatencyRecorder, LATENCY_TRACKING, now_ns
+from src.analysis.correlation import CorrelationEngine
+from src.core.daily_snapshot import ensure_daily_snapshot, fetch_daily_snapshot
 from .auth import verify_api_key
-from .routes import system
+from .state_cache import LatestStateCache, TTLCache
+from .broadcaster import Broadcaster, WS_TICK_HZ, parse_tick_hz
+from .candle_service import CandleService
+from .routes import system, ticks
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +32,7 @@ app = FastAPI(title="Antigravity API", version="1.0.0")
 
 # Register Routers
 app.include_router(system.router)
+app.include_router(ticks.router)
 
 # CORS 설정 (로컬 개발 및 Electron 앱 지원)
 app.add_middleware(
@@ -38,30 +51,34 @@ DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "password")
 DB_NAME = os.getenv("DB_NAME", "stockval")
 API_AUTH_SECRET = os.getenv("API_AUTH_SECRET", "super-secret-key")
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "2"))  # 헬스 체크 결과 캐시 (초)
+MARKET_SNAPSHOT_TTL = float(os.getenv("MARKET_SNAPSHOT_TTL", "5"))  # market-map/indices 응답 캐시 (초)
+ORDERBOOK_STORAGE = os.getenv("ORDERBOOK_STORAGE", "columns")  # columns | arrays (Archiver와 동일 설정)
+API_STREAM_GROUP = os.getenv("API_STREAM_GROUP", "api")  # streams 모드 Consumer Group 접두어 (+ 호스트명)
 
-class ConnectionManager:
-    """웹소켓 연결 관리 클래스"""
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: str):
-        for connection in list(self.active_connections):
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.error(f"Broadcast Error: {e}")
-                self.disconnect(connection)
-
-manager = ConnectionManager()
+# 웹소켓 연결 관리 (클라이언트별 큐 + Writer Task, 구독 필터)
+manager = Broadcaster()
 db_pool: Optional[asyncpg.Pool] = None
+# 헬스 체크/조회용 공유 Redis 커넥션 풀 (startup_event에서 생성, Pub/Sub 구독은 별도 연결)
+redis_client: Optional[redis.Redis] = None
+health_cache = TTLCache(HEALTH_CACHE_TTL)
+# market-map / indices 응답 캐시 (market_daily_snapshot 조회 결과, 값: (etag, payload))
+snapshot_cache = TTLCache(MARKET_SNAPSHOT_TTL)
+daily_snapshot_ready = False
+
+# 최신 상태 캐시 (redis_subscriber가 갱신, 조회 API는 메모리 우선 + DB Fallback)
+latest_state = LatestStateCache()
+# 캔들 조회 서비스 (주기별 리샘플링 + LRU 캐시, 틱 수신 시 증분 갱신)
+candle_service = CandleService(latest_state)
+# 조회 경로별 응답 지연 (stage: ticks_memory/ticks_db/orderbook_memory/orderbook_db)
+api_latency = LatencyRecorder("api") if LATENCY_TRACKING else None
+# 상관관계 증분 엔진 (1d 캔들 수익률 누적합, 창별 결과 캐시)
+correlation_engine = CorrelationEngine()
+
+
+def record_api_latency(stage: str, started_ns: int):
+    if api_latency:
+        api_latency.record(stage, "ALL", now_ns() - started_ns)
 
 # Global Configuration Cache
 SYMBOLS_CACHE: Dict[str, Dict] = {}
@@ -101,10 +118,13 @@ def load_config():
 
 @app.on_event("startup")
 async def startup_event():
-    global db_pool
+    global db_pool, redis_client
     logger.info("🚀 Starting API server...")
     # 0. Load Symbols
     load_config()
+    # 공유 Redis 풀 (연결은 첫 명령 시 생성, 이후 재사용)
+    redis_client = redis.from_url(REDIS_URL, socket_timeout=2.0)
+    app.state.redis = redis_client
     # Redis 구독 타스크 시작
     asyncio.create_task(redis_subscriber())
     # DB 커넥션 풀 초기화
@@ -119,25 +139,109 @@ async def startup_event():
     except Exception as e:
         logger.error(f"❌ DB Pool Init Failed: {e}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    if redis_client:
+        await redis_client.aclose()
+    if db_pool:
+        await db_pool.close()
+
+def dispatch_market_message(channel: str, raw, orderbooks: OrderbookRebuilder):
+    """수신 메시지 1건 -> 상태/캔들 캐시 갱신 + WebSocket 브로드캐스트 (Pub/Sub, Streams 공용)"""
+    try:
+        data = decode_message(raw)
+    except Exception as e:
+        logger.error(f"Decode Error ({channel}): {e}")
+        return
+
+    if channel.startswith("orderbook."):
+        data = orderbooks.apply(data)
+        if data is None:
+            return
+        text = json.dumps(data)
+    else:
+        text = to_json_text(raw)
+    if channel.startswith(("ticker.", "orderbook.")):
+        latest_state.update(data)
+        if channel.startswith("ticker."):
+            candle_service.on_tick(data)
+    # Non-blocking: 클라이언트별 큐 적재만 수행 (전송은 각 Writer Task)
+    if isinstance(data, dict):
+        manager.publish(channel, data.get("symbol"), text, data)
+    else:
+        manager.publish(channel, None, text)
+
+
 async def redis_subscriber():
     """Redis Pub/Sub 메시지를 브로드캐스트하는 타스크"""
     try:
-        r = redis.from_url(REDIS_URL, encoding="utf-8", decode_responses=True)
+        # decode_responses=False: Binary wire format 메시지는 JSON 텍스트로 변환 후 전달
+        r = redis.from_url(REDIS_URL, decode_responses=False)
         pubsub = r.pubsub()
         await pubsub.subscribe("market_ticker", "market_orderbook", "news_alert", "system_alerts")
+        await pubsub.psubscribe("ticker.*", "orderbook.*", "candles.*")
         logger.info("Connected to Redis Pub/Sub.")
+        if api_latency:
+            asyncio.create_task(api_latency.report_loop(r))
+
+        orderbooks = OrderbookRebuilder()  # orderbook_delta -> 전체 호가 재구성 후 전달
+        streams = consumes_streams()
+        if streams:
+            # streams 모드에서는 ticker/orderbook이 XADD로만 발행됨 -> Stream에서 수신
+            asyncio.create_task(stream_subscriber(r, orderbooks))
 
         async for message in pubsub.listen():
-            if message["type"] == "message":
-                await manager.broadcast(message["data"])
+            if message["type"] not in ("message", "pmessage"):
+                continue
+            channel = message["channel"]
+            channel = channel.decode() if isinstance(channel, bytes) else channel
+            if streams and routed_to_stream(channel):
+                continue  # both 모드: Stream으로 수신하는 채널 (중복 방지)
+            dispatch_market_message(channel, message["data"], orderbooks)
     except Exception as e:
         logger.error(f"Redis Subscriber Exception: {e}")
 
+
+async def stream_subscriber(r, orderbooks: OrderbookRebuilder):
+    """
+    Streams 모드 시장 데이터 수신 (인스턴스 전용 Consumer Group -> 모든 API 인스턴스가 전체 수신)
+    - live 소비자: 재시작 시 밀린 구간은 건너뛰고 최신 엔트리부터 전달 (이력은 DB/캐시 조회 경로)
+    """
+    try:
+        consumer = StreamConsumer(r, group=f"{API_STREAM_GROUP}-{STREAM_CONSUMER}", live=True)
+        await consumer.ensure_groups()
+        logger.info(f"Connected to Redis Streams ({', '.join(consumer.channels.values())}).")
+    except Exception as e:
+        logger.error(f"Stream Subscriber Init Error: {e}")
+        return
+
+    while True:
+        try:
+            entries = await consumer.read()
+        except Exception as e:
+            logger.error(f"Stream Read Error: {e}")
+            await asyncio.sleep(1)
+            continue
+
+        for channel, _, raw in entries:
+            if raw is not None:
+                dispatch_market_message(channel, raw, orderbooks)
+        try:
+            await consumer.ack((channel, entry_id) for channel, entry_id, _ in entries)
+        except Exception as e:
+            logger.error(f"Stream Ack Error: {e}")
+
 # --- REST API Endpoints ---
 
 @app.get("/api/v1/ticks/{symbol}", dependencies=[Depends(verify_api_key)])
 async def get_recent_ticks(symbol: str, limit: int = 100):
-    """최근 틱(체결) 데이터 조회"""
+    """최근 틱(체결) 데이터 조회 (캐시 보유량 이내는 메모리, 그 이상은 DB)"""
+    started = now_ns()
+    cached = latest_state.recent_ticks(symbol, limit)
+    if cached is not None:
+        record_api_latency("ticks_memory", started)
+        return cached
+
     if not db_pool:
         raise HTTPException(status_code=503, detail="Database not available")
     
@@ -150,15 +254,65 @@ async def get_recent_ticks(symbol: str, limit: int = 100):
             LIMIT $2
         """, symbol, limit)
         
-        return [dict(r) for r in rows]
+    record_api_latency("ticks_db", started)
+    return [dict(r) for r in rows]
+
+
+def orderbook_response(book: dict) -> dict:
+    """캐시된 호가 -> DB 조회 응답과 동일한 형태 (ORDERBOOK_STORAGE 기준)"""
+    timestamp = datetime.fromisoformat(book["timestamp"])
+    if ORDERBOOK_STORAGE == "arrays":
+        return {
+            "time": timestamp,
+            "symbol": book["symbol"],
+            "asks": book["asks"],
+            "bids": book["bids"],
+            "total_ask_vol": book.get("total_ask_vol"),
+            "total_bid_vol": book.get("total_bid_vol"),
+        }
+    data = {"time": timestamp, "symbol": book["symbol"]}
+    for side, prefix in (("asks", "ask"), ("bids", "bid")):
+        units = book[side][:5]
+        for i in range(1, 6):  # 수신 레벨이 적으면 NULL (DB 컬럼과 동일)
+            unit = units[i - 1] if i <= len(units) else {"price": None, "vol": None}
+            data[f"{prefix}_price{i}"] = unit["price"]
+            data[f"{prefix}_vol{i}"] = unit["vol"]
+    return data
 
 @app.get("/api/v1/orderbook/{symbol}", dependencies=[Depends(verify_api_key)])
 async def get_latest_orderbook(symbol: str):
-    """최신 호가 스냅샷 조회"""
+    """최신 호가 스냅샷 조회 (캐시 우선, 미수신 종목은 DB)"""
+    started = now_ns()
+    cached = latest_state.latest_orderbook(symbol)
+    if cached is not None:
+        record_api_latency("orderbook_memory", started)
+        return orderbook_response(cached)
+
     if not db_pool:
         raise HTTPException(status_code=503, detail="Database not available")
     
     async with db_pool.acquire() as conn:
+        if ORDERBOOK_STORAGE == "arrays":
+            row = await conn.fetchrow("""
+                SELECT time, symbol, levels, total_ask_vol, total_bid_vol FROM market_orderbook_depth
+                WHERE symbol = $1
+                ORDER BY time DESC
+                LIMIT 1
+            """, symbol)
+            if not row:
+                raise HTTPException(status_code=404, detail="Orderbook not found")
+            # levels: [ask_price, ask_vol, bid_price, bid_vol] x n레벨
+            ask_price, ask_vol, bid_price, bid_vol = row['levels']
+            record_api_latency("orderbook_db", started)
+            return {
+                "time": row['time'],
+                "symbol": row['symbol'],
+                "asks": [{"price": p, "vol": v} for p, v in zip(ask_price, ask_vol)],
+                "bids": [{"price": p, "vol": v} for p, v in zip(bid_price, bid_vol)],
+                "total_ask_vol": row['total_ask_vol'],
+                "total_bid_vol": row['total_bid_vol'],
+            }
+
         row = await conn.fetchrow("""
             SELECT * FROM market_orderbook 
             WHERE symbol = $1 
@@ -171,26 +325,22 @@ async def get_latest_orderbook(symbol: str):
             
         data = dict(row)
         # 평탄화된 데이터를 클라이언트에 맞게 구조화 (선택 사항)
+        record_api_latency("orderbook_db", started)
         return data
 
 @app.get("/api/v1/candles/{symbol}", dependencies=[Depends(verify_api_key)])
-async def get_recent_candles(symbol: str, limit: int = 200, interval: str = "1d"):
-    """최근 분봉/일봉(Candle) 데이터 조회"""
+async def get_recent_candles(symbol: str, limit: int = 200, interval: str = "1d",
+                             start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """
+    최근 분봉/일봉(Candle) 데이터 조회
+    1m/3m/5m/15m/1h는 1m 캔들/틱에서 생성 (src/api/candle_service.py), LRU 캐시 + 틱 증분 갱신
+    """
     if not db_pool:
         raise HTTPException(status_code=503, detail="Database not available")
-    
+
     async with db_pool.acquire() as conn:
-        rows = await conn.fetch("""
-            SELECT time, open, high, low, close, volume
-            FROM market_candles
-            WHERE symbol = $1 AND interval = $3
-            ORDER BY time DESC
-            LIMIT $2
-        """, symbol, limit, interval)
-        
-        # 반환 포맷: Frontend(Plotly)에서 쓰기 편하게 리스트 형태로 변환
-        # 시간순 정렬 (과거 -> 현재)로 뒤집어서 반환
-        return [dict(r) for r in reversed(rows)]
+        # 반환 포맷: Frontend(Plotly)에서 쓰기 편하게 시간순 리스트 (과거 -> 현재)
+        return await candle_service.get(conn, symbol, interval, limit, start, end)
 
 @app.get("/api/v1/inspector/latest", dependencies=[Depends(verify_api_key)])
 async def get_latest_inserts(limit: int = 50):
@@ -210,108 +360,95 @@ async def get_latest_inserts(limit: int = 50):
         
         return [dict(r) for r in rows]
 
-@app.get("/api/v1/market-map/{market}", dependencies=[Depends(verify_api_key)])
-async def get_market_map(market: str = "us"):
-    """
-    시장별 Treemap 데이터 조회 (DB 기반, 수집된 데이터 한정)
-    """
-    if not db_pool:
-        raise HTTPException(status_code=503, detail="Database not available")
+async def _snapshot_rows(conn, symbols=None, max_age_days=None):
+    """market_daily_snapshot 조회 (최초 호출 시 테이블/트리거 보장)"""
+    global daily_snapshot_ready
+    if not daily_snapshot_ready:
+        await ensure_daily_snapshot(conn)
+        daily_snapshot_ready = True
+    return await fetch_daily_snapshot(conn, symbols, max_age_days)
 
-    results = []
-    
-    async with db_pool.acquire() as conn:
-        # 최근 수집된 일봉 데이터 기준
-        # 1. 대상 심볼 조회 (최근 30일간 1d 캔들이 있는 모든 종목)
-        rows = await conn.fetch("""
-            WITH RecentCandles AS (
-                SELECT 
-                    symbol, 
-                    time, 
-                    close, 
-                    volume,
-                    ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY time DESC) as rn
-                FROM market_candles 
-                WHERE interval = '1d' AND time > NOW() - INTERVAL '30 days'
-            )
-            SELECT 
-                t1.symbol, 
-                t1.close as current_price, 
-                t1.volume,
-                t2.close as prev_price
-            FROM RecentCandles t1
-            LEFT JOIN RecentCandles t2 ON t1.symbol = t2.symbol AND t2.rn = 2
-            WHERE t1.rn = 1
-        """)
-        
-        for row in rows:
-            symbol = row['symbol']
-            curr = float(row['current_price'])
-            prev = float(row['prev_price']) if row['prev_price'] else curr
-            
-            value_factor = float(row['volume']) * curr
-            change_rate = ((curr - prev) / prev * 100) if prev > 0 else 0.0
-            
-            # Dynamic Info from Cache
-            info = SYMBOLS_CACHE.get(symbol, {"name": symbol, "category": "STOCK"})
-            display_name = info.get("name", symbol)
-            category = info.get("category", "STOCK")
 
-            results.append({
-                "symbol": symbol,
-                "name": display_name, 
-                "marketCap": value_factor, 
-                "price": curr,
-                "prevPrice": prev,
-                "change": round(change_rate, 2), # Keep for legacy compatibility
-                "isActive": True,
-                "currency": "KRW",
-                "category": category
-            })
+def _payload_etag(data) -> str:
+    """응답 데이터 기준 약한 ETag (생성 시각 필드 제외, 데이터가 같으면 동일)"""
+    digest = hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
 
-    return {
-        "symbols": results, 
+
+def _conditional_response(request: Request, cached) -> Response:
+    """If-None-Match 일치 시 304, 아니면 ETag 헤더와 함께 본문 응답"""
+    etag, payload = cached
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={int(MARKET_SNAPSHOT_TTL)}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(payload, headers=headers)
+
+
+async def _build_market_map():
+    results = []
+    async with db_pool.acquire() as conn:
+        # 최근 30일 내 일봉이 있는 종목의 최신/직전 종가 (스냅샷 테이블, 종목당 1행)
+        rows = await _snapshot_rows(conn, max_age_days=30)
+
+    for row in rows:
+        symbol = row['symbol']
+        curr = float(row['close'])
+        prev = float(row['prev_close']) if row['prev_close'] else curr
+
+        value_factor = float(row['volume']) * curr
+        change_rate = ((curr - prev) / prev * 100) if prev > 0 else 0.0
+
+        # Dynamic Info from Cache
+        info = SYMBOLS_CACHE.get(symbol, {"name": symbol, "category": "STOCK"})
+        display_name = info.get("name", symbol)
+        category = info.get("category", "STOCK")
+
+        results.append({
+            "symbol": symbol,
+            "name": display_name,
+            "marketCap": value_factor,
+            "price": curr,
+            "prevPrice": prev,
+            "change": round(change_rate, 2), # Keep for legacy compatibility
+            "isActive": True,
+            "currency": "KRW",
+            "category": category
+        })
+
+    payload = {
+        "symbols": results,
         "timestamp": datetime.now().isoformat(),
         "market": "collected",
         "currency": "KRW"
     }
+    return _payload_etag(results), payload
 
-@app.get("/api/v1/indices/performance", dependencies=[Depends(verify_api_key)])
-async def get_indices_performance():
-    """지수/ETF 성과 데이터 조회 (SectorPerformance용)"""
+@app.get("/api/v1/market-map/{market}", dependencies=[Depends(verify_api_key)])
+async def get_market_map(request: Request, market: str = "us"):
+    """
+    시장별 Treemap 데이터 조회 (DB 기반, 수집된 데이터 한정)
+    market_daily_snapshot 조회 결과를 MARKET_SNAPSHOT_TTL 동안 캐시, ETag/If-None-Match 지원
+    """
     if not db_pool:
         raise HTTPException(status_code=503, detail="Database not available")
 
+    return _conditional_response(request, await snapshot_cache.get("market_map", _build_market_map))
+
+async def _build_indices_performance():
     results = []
     # MARKET 카테고리만 필터링
     target_symbols = [s for s, info in SYMBOLS_CACHE.items() if info["category"] == "MARKET"]
-    
-    if not target_symbols:
-        return []
 
-    async with db_pool.acquire() as conn:
-        rows = await conn.fetch("""
-            WITH RecentRel AS (
-                SELECT 
-                    symbol, 
-                    time, 
-                    close,
-                    ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY time DESC) as rn
-                FROM market_candles
-                WHERE interval = '1d' AND symbol = ANY($1)
-            )
-            SELECT t1.symbol, t1.close as curr, t2.close as prev
-            FROM RecentRel t1
-            LEFT JOIN RecentRel t2 ON t1.symbol = t2.symbol AND t2.rn = 2
-            WHERE t1.rn = 1
-        """, target_symbols)
+    if target_symbols:
+        async with db_pool.acquire() as conn:
+            rows = await _snapshot_rows(conn, symbols=target_symbols)
 
         for row in rows:
             info = SYMBOLS_CACHE.get(row["symbol"], {})
-            curr = float(row["curr"])
-            prev = float(row["prev"]) if row["prev"] else curr
+            curr = float(row["close"])
+            prev = float(row["prev_close"]) if row["prev_close"] else curr
             return_rate = ((curr - prev) / prev * 100) if prev > 0 else 0.0
-            
+
             results.append({
                 "name": info.get("name", row["symbol"]),
                 "etfSymbol": row["symbol"],
@@ -319,143 +456,122 @@ async def get_indices_performance():
             })
 
     # 정렬: 수익률 내림차순
-    return sorted(results, key=lambda x: x["returnRate"], reverse=True)
+    results = sorted(results, key=lambda x: x["returnRate"], reverse=True)
+    return _payload_etag(results), results
 
-@app.get("/api/v1/health")
-async def health_check():
-    """
-    기본 헬스 체크 - DB/Redis 연결 상태 및 응답 시간 확인
-    """
-    import time
+@app.get("/api/v1/indices/performance", dependencies=[Depends(verify_api_key)])
+async def get_indices_performance(request: Request):
+    """지수/ETF 성과 데이터 조회 (SectorPerformance용, 스냅샷 캐시 + ETag)"""
+    if not db_pool:
+        raise HTTPException(status_code=503, detail="Database not available")
 
-    # Redis 상태 확인
-    redis_status = False
-    redis_ms = 0
-    try:
-        start = time.time()
-        r = redis.from_url(REDIS_URL, socket_timeout=2.0)
-        await r.ping()
-        redis_ms = int((time.time() - start) * 1000)
-        redis_status = True
-        await r.close()
-    except Exception:
-        pass
+    return _conditional_response(request, await snapshot_cache.get("indices", _build_indices_performance))
 
-    # DB 상태 확인 (실제 쿼리)
-    db_status = False
-    db_ms = 0
+async def _probe_db_basic() -> dict:
     try:
         if db_pool:
             start = time.time()
             async with db_pool.acquire() as conn:
                 await conn.fetchval("SELECT 1")
-            db_ms = int((time.time() - start) * 1000)
-            db_status = True
+            return {"connected": True, "response_ms": int((time.time() - start) * 1000)}
     except Exception:
         pass
+    return {"connected": False, "response_ms": 0}
+
+
+async def _probe_redis_basic() -> dict:
+    try:
+        start = time.time()
+        await redis_client.ping()
+        return {"connected": True, "response_ms": int((time.time() - start) * 1000)}
+    except Exception:
+        return {"connected": False, "response_ms": 0}
+
+
+async def _build_health() -> dict:
+    db, redis_result = await asyncio.gather(_probe_db_basic(), _probe_redis_basic())
 
     # 전체 상태 판정
-    if db_status and redis_status:
+    if db["connected"] and redis_result["connected"]:
         status = "healthy"
-    elif db_status or redis_status:
+    elif db["connected"] or redis_result["connected"]:
         status = "degraded"
     else:
         status = "unhealthy"
 
     return {
         "status": status,
-        "db": {"connected": db_status, "response_ms": db_ms},
-        "redis": {"connected": redis_status, "response_ms": redis_ms},
+        "db": db,
+        "redis": redis_result,
         "timestamp": datetime.now().isoformat()
     }
 
-
-@app.get("/api/v1/health/detailed")
-async def health_check_detailed():
+@app.get("/api/v1/health")
+async def health_check():
     """
-    상세 헬스 체크 - 시스템 전체 상태 (DB, Redis, Collectors, Sentinel)
+    기본 헬스 체크 - DB/Redis 연결 상태 및 응답 시간 확인 (HEALTH_CACHE_TTL 동안 캐시)
     """
-    import time
+    return await health_cache.get("basic", _build_health)
 
-    result = {
-        "timestamp": datetime.now().isoformat(),
-        "status": "healthy",
-        "database": {},
-        "redis": {},
-        "collectors": {},
-        "sentinel": {}
-    }
 
-    # 1. Database 상태
+async def _probe_database() -> dict:
     try:
-        if db_pool:
-            start = time.time()
-            async with db_pool.acquire() as conn:
-                await conn.fetchval("SELECT 1")
-                db_ms = int((time.time() - start) * 1000)
-
-                # 최근 5분 데이터 수
-                recent_ticks = await conn.fetchval(
-                    "SELECT COUNT(*) FROM market_ticks WHERE time > NOW() - INTERVAL '5 minutes'"
-                )
-
-                # 가장 최근 데이터 시간
-                last_time = await conn.fetchval(
-                    "SELECT MAX(time) FROM market_ticks"
-                )
-                last_age_sec = 0
-                if last_time:
-                    last_age_sec = int((datetime.now(last_time.tzinfo) - last_time).total_seconds())
-
-                result["database"] = {
-                    "status": "connected",
-                    "response_ms": db_ms,
-                    "recent_ticks_5m": recent_ticks or 0,
-                    "last_data_age_sec": last_age_sec
-                }
-        else:
-            result["database"] = {"status": "disconnected", "response_ms": 0}
-            result["status"] = "degraded"
+        if not db_pool:
+            return {"status": "disconnected", "response_ms": 0}
+        start = time.time()
+        async with db_pool.acquire() as conn:
+            await conn.fetchval("SELECT 1")
+            db_ms = int((time.time() - start) * 1000)
+
+            # 최근 5분 데이터 수
+            recent_ticks = await conn.fetchval(
+                "SELECT COUNT(*) FROM market_ticks WHERE time > NOW() - INTERVAL '5 minutes'"
+            )
+
+            # 가장 최근 데이터 시간
+            last_time = await conn.fetchval(
+                "SELECT MAX(time) FROM market_ticks"
+            )
+            last_age_sec = 0
+            if last_time:
+                last_age_sec = int((datetime.now(last_time.tzinfo) - last_time).total_seconds())
+
+            return {
+                "status": "connected",
+                "response_ms": db_ms,
+                "recent_ticks_5m": recent_ticks or 0,
+                "last_data_age_sec": last_age_sec
+            }
     except Exception as e:
-        result["database"] = {"status": "error", "error": str(e)}
-        result["status"] = "degraded"
+        return {"status": "error", "error": str(e)}
 
-    # 2. Redis 상태
+
+async def _probe_redis() -> dict:
     try:
         start = time.time()
-        r = redis.from_url(REDIS_URL, socket_timeout=2.0)
-        await r.ping()
+        await redis_client.ping()
         redis_ms = int((time.time() - start) * 1000)
 
-        # 메모리 사용량
-        info = await r.info("memory")
+        # 메모리 사용량 / 활성 채널
+        info, channels = await asyncio.gather(redis_client.info("memory"), redis_client.pubsub_channels())
         memory_mb = round(info.get("used_memory", 0) / 1024 / 1024, 2)
-
-        # 활성 채널
-        channels = await r.pubsub_channels()
         channel_list = [ch.decode() if isinstance(ch, bytes) else ch for ch in channels]
 
-        await r.close()
-
-        result["redis"] = {
+        return {
             "status": "connected",
             "response_ms": redis_ms,
             "memory_mb": memory_mb,
             "channels": channel_list
         }
     except Exception as e:
-        result["redis"] = {"status": "error", "error": str(e)}
-        result["status"] = "degraded"
+        return {"status": "error", "error": str(e)}
 
-    # 3. Collectors 상태 (Redis에서 마지막 업데이트 시간 조회)
-    try:
-        r = redis.from_url(REDIS_URL, socket_timeout=2.0)
-
-        # Sentinel이 저장한 마지막 데이터 시간 조회
-        kr_last = await r.get("collector:kr:last_update")
-        us_last = await r.get("collector:us:last_update")
 
-        result["collectors"] = {
+async def _probe_collectors() -> dict:
+    """Collectors 상태 (Sentinel이 저장한 마지막 데이터 시간)"""
+    try:
+        kr_last, us_last = await redis_client.mget("collector:kr:last_update", "collector:us:last_update")
+        return {
             "kr": {
                 "active": kr_last is not None,
                 "last_update": kr_last.decode() if kr_last else None
@@ -465,109 +581,81 @@ async def health_check_detailed():
                 "last_update": us_last.decode() if us_last else None
             }
         }
-
-        await r.close()
     except Exception:
-        result["collectors"] = {"kr": {"active": False}, "us": {"active": False}}
+        return {"kr": {"active": False}, "us": {"active": False}}
 
-    # 4. Sentinel 상태 (Redis에서 조회)
-    try:
-        r = redis.from_url(REDIS_URL, socket_timeout=2.0)
-
-        sentinel_status = await r.get("sentinel:status")
-        circuit_breaker = await r.get("sentinel:circuit_breaker")
-        last_alert = await r.get("sentinel:last_alert")
 
-        result["sentinel"] = {
+async def _probe_sentinel() -> dict:
+    try:
+        sentinel_status, circuit_breaker, last_alert = await redis_client.mget(
+            "sentinel:status", "sentinel:circuit_breaker", "sentinel:last_alert"
+        )
+        return {
             "status": sentinel_status.decode() if sentinel_status else "unknown",
             "circuit_breaker": circuit_breaker.decode() if circuit_breaker else "unknown",
             "last_alert": last_alert.decode() if last_alert else None
         }
-
-        await r.close()
     except Exception:
-        result["sentinel"] = {"status": "unknown", "circuit_breaker": "unknown"}
+        return {"status": "unknown", "circuit_breaker": "unknown"}
+
+
+async def _build_health_detailed() -> dict:
+    # DB / Redis / Collectors / Sentinel 프로브 동시 실행
+    database, redis_result, collectors, sentinel = await asyncio.gather(
+        _probe_database(), _probe_redis(), _probe_collectors(), _probe_sentinel()
+    )
+    result = {
+        "timestamp": datetime.now().isoformat(),
+        "status": "healthy",
+        "database": database,
+        "redis": redis_result,
+        "collectors": collectors,
+        "sentinel": sentinel
+    }
 
     # 전체 상태 최종 판정
-    if result["database"].get("status") != "connected" or result["redis"].get("status") != "connected":
-        result["status"] = "unhealthy" if result["status"] == "degraded" else "degraded"
+    if database.get("status") != "connected" or redis_result.get("status") != "connected":
+        result["status"] = "unhealthy"
 
     return result
 
+@app.get("/api/v1/health/detailed")
+async def health_check_detailed():
+    """
+    상세 헬스 체크 - 시스템 전체 상태 (DB, Redis, Collectors, Sentinel)
+    프로브는 동시 실행, 결과는 HEALTH_CACHE_TTL 동안 캐시 (폴링 집중 시 프로브 1회로 응답)
+    """
+    return await health_cache.get("detailed", _build_health_detailed)
+
 @app.get("/api/v1/analytics/correlation", dependencies=[Depends(verify_api_key)])
 async def get_correlation_matrix(days: int = 30):
     """
     최근 N일간 종가 기준 상관관계 매트릭스 계산
+    증분 엔진(src/analysis/correlation.py): 신규 1d 캔들만 반영, 창(days)별 결과 캐시
     """
     if not db_pool:
         raise HTTPException(status_code=503, detail="Database not available")
 
-    import pandas as pd
-    import numpy as np
-    
     async with db_pool.acquire() as conn:
-        # 최근 N일간의 모든 1d 캔들 가져오기
-        # Pivot을 위해 데이터를 가져와서 Pandas로 처리
-        rows = await conn.fetch("""
-            SELECT time, symbol, close
-            FROM market_candles 
-            WHERE interval = '1d' AND time > NOW() - INTERVAL '60 days' 
-            ORDER BY time ASC
-        """)
-        
-        if not rows:
-             return {"nodes": [], "links": []}
+        await correlation_engine.refresh(conn)
 
-        # Convert to DataFrame
-        df = pd.DataFrame([dict(r) for r in rows], columns=['time', 'symbol', 'close'])
-        
-        # Pivot: Index=Time, Columns=Symbol, Values=Close
-        pivot_df = df.pivot_table(index='time', columns='symbol', values='close')
-        
-        # 최근 'days' 만큼 슬라이싱 (데이터가 충분하지 않을 수 있으므로 60일치 가져와서 뒤에서 자름)
-        pivot_df = pivot_df.tail(days)
-        
-        # Forward fill missing values (휴장일 등) -> Drop duplicate cols if any
-        pivot_df = pivot_df.ffill().dropna(axis=1) # 데이터가 너무 없는 종목은 제외
-
-        # Calculate PCT Change for correlation (가격 절대값이 아닌 변화율의 상관관계가 더 의미있음)
-        pct_df = pivot_df.pct_change().dropna()
-
-        # Calculate Correlation Matrix
-        corr_matrix = pct_df.corr()
-        
-        # Format for D3/Recharts Graph: Nodes & Links
-        # Nodes: Symbols
-        # Links: Significant correlations (|r| > 0.5)
-        
-        nodes = [{"id": sym, "group": 1} for sym in corr_matrix.columns]
-        links = []
-        
-        for i, sym1 in enumerate(corr_matrix.columns):
-            for j, sym2 in enumerate(corr_matrix.columns):
-                if i >= j: continue # Avoid duplicates and self-loop
-                val = corr_matrix.iloc[i, j]
-                if abs(val) > 0.5: # Filter weak correlations
-                    links.append({
-                        "source": sym1,
-                        "target": sym2,
-                        "value": round(val, 2)
-                    })
-                    
-        return {
-            "nodes": nodes,
-            "links": links,
-            "matrix": corr_matrix.reset_index().to_dict(orient='records'), # Full matrix if needed
-            "period": f"Last {days} Days"
-        }
+    if not correlation_engine.history:
+        return {"nodes": [], "links": []}
+    return correlation_engine.result(days)
 
 # --- WebSocket Endpoint ---
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+    # 틱 프레임 레이트 협상: /ws?tick_hz=0 (원본 스트림), 미지정 시 WS_TICK_HZ
+    try:
+        tick_hz = parse_tick_hz(websocket.query_params.get("tick_hz", WS_TICK_HZ))
+    except ValueError:
+        tick_hz = WS_TICK_HZ
+    session = await manager.connect(websocket, tick_hz)
     try:
         while True:
-            await websocket.receive_text()
+            # 구독 명령 (src/api/broadcaster.py 참조)
+            await manager.handle_command(session, await websocket.receive_text())
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -40,3 +40,30 @@ async def get_system_metrics(request: Request, limit: int = 100):
             })
             
         return results
+
+
+@router.get("/latency")
+async def get_pipeline_latency(request: Request, minutes: int = 10):
+    """
+    틱 파이프라인 단계별 지연 히스토그램 요약 (최근 보고 기준)
+    - source(collector/archiver) x stage x market 별 p50/p99/p999/max (us)
+    """
+    if not hasattr(request.app.state, "db_pool") or not request.app.state.db_pool:
+        raise HTTPException(status_code=503, detail="Database not available")
+
+    pool = request.app.state.db_pool
+
+    async with pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT DISTINCT ON (meta->>'source', meta->>'stage', meta->>'market') time, meta
+            FROM system_metrics
+            WHERE type = 'pipeline_latency' AND time > NOW() - make_interval(mins => $1)
+            ORDER BY meta->>'source', meta->>'stage', meta->>'market', time DESC
+        """, minutes)
+
+        results = []
+        for r in rows:
+            meta = json.loads(r['meta']) if isinstance(r['meta'], str) else r['meta']
+            results.append({"time": r['time'].isoformat(), **meta})
+
+        return results
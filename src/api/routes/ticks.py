@@ -0,0 +1,216 @@
+"""
+틱 이력 스트리밍 조회 (연구/백테스트용 대량 조회)
+
+GET /api/v1/ticks/history?start=...&end=...&symbols=005930,DNASNVDA&limit=100000&format=arrow
+
+- 시간 구간 조회 + (time, symbol) Keyset 페이지네이션: 응답의 next 커서를 after로 넘기면 다음 페이지
+  (OFFSET 없이 인덱스 위치에서 바로 이어서 조회, 같은 (time, symbol) 틱은 페이지 경계에서 나누지 않음)
+- asyncpg 서버 측 커서에서 TICK_STREAM_BATCH 행씩 읽어 바로 인코딩/전송 (전체 결과를 메모리에 올리지 않음)
+- 응답 포맷:
+    json   : {"rows": [{time, symbol, price, volume, change}, ...], "next": 커서 | null}
+    ndjson : 행마다 JSON 1줄, 마지막 줄 {"next": 커서 | null}
+    arrow  : Apache Arrow IPC stream (배치당 RecordBatch 1개, pyarrow 미설치 시 406)
+             본문 끝에 커서를 실을 수 없으므로 다음 페이지는 마지막 행으로 구성: encode_cursor(time, symbol)
+커서 형식: base64url("ISO 시각|symbol")
+"""
+import base64
+import json
+import os
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from ..auth import verify_api_key
+
+TICK_STREAM_BATCH = int(os.getenv("TICK_STREAM_BATCH", "5000"))  # 커서 1회 읽기 행 수
+TICK_HISTORY_MAX_LIMIT = int(os.getenv("TICK_HISTORY_MAX_LIMIT", "1000000"))
+
+FORMATS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+router = APIRouter(
+    prefix="/api/v1/ticks",
+    tags=["ticks"],
+    dependencies=[Depends(verify_api_key)]
+)
+
+_QUERY = """
+    SELECT time, symbol, price, volume, change
+    FROM market_ticks
+    WHERE time >= $1 AND time < $2
+      AND ($3::text[] IS NULL OR symbol = ANY($3))
+      AND ($4::timestamptz IS NULL OR (time, symbol) > ($4, $5))
+    ORDER BY time, symbol
+"""
+
+
+def encode_cursor(time: datetime, symbol: str) -> str:
+    return base64.urlsafe_b64encode(f"{time.isoformat()}|{symbol}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        time_text, symbol = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(time_text), symbol
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def iter_tick_batches(pool, start: datetime, end: datetime, symbols: Optional[List[str]],
+                            after: Optional[Tuple[datetime, str]], limit: int,
+                            batch_size: int = TICK_STREAM_BATCH) -> AsyncIterator[list]:
+    """
+    서버 측 커서로 limit행(+ 마지막 (time, symbol)과 같은 틱)까지 배치 단위 반환
+    연결은 스트림 종료(또는 클라이언트 중단) 시 반환
+    """
+    after_time, after_symbol = after if after else (None, None)
+    sent = 0
+    last_key = None
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            cursor = await conn.cursor(_QUERY, start, end, symbols, after_time, after_symbol)
+            while True:
+                rows = await cursor.fetch(batch_size)
+                if not rows:
+                    return
+                if sent + len(rows) >= limit:
+                    cut = max(limit - sent, 0)
+                    if cut:
+                        last_key = (rows[cut - 1]["time"], rows[cut - 1]["symbol"])
+                    # 페이지 경계의 같은 키 틱은 이번 페이지에 포함 (strict keyset 비교로 누락 방지)
+                    while cut < len(rows) and (rows[cut]["time"], rows[cut]["symbol"]) == last_key:
+                        cut += 1
+                    if cut < len(rows):
+                        if cut:
+                            yield rows[:cut]
+                        return
+                sent += len(rows)
+                last_key = (rows[-1]["time"], rows[-1]["symbol"])
+                yield rows
+
+
+def _row_json(row) -> str:
+    return json.dumps({
+        "time": row["time"].isoformat(),
+        "symbol": row["symbol"],
+        "price": row["price"],
+        "volume": row["volume"],
+        "change": row["change"],
+    })
+
+
+async def _stream_json(batches, limit: int):
+    yield '{"rows":['
+    count, last = 0, None
+    async for rows in batches:
+        prefix = "," if count else ""
+        yield prefix + ",".join(_row_json(row) for row in rows)
+        count += len(rows)
+        last = rows[-1]
+    yield f'],"next":{json.dumps(_next_cursor(last, count, limit))}}}'
+
+
+async def _stream_ndjson(batches, limit: int):
+    count, last = 0, None
+    async for rows in batches:
+        yield "".join(_row_json(row) + "\n" for row in rows)
+        count += len(rows)
+        last = rows[-1]
+    yield json.dumps({"next": _next_cursor(last, count, limit)}) + "\n"
+
+
+def _next_cursor(last, count: int, limit: int) -> Optional[str]:
+    """limit을 채웠으면 다음 페이지가 있을 수 있음 -> 마지막 행 커서"""
+    if last is None or count < limit:
+        return None
+    return encode_cursor(last["time"], last["symbol"])
+
+
+class _ChunkSink:
+    """Arrow IPC writer 출력 버퍼 (배치마다 비워서 응답 청크로 전송)"""
+
+    closed = False
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+async def _stream_arrow(batches, pa):
+    schema = pa.schema([
+        ("time", pa.timestamp("us", tz="UTC")),
+        ("symbol", pa.string()),
+        ("price", pa.float64()),
+        ("volume", pa.float64()),
+        ("change", pa.float64()),
+    ])
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    async for rows in batches:
+        writer.write_batch(pa.record_batch(
+            [pa.array([row[field.name] for row in rows], type=field.type) for field in schema],
+            schema=schema,
+        ))
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+@router.get("/history")
+async def stream_tick_history(
+    request: Request,
+    start: datetime,
+    end: Optional[datetime] = None,
+    symbols: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = 100000,
+    format: str = "json",
+):
+    """
+    시간 구간 틱 이력 스트리밍 (Keyset 페이지네이션, json/ndjson/arrow)
+    """
+    pool = getattr(request.app.state, "db_pool", None)
+    if not pool:
+        raise HTTPException(status_code=503, detail="Database not available")
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {sorted(FORMATS)}")
+    if not 0 < limit <= TICK_HISTORY_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be 1..{TICK_HISTORY_MAX_LIMIT}")
+
+    pa = None
+    if format == "arrow":
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise HTTPException(status_code=406, detail="Arrow format unavailable (pyarrow not installed)")
+
+    end = end or datetime.now(timezone.utc)
+    symbol_list = [s.strip() for s in symbols.split(",") if s.strip()] if symbols else None
+    cursor = decode_cursor(after) if after else None
+    batches = iter_tick_batches(pool, start, end, symbol_list, cursor, limit, TICK_STREAM_BATCH)
+
+    if format == "arrow":
+        body = _stream_arrow(batches, pa)
+    elif format == "ndjson":
+        body = _stream_ndjson(batches, limit)
+    else:
+        body = _stream_json(batches, limit)
+    return StreamingResponse(body, media_type=FORMATS[format])
@@ -0,0 +1,125 @@
+"""
+API 프로세스 내 최신 상태 캐시 (Latest-State Cache)
+- redis_subscriber가 수신한 ticker.* / orderbook.* 메시지로 갱신
+- 틱: 종목별 최근 N건 Ring Buffer (deque maxlen)
+- 호가: 종목별 최신 전체 호가 1건 (orderbook_delta는 OrderbookRebuilder로 재구성 후 저장)
+
+조회 정책:
+- 요청 건수(limit)를 캐시가 채울 수 있으면 메모리에서 응답
+- 더 깊은 이력(캐시 보유량 초과) 또는 캐시 미적재(재시작 직후 등) 시 None -> 호출측에서 DB 조회
+
+TTLCache: 비싼 조회 결과(헬스 체크 등)를 짧은 TTL 동안 재사용
+- 같은 키의 동시 요청은 진행 중인 1회 계산 결과를 공유 (Single-Flight)
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from src.core.schema import MessageType
+
+API_TICK_CACHE_SIZE = int(os.getenv("API_TICK_CACHE_SIZE", "1000"))  # 종목별 보관 틱 수
+
+
+class LatestStateCache:
+    def __init__(self, tick_capacity: int = API_TICK_CACHE_SIZE):
+        self.tick_capacity = tick_capacity
+        # symbol -> deque[(timestamp, price, volume, change)] (오래된 -> 최신)
+        self.ticks: Dict[str, Deque[tuple]] = {}
+        self.orderbooks: Dict[str, dict] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+
+    def update(self, data: dict):
+        """수신 메시지 반영 (ticker: Ring Buffer 추가, orderbook: 최신 호가 교체)"""
+        msg_type = data.get("type")
+        if msg_type == MessageType.TICKER.value:
+            self.add_tick(data)
+        elif msg_type == MessageType.ORDERBOOK.value:
+            self.orderbooks[data["symbol"]] = data
+
+    def add_tick(self, data: dict):
+        ring = self.ticks.get(data["symbol"])
+        if ring is None:
+            ring = self.ticks[data["symbol"]] = deque(maxlen=self.tick_capacity)
+        ring.append((data["timestamp"], data["price"], data["volume"], data.get("change")))
+
+    def recent_ticks(self, symbol: str, limit: int) -> Optional[List[dict]]:
+        """최신순 최근 틱 (market_ticks 조회 결과와 동일한 필드), 캐시로 채울 수 없으면 None"""
+        ring = self.ticks.get(symbol)
+        if ring is None or len(ring) < limit:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [
+            {"time": datetime.fromisoformat(ts), "symbol": symbol, "price": price, "volume": volume, "change": change}
+            for ts, price, volume, change in islice(reversed(ring), limit)
+        ]
+
+    def latest_orderbook(self, symbol: str) -> Optional[dict]:
+        book = self.orderbooks.get(symbol)
+        if book is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return book
+
+    def stats(self) -> dict:
+        return {
+            "symbols": len(self.ticks),
+            "orderbooks": len(self.orderbooks),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class TTLCache:
+    """키별 결과 캐시 (ttl 초), 만료 후 첫 요청만 계산하고 동시 요청은 결과 대기"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.entries: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self.entries.get(key)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            self.hits += 1
+            return entry[1]
+
+        inflight = self._inflight.get(key)
+        if inflight:
+            self.hits += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await factory()
+        except BaseException as e:
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                future.exception()  # 대기자가 없어도 미회수 경고 방지
+            else:
+                future.cancel()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self.entries[key] = (time.monotonic(), value)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: Optional[str] = None):
+        if key is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(key, None)
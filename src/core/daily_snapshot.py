@@ -0,0 +1,109 @@
+"""
+종목별 일봉 스냅샷 (market_daily_snapshot)
+- 종목당 1행: 최신 일봉(time, close, volume) + 직전 일봉(prev_time, prev_close)
+- market_candles 1d 적재 시 행 트리거로 증분 갱신 (History Loader COPY / Backfiller / 실시간 캔들 모두 반영)
+- market-map / indices 조회는 ROW_NUMBER() 윈도우 대신 이 테이블을 O(종목 수)로 조회
+
+트리거 갱신 규칙 (NEW = 적재된 1d 캔들):
+    NEW.time >  time       : 최신 -> 직전으로 이동, NEW가 최신
+    NEW.time =  time       : 최신 값 교체 (같은 날 재적재)
+    prev_time < NEW.time < time 또는 직전 없음 : NEW가 직전 (과거 백필)
+    NEW.time =  prev_time  : 직전 값 교체
+
+ensure_daily_snapshot()은 멱등 (API/Loader 기동 시 호출), 테이블이 비어 있으면 기존 캔들로 1회 채움
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_TABLE = "market_daily_snapshot"
+
+_CREATE_TABLE = f"""
+    CREATE TABLE IF NOT EXISTS {SNAPSHOT_TABLE} (
+        symbol TEXT PRIMARY KEY,
+        time TIMESTAMPTZ NOT NULL,
+        close DOUBLE PRECISION,
+        volume DOUBLE PRECISION,
+        prev_time TIMESTAMPTZ,
+        prev_close DOUBLE PRECISION
+    );
+"""
+
+_CREATE_FUNCTION = f"""
+    CREATE OR REPLACE FUNCTION refresh_daily_snapshot() RETURNS TRIGGER AS $$
+    DECLARE
+        snap {SNAPSHOT_TABLE}%ROWTYPE;
+    BEGIN
+        SELECT * INTO snap FROM {SNAPSHOT_TABLE} WHERE symbol = NEW.symbol FOR UPDATE;
+        IF NOT FOUND THEN
+            INSERT INTO {SNAPSHOT_TABLE} (symbol, time, close, volume)
+            VALUES (NEW.symbol, NEW.time, NEW.close, NEW.volume)
+            ON CONFLICT (symbol) DO NOTHING;
+        ELSIF NEW.time > snap.time THEN
+            UPDATE {SNAPSHOT_TABLE}
+            SET prev_time = snap.time, prev_close = snap.close,
+                time = NEW.time, close = NEW.close, volume = NEW.volume
+            WHERE symbol = NEW.symbol;
+        ELSIF NEW.time = snap.time THEN
+            UPDATE {SNAPSHOT_TABLE} SET close = NEW.close, volume = NEW.volume WHERE symbol = NEW.symbol;
+        ELSIF snap.prev_time IS NULL OR NEW.time >= snap.prev_time THEN
+            UPDATE {SNAPSHOT_TABLE} SET prev_time = NEW.time, prev_close = NEW.close WHERE symbol = NEW.symbol;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+_CREATE_TRIGGER = """
+    CREATE OR REPLACE TRIGGER market_candles_daily_snapshot
+    AFTER INSERT ON market_candles
+    FOR EACH ROW WHEN (NEW.interval = '1d')
+    EXECUTE FUNCTION refresh_daily_snapshot();
+"""
+
+# 최초 1회: 기존 1d 캔들에서 종목별 최신 2건으로 채움
+_SEED = f"""
+    INSERT INTO {SNAPSHOT_TABLE} (symbol, time, close, volume, prev_time, prev_close)
+    SELECT t1.symbol, t1.time, t1.close, t1.volume, t2.time, t2.close
+    FROM (
+        SELECT symbol, time, close, volume,
+               ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY time DESC) AS rn
+        FROM market_candles WHERE interval = '1d'
+    ) t1
+    LEFT JOIN (
+        SELECT symbol, time, close,
+               ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY time DESC) AS rn
+        FROM market_candles WHERE interval = '1d'
+    ) t2 ON t1.symbol = t2.symbol AND t2.rn = 2
+    WHERE t1.rn = 1
+    ON CONFLICT (symbol) DO NOTHING;
+"""
+
+
+async def ensure_daily_snapshot(conn):
+    """스냅샷 테이블 + market_candles 트리거 생성 (market_candles가 있어야 함)"""
+    async with conn.transaction():
+        await conn.execute(_CREATE_TABLE)
+        await conn.execute(_CREATE_FUNCTION)
+        await conn.execute(_CREATE_TRIGGER)
+        if not await conn.fetchval(f"SELECT EXISTS (SELECT 1 FROM {SNAPSHOT_TABLE})"):
+            await conn.execute(_SEED)
+            logger.info(f"📸 {SNAPSHOT_TABLE} seeded from market_candles")
+
+
+async def fetch_daily_snapshot(conn, symbols=None, max_age_days=None):
+    """
+    Args:
+        symbols: 대상 종목 (None: 전체)
+        max_age_days: 최신 일봉이 이 기간 이내인 종목만 (None: 제한 없음)
+
+    Returns:
+        [{"symbol", "time", "close", "volume", "prev_close"}, ...]
+    """
+    rows = await conn.fetch(f"""
+        SELECT symbol, time, close, volume, prev_close
+        FROM {SNAPSHOT_TABLE}
+        WHERE ($1::text[] IS NULL OR symbol = ANY($1))
+          AND ($2::int IS NULL OR time > NOW() - make_interval(days => $2))
+    """, symbols, max_age_days)
+    return [dict(r) for r in rows]
@@ -0,0 +1,127 @@
+"""
+틱 파이프라인 단계별 지연 계측 (HDR 스타일 히스토그램)
+
+타임스탬프 (time.monotonic_ns, 동일 호스트 컨테이너 간 공유 시계):
+    recv    : 수집기 WebSocket 프레임 수신
+    parse   : 파싱 완료
+    publish : 발행 단계 인계 (인코딩 시점)
+    dequeue : Archiver 수신
+    commit  : market_ticks COPY 완료
+recv/parse/publish는 메시지에 실려 전달됨 (JSON "lat" 필드 / Binary 꼬리 블록)
+- 기본 비활성 (LATENCY_TRACKING=true 로 켬), "lat"은 외부 클라이언트 전달 전 제거 (wire_format.to_json_text)
+
+단계(stage) 정의:
+    collector : queue(recv->dequeue), parse(dequeue->parse), publish(parse->publish)
+    archiver  : transport(publish->dequeue), write(dequeue->commit), end_to_end(recv->commit)
+
+집계: (stage, market)별 로그-선형 버킷 히스토그램 (상대 오차 < 1/64)
+보고: 주기마다 system.metrics로 발행 (type: pipeline_latency, value: p99 us) 후 구간 초기화
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+LATENCY_TRACKING = os.getenv("LATENCY_TRACKING", "false").lower() == "true"
+LATENCY_REPORT_INTERVAL = int(os.getenv("LATENCY_REPORT_INTERVAL", "10"))
+
+SUB_BUCKET_BITS = 7  # 2의 거듭제곱 구간당 64~128개 버킷
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+PERCENTILES = (("p50", 50.0), ("p99", 99.0), ("p999", 99.9))
+
+now_ns = time.monotonic_ns
+
+
+class LatencyHistogram:
+    """마이크로초 단위 로그-선형 히스토그램 (희소 dict 버킷)"""
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        shift = max(0, value.bit_length() - SUB_BUCKET_BITS)
+        return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+    @staticmethod
+    def _value_at(index: int) -> int:
+        """버킷 대표값 (구간 중앙)"""
+        shift, mantissa = divmod(index, SUB_BUCKET_COUNT)
+        return (mantissa << shift) + ((1 << shift) >> 1)
+
+    def record(self, value_us: int):
+        value = int(value_us) if value_us > 0 else 0
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> int:
+        if not self.total:
+            return 0
+        rank = max(1, int(self.total * q / 100.0 + 0.5))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._value_at(index), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        result = {name: self.percentile(q) for name, q in PERCENTILES}
+        result["max"] = self.max
+        result["count"] = self.total
+        return result
+
+
+class LatencyRecorder:
+    """(stage, market)별 히스토그램 집합 + system.metrics 주기 보고"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def record(self, stage: str, market: str, elapsed_ns: int):
+        key = (stage, market)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram()
+        histogram.record(elapsed_ns // 1000)
+
+    def snapshot(self, reset: bool = False) -> Dict[Tuple[str, str], dict]:
+        result = {key: h.summary() for key, h in self.histograms.items() if h.total}
+        if reset:
+            self.histograms = {}
+        return result
+
+    async def report_loop(self, redis_client, interval: int = LATENCY_REPORT_INTERVAL):
+        """구간 히스토그램을 system.metrics로 발행 (stage/market별 1건)"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                ts = datetime.now().isoformat()
+                for (stage, market), summary in self.snapshot(reset=True).items():
+                    payload = {
+                        "timestamp": ts,
+                        "type": "pipeline_latency",
+                        "value": summary["p99"],
+                        "meta": {"source": self.source, "stage": stage, "market": market,
+                                 "unit": "us", "interval_sec": interval, **summary},
+                    }
+                    await redis_client.publish("system.metrics", json.dumps(payload))
+            except Exception as e:
+                logger.error(f"Latency Report Error: {e}")
@@ -0,0 +1,135 @@
+"""
+호가 Delta 인코딩 (Snapshot / Diff 스트림)
+- 수집기: 종목별 마지막 호가를 메모리에 유지하고 변경된 레벨만 OrderbookDelta로 발행
+          ORDERBOOK_SNAPSHOT_INTERVAL마다 전체 레벨(snapshot=True)을 발행하여 재동기화
+          변경이 없는 프레임(예상체결 필드만 변경 등)은 발행 생략
+- 소비자(Archiver/API): OrderbookRebuilder로 전체 호가를 재구성
+          seq 누락 감지 시 해당 종목은 다음 snapshot까지 폐기
+
+활성화: ORDERBOOK_DELTA=true (기본 false, 기존 OrderbookData 전체 발행)
+채널은 동일 (orderbook.kr / orderbook.us), type 필드로 구분
+"""
+import os
+import time
+from typing import Dict, List, Optional
+
+from src.core.schema import MessageType, OrderbookData, OrderbookDelta
+
+ORDERBOOK_DELTA = os.getenv("ORDERBOOK_DELTA", "false").lower() == "true"
+ORDERBOOK_SNAPSHOT_INTERVAL = float(os.getenv("ORDERBOOK_SNAPSHOT_INTERVAL", "10"))
+
+
+def _diff(old: list, new: list) -> list:
+    """레벨별 (price, vol) 비교 -> 변경된 (index, price, vol) 목록"""
+    return [(i, level[0], level[1]) for i, level in enumerate(new) if i >= len(old) or old[i] != level]
+
+
+class OrderbookDeltaEncoder:
+    """수집기측 인코더: OrderbookData -> OrderbookDelta (변경 없으면 None)"""
+
+    def __init__(self, snapshot_interval: float = ORDERBOOK_SNAPSHOT_INTERVAL):
+        self.snapshot_interval = snapshot_interval
+        self.books: Dict[str, tuple] = {}  # symbol -> (asks, bids, totals)
+        self.seqs: Dict[str, int] = {}
+        self.snapshot_at: Dict[str, float] = {}
+
+        # Metrics
+        self.snapshots = 0
+        self.deltas = 0
+        self.suppressed = 0
+
+    def encode(self, book: OrderbookData) -> Optional[OrderbookDelta]:
+        symbol = book.symbol
+        asks = [(unit.price, unit.vol) for unit in book.asks]
+        bids = [(unit.price, unit.vol) for unit in book.bids]
+        totals = (book.total_ask_vol, book.total_bid_vol)
+
+        prev = self.books.get(symbol)
+        now = time.monotonic()
+        snapshot = prev is None or now - self.snapshot_at[symbol] >= self.snapshot_interval
+        if snapshot:
+            ask_changes, bid_changes = _diff([], asks), _diff([], bids)
+            self.snapshot_at[symbol] = now
+            self.snapshots += 1
+        else:
+            ask_changes, bid_changes = _diff(prev[0], asks), _diff(prev[1], bids)
+            depth_changed = len(asks) != len(prev[0]) or len(bids) != len(prev[1])
+            if not ask_changes and not bid_changes and not depth_changed and totals == prev[2]:
+                self.suppressed += 1
+                return None
+            self.deltas += 1
+
+        seq = self.seqs.get(symbol, 0) + 1
+        self.seqs[symbol] = seq
+        self.books[symbol] = (asks, bids, totals)
+        send_totals = snapshot or totals != prev[2]
+        return OrderbookDelta(
+            timestamp=book.timestamp,
+            symbol=symbol,
+            seq=seq,
+            snapshot=snapshot,
+            n_asks=len(asks),
+            n_bids=len(bids),
+            asks=ask_changes,
+            bids=bid_changes,
+            total_ask_vol=totals[0] if send_totals else None,
+            total_bid_vol=totals[1] if send_totals else None,
+        )
+
+    def encode_all(self, records: list) -> list:
+        return [delta for delta in map(self.encode, records) if delta is not None]
+
+    def stats(self) -> dict:
+        return {"snapshots": self.snapshots, "deltas": self.deltas, "suppressed": self.suppressed}
+
+
+class OrderbookRebuilder:
+    """소비자측 재구성기: orderbook / orderbook_delta 메시지 -> 전체 호가 dict (OrderbookData JSON 구조)"""
+
+    def __init__(self):
+        self.books: Dict[str, dict] = {}  # symbol -> {"seq", "asks", "bids", "total_ask_vol", "total_bid_vol"}
+        self.gaps = 0
+
+    @staticmethod
+    def _apply(levels: List[list], size: int, changes: list) -> List[list]:
+        levels = levels[:size] + [None] * (size - len(levels))
+        for i, price, vol in changes:
+            levels[i] = [price, vol]
+        return levels
+
+    def apply(self, data: dict) -> Optional[dict]:
+        """
+        Returns:
+            재구성된 전체 호가 (재동기화 대기 중이면 None)
+            전체 호가(orderbook) 메시지는 그대로 반환
+        """
+        if data.get("type") != MessageType.ORDERBOOK_DELTA.value:
+            return data
+
+        symbol = data["symbol"]
+        state = self.books.get(symbol)
+        if data["snapshot"]:
+            state = self.books[symbol] = {"asks": [], "bids": [], "total_ask_vol": None, "total_bid_vol": None}
+        elif state is None or data["seq"] != state["seq"] + 1:
+            if state is not None:
+                self.gaps += 1
+                del self.books[symbol]
+            return None
+
+        state["seq"] = data["seq"]
+        state["asks"] = self._apply(state["asks"], data["n_asks"], data["asks"])
+        state["bids"] = self._apply(state["bids"], data["n_bids"], data["bids"])
+        if data.get("total_ask_vol") is not None:
+            state["total_ask_vol"] = data["total_ask_vol"]
+        if data.get("total_bid_vol") is not None:
+            state["total_bid_vol"] = data["total_bid_vol"]
+
+        return {
+            "type": MessageType.ORDERBOOK.value,
+            "timestamp": data["timestamp"],
+            "symbol": symbol,
+            "asks": [{"price": price, "vol": vol} for price, vol in state["asks"]],
+            "bids": [{"price": price, "vol": vol} for price, vol in state["bids"]],
+            "total_ask_vol": state["total_ask_vol"],
+            "total_bid_vol": state["total_bid_vol"],
+        }
@@ -6,6 +6,8 @@ from datetime import datetime
 class MessageType(str, Enum):
     TICKER = "ticker"
     ORDERBOOK = "orderbook"
+    ORDERBOOK_DELTA = "orderbook_delta"
+    CANDLE = "candle"
     ALERT = "alert"
     SYSTEM = "system"
 
@@ -26,6 +28,21 @@ class OrderbookData(BaseMessage):
     symbol: str = Field(..., min_length=1)
     asks: list[OrderbookUnit]
     bids: list[OrderbookUnit]
+    total_ask_vol: Optional[float] = None  # 총매도호가잔량 (제공 시)
+    total_bid_vol: Optional[float] = None  # 총매수호가잔량 (제공 시)
+
+class OrderbookDelta(BaseMessage):
+    """호가 변경분(Diff) 스키마 (snapshot=True: 전체 레벨 포함, 재동기화 기준점)"""
+    type: MessageType = MessageType.ORDERBOOK_DELTA
+    symbol: str = Field(..., min_length=1)
+    seq: int  # 종목별 연속 번호 (누락 감지)
+    snapshot: bool = False
+    n_asks: int  # 적용 후 레벨 수
+    n_bids: int
+    asks: list[tuple[int, float, float]] = []  # (level index, price, vol)
+    bids: list[tuple[int, float, float]] = []
+    total_ask_vol: Optional[float] = None  # 변경 시에만 포함
+    total_bid_vol: Optional[float] = None
 
 class MarketData(BaseMessage):
     """실시간 체결가(Ticker) 데이터 스케마"""
@@ -35,6 +52,18 @@ class MarketData(BaseMessage):
     change: float  # 전일 대비 등락률 (%)
     volume: float = Field(..., ge=0)
 
+class CandleData(BaseMessage):
+    """마감된 OHLCV 봉 스키마 (timestamp: 봉 시작 시각)"""
+    type: MessageType = MessageType.CANDLE
+    symbol: str = Field(..., min_length=1)
+    interval: str  # 1m, 5m ...
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = Field(..., ge=0)
+    ticks: int = Field(..., ge=1)  # 봉을 구성한 체결 수
+
 class NewsAlert(BaseMessage):
     """뉴스 분석 및 알림 스키마"""
     type: MessageType = MessageType.ALERT
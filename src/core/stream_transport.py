@@ -0,0 +1,206 @@
+"""
+내부 시장 데이터 채널 전송 계층 (Redis Pub/Sub / Redis Streams)
+- pubsub  : 기존 방식 (fire-and-forget, 구독자 재시작/지연 시 유실)
+- streams : XADD(MAXLEN ~ 트리밍) + Consumer Group(XREADGROUP/XACK)
+            재시작 후 미처리 구간 재처리(replay), 소비 지연(lag) 측정, 배치 읽기
+- both    : 발행자는 두 경로 모두 기록 (마이그레이션 기간용), 소비자는 Streams로 수신
+
+모드 선택: REDIS_TRANSPORT 환경변수 (기본 pubsub, 호환 모드)
+Streams 대상 채널: STREAM_CHANNELS (쉼표 구분, fnmatch 패턴) - 그 외 채널(system.* 등)은 항상 Pub/Sub
+
+Stream 키는 채널명에 접두어를 붙여 사용 (ticker.kr -> stream:ticker.kr)
+엔트리 구조: {"d": <JSON 또는 Binary payload>} (wire_format.decode_message로 디코딩)
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+from datetime import datetime
+from fnmatch import fnmatch
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+from redis.exceptions import ResponseError
+
+logger = logging.getLogger(__name__)
+
+TRANSPORT_MODES = ("pubsub", "streams", "both")
+REDIS_TRANSPORT = os.getenv("REDIS_TRANSPORT", "pubsub")
+if REDIS_TRANSPORT not in TRANSPORT_MODES:
+    raise ValueError(f"Unknown REDIS_TRANSPORT: {REDIS_TRANSPORT} (expected one of {TRANSPORT_MODES})")
+
+STREAM_CHANNELS = [p.strip() for p in os.getenv("STREAM_CHANNELS", "ticker.*,orderbook.*").split(",") if p.strip()]
+MARKET_STREAMS = [c.strip() for c in os.getenv("MARKET_STREAMS", "ticker.kr,ticker.us,orderbook.kr,orderbook.us").split(",") if c.strip()]
+STREAM_MAXLEN = int(os.getenv("STREAM_MAXLEN", "200000"))
+STREAM_READ_COUNT = int(os.getenv("STREAM_READ_COUNT", "500"))
+STREAM_BLOCK_MS = int(os.getenv("STREAM_BLOCK_MS", "1000"))
+STREAM_LAG_INTERVAL = int(os.getenv("STREAM_LAG_INTERVAL", "10"))
+STREAM_CONSUMER = os.getenv("STREAM_CONSUMER", socket.gethostname())
+
+STREAM_PREFIX = "stream:"
+STREAM_FIELD = b"d"
+
+
+def stream_key(channel: str) -> str:
+    return f"{STREAM_PREFIX}{channel}"
+
+
+def consumes_streams(mode: str = REDIS_TRANSPORT) -> bool:
+    """소비자가 Streams에서 시장 데이터를 읽어야 하는지 여부"""
+    return mode != "pubsub"
+
+
+@lru_cache(maxsize=None)
+def _routes(channel: str, mode: str) -> Tuple[bool, bool]:
+    """채널별 (Pub/Sub 발행 여부, Stream 기록 여부)"""
+    if mode == "pubsub" or not any(fnmatch(channel, p) for p in STREAM_CHANNELS):
+        return True, False
+    return mode == "both", True
+
+
+def routed_to_stream(channel: str, mode: str = REDIS_TRANSPORT) -> bool:
+    """채널이 Stream에 기록되는지 여부 (Streams 소비자는 Pub/Sub 수신분을 무시해 중복 방지)"""
+    return _routes(channel, mode)[1]
+
+
+def queue_publish(pipe, channel: str, message, mode: str = REDIS_TRANSPORT):
+    """파이프라인에 발행 명령 적재 (모드에 따라 PUBLISH / XADD / 둘 다)"""
+    to_pubsub, to_stream = _routes(channel, mode)
+    if to_pubsub:
+        pipe.publish(channel, message)
+    if to_stream:
+        pipe.xadd(stream_key(channel), {STREAM_FIELD: message}, maxlen=STREAM_MAXLEN, approximate=True)
+
+
+class StreamConsumer:
+    """Consumer Group 기반 배치 소비자 (TimescaleArchiver / Sentinel 공용)"""
+
+    def __init__(self, redis_client, group: str, channels: Iterable[str] = MARKET_STREAMS,
+                 consumer: str = STREAM_CONSUMER, start_id: str = "0",
+                 count: int = STREAM_READ_COUNT, block_ms: int = STREAM_BLOCK_MS, live: bool = False):
+        """
+        Args:
+            start_id: 그룹 최초 생성 시 시작 위치 ("0": 보존된 전체 재처리, "$": 신규 엔트리만)
+            live: 재시작 시 미처리/pending 구간을 건너뛰고 최신 엔트리부터 수신 (실시간 전달 전용 소비자)
+        """
+        self.redis = redis_client
+        self.group = group
+        self.consumer = consumer
+        self.start_id = "$" if live else start_id
+        self.live = live
+        self.count = count
+        self.block_ms = block_ms
+        self.channels: Dict[str, str] = {stream_key(c): c for c in channels}
+        # 재시작 직후에는 미확인(pending) 엔트리부터 재처리 후 신규(">") 수신
+        self._read_ids: Dict[str, str] = {key: ">" if live else "0" for key in self.channels}
+
+        # Metrics
+        self.delivered = 0
+        self.acked = 0
+        self.replayed = 0
+
+    async def ensure_groups(self):
+        """Stream/Consumer Group 생성 (이미 존재하면 무시)"""
+        for key in self.channels:
+            try:
+                await self.redis.xgroup_create(key, self.group, id=self.start_id, mkstream=True)
+                logger.info(f"🧩 Consumer group '{self.group}' created on {key}")
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+                if self.live:
+                    await self.redis.xgroup_setid(key, self.group, id="$")
+
+    async def read(self) -> List[Tuple[str, bytes, bytes]]:
+        """
+        배치 읽기 (XREADGROUP)
+
+        Returns:
+            List[(channel, entry_id, payload)]
+        """
+        block = None if self._replaying() else self.block_ms
+        response = await self.redis.xreadgroup(
+            self.group, self.consumer, self._read_ids, count=self.count, block=block
+        )
+
+        entries = []
+        for key, messages in response or []:
+            key = key.decode() if isinstance(key, bytes) else key
+            channel = self.channels[key]
+            if self._read_ids[key] != ">":
+                if not messages:
+                    # pending 재처리 완료 -> 신규 엔트리 수신으로 전환
+                    self._read_ids[key] = ">"
+                    continue
+                # 다음 읽기는 마지막으로 받은 pending 엔트리 이후부터
+                self._read_ids[key] = messages[-1][0]
+                self.replayed += len(messages)
+            for entry_id, fields in messages:
+                if fields is None:  # pending 상태에서 MAXLEN 트리밍으로 삭제된 엔트리
+                    entries.append((channel, entry_id, None))
+                    continue
+                entries.append((channel, entry_id, fields.get(STREAM_FIELD)))
+
+        if self._replaying() and not entries:
+            # 모든 pending 스트림이 비어 있는 경우 (응답에 포함되지 않은 키 포함)
+            for key in self._read_ids:
+                self._read_ids[key] = ">"
+
+        self.delivered += len(entries)
+        return entries
+
+    def _replaying(self) -> bool:
+        return any(read_id != ">" for read_id in self._read_ids.values())
+
+    async def ack(self, entries: Iterable[Tuple[str, bytes]]):
+        """처리 완료 엔트리 확인 (channel, entry_id) - 스트림별 XACK 1회"""
+        by_key: Dict[str, list] = {}
+        for channel, entry_id in entries:
+            by_key.setdefault(stream_key(channel), []).append(entry_id)
+        if not by_key:
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, ids in by_key.items():
+                pipe.xack(key, self.group, *ids)
+            results = await pipe.execute()
+        self.acked += sum(results)
+
+    async def lag(self) -> Dict[str, dict]:
+        """스트림별 소비 지연 (lag: 미전달 엔트리 수, pending: 전달 후 미확인 수)"""
+        result = {}
+        for key, channel in self.channels.items():
+            try:
+                groups = await self.redis.xinfo_groups(key)
+            except ResponseError:
+                continue
+            for info in groups:
+                name = info.get("name")
+                name = name.decode() if isinstance(name, bytes) else name
+                if name == self.group:
+                    # lag 필드는 Redis 7+ (구버전/산출 불가 시 None)
+                    result[channel] = {"lag": info.get("lag"), "pending": info.get("pending", 0)}
+        return result
+
+    async def report_lag(self, interval: int = STREAM_LAG_INTERVAL):
+        """주기적으로 소비 지연을 system.metrics로 발행 (type: stream_consumer_lag)"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                ts = datetime.now().isoformat()
+                for channel, info in (await self.lag()).items():
+                    lag = info["lag"] if info["lag"] is not None else info["pending"]
+                    payload = {
+                        "timestamp": ts,
+                        "type": "stream_consumer_lag",
+                        "value": lag,
+                        "meta": {"stream": channel, "group": self.group, "consumer": self.consumer,
+                                 "pending": info["pending"]},
+                    }
+                    await self.redis.publish("system.metrics", json.dumps(payload))
+            except Exception as e:
+                logger.error(f"Stream Lag Report Error: {e}")
+
+    def stats(self) -> dict:
+        return {"delivered": self.delivered, "acked": self.acked, "replayed": self.replayed}
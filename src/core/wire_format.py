@@ -0,0 +1,201 @@
+"""
+내부 채널(ticker.* / orderbook.*) 직렬화 포맷
+- JSON (기본): MarketData/OrderbookData.model_dump_json() 그대로
+- Binary (선택): 고정 struct 레이아웃 + 스키마 버전 바이트 (JSON 대비 약 1/3 크기, 파싱 비용 감소)
+
+채널별 선택: BINARY_CHANNELS 환경변수 (쉼표 구분, fnmatch 패턴 허용)
+    BINARY_CHANNELS="ticker.*,orderbook.kr"
+
+소비자(Archiver/Sentinel/API)는 decode_message()로 두 포맷을 모두 처리
+- JSON 메시지는 항상 '{'로 시작, Binary 메시지는 첫 바이트가 스키마 버전(1)이므로 구분 가능
+- Binary 수신 시 Redis 클라이언트는 decode_responses=False 여야 함
+
+지연 계측 타임스탬프 (선택, src.core.latency): (recv, parse, publish) monotonic ns
+- JSON   : 마지막 필드로 "lat":[recv,parse,publish] 추가
+- Binary : ticker 꼬리에 <qqq> 블록 추가 (없으면 생략, 구버전 소비자는 무시)
+
+Binary Layout (little-endian):
+    ticker    : <B version> <B type=1> <d epoch> <d price> <d change> <d volume> <B len> symbol [<qqq> lat]
+    orderbook : <B version> <B type=2> <d epoch> <B n_asks> <B n_bids> <B len> symbol
+                [<d price> <d vol>] * n_asks  [<d price> <d vol>] * n_bids  [<dd> total_ask_vol, total_bid_vol]
+    delta     : <B version> <B type=3> <d epoch> <I seq> <B flags> <B n_asks> <B n_bids>
+                <B ask_changes> <B bid_changes> <B len> symbol
+                [<B level> <d price> <d vol>] * (ask_changes + bid_changes)  [<dd> totals (flags & 2)]
+                flags: 1=snapshot, 2=totals 포함
+"""
+import json
+import os
+import struct
+from datetime import datetime
+from fnmatch import fnmatch
+from functools import lru_cache
+from typing import Callable, Tuple, Union
+
+from src.core.schema import MessageType
+
+WIRE_VERSION = 1
+TYPE_TICKER = 1
+TYPE_ORDERBOOK = 2
+TYPE_ORDERBOOK_DELTA = 3
+
+BINARY_CHANNELS = [p.strip() for p in os.getenv("BINARY_CHANNELS", "").split(",") if p.strip()]
+
+_TICK_HEADER = struct.Struct("<BBddddB")
+_BOOK_HEADER = struct.Struct("<BBdBBB")
+_LEVEL = struct.Struct("<dd")
+_LATENCY = struct.Struct("<qqq")
+_TOTALS = struct.Struct("<dd")
+_DELTA_HEADER = struct.Struct("<BBdIBBBBBB")
+_CHANGE = struct.Struct("<Bdd")
+
+
+def encode_json(data_obj) -> str:
+    return data_obj.model_dump_json()
+
+
+def encode_binary(data_obj) -> bytes:
+    """MarketData/OrderbookData(또는 동일 속성 객체)를 Binary 포맷으로 직렬화"""
+    symbol = data_obj.symbol.encode()
+    epoch = data_obj.timestamp.timestamp()
+
+    if data_obj.type == MessageType.ORDERBOOK_DELTA.value:
+        return _encode_delta(data_obj, symbol, epoch)
+
+    if data_obj.type == MessageType.ORDERBOOK.value:
+        asks, bids = data_obj.asks, data_obj.bids
+        levels = []
+        for unit in asks:
+            levels.append(_LEVEL.pack(unit.price, unit.vol))
+        for unit in bids:
+            levels.append(_LEVEL.pack(unit.price, unit.vol))
+        total_ask, total_bid = getattr(data_obj, "total_ask_vol", None), getattr(data_obj, "total_bid_vol", None)
+        if total_ask is not None and total_bid is not None:
+            levels.append(_TOTALS.pack(total_ask, total_bid))
+        header = _BOOK_HEADER.pack(WIRE_VERSION, TYPE_ORDERBOOK, epoch, len(asks), len(bids), len(symbol))
+        return header + symbol + b"".join(levels)
+
+    return _TICK_HEADER.pack(
+        WIRE_VERSION, TYPE_TICKER, epoch,
+        data_obj.price, data_obj.change, data_obj.volume, len(symbol)
+    ) + symbol
+
+
+def _encode_delta(delta, symbol: bytes, epoch: float) -> bytes:
+    has_totals = delta.total_ask_vol is not None and delta.total_bid_vol is not None
+    flags = (1 if delta.snapshot else 0) | (2 if has_totals else 0)
+    parts = [_DELTA_HEADER.pack(
+        WIRE_VERSION, TYPE_ORDERBOOK_DELTA, epoch, delta.seq, flags,
+        delta.n_asks, delta.n_bids, len(delta.asks), len(delta.bids), len(symbol)
+    ), symbol]
+    for level, price, vol in delta.asks:
+        parts.append(_CHANGE.pack(level, price, vol))
+    for level, price, vol in delta.bids:
+        parts.append(_CHANGE.pack(level, price, vol))
+    if has_totals:
+        parts.append(_TOTALS.pack(delta.total_ask_vol, delta.total_bid_vol))
+    return b"".join(parts)
+
+
+def attach_latency(message: Union[str, bytes], stamps: Tuple[int, int, int]) -> Union[str, bytes]:
+    """인코딩된 ticker 메시지에 지연 계측 타임스탬프 (recv, parse, publish) 추가"""
+    if isinstance(message, (bytes, bytearray)):
+        return message + _LATENCY.pack(*stamps)
+    return f'{message[:-1]},"lat":[{stamps[0]},{stamps[1]},{stamps[2]}]}}'
+
+
+@lru_cache(maxsize=None)
+def get_encoder(channel: str) -> Callable:
+    """채널별 인코더 선택 (BINARY_CHANNELS 패턴 매칭 시 Binary)"""
+    if any(fnmatch(channel, pattern) for pattern in BINARY_CHANNELS):
+        return encode_binary
+    return encode_json
+
+
+def is_binary(raw: Union[str, bytes]) -> bool:
+    return isinstance(raw, (bytes, bytearray)) and len(raw) > 0 and raw[0] == WIRE_VERSION
+
+
+def decode_binary(raw: bytes) -> dict:
+    """Binary 메시지 -> model_dump_json()과 동일한 구조의 dict (timestamp는 ISO 문자열)"""
+    version, msg_type = raw[0], raw[1]
+    if version != WIRE_VERSION:
+        raise ValueError(f"Unsupported wire version: {version}")
+
+    if msg_type == TYPE_TICKER:
+        _, _, epoch, price, change, volume, sym_len = _TICK_HEADER.unpack_from(raw)
+        offset = _TICK_HEADER.size
+        data = {
+            "type": MessageType.TICKER.value,
+            "timestamp": datetime.fromtimestamp(epoch).isoformat(),
+            "symbol": raw[offset:offset + sym_len].decode(),
+            "price": price,
+            "change": change,
+            "volume": volume,
+        }
+        offset += sym_len
+        if len(raw) >= offset + _LATENCY.size:
+            data["lat"] = list(_LATENCY.unpack_from(raw, offset))
+        return data
+
+    if msg_type == TYPE_ORDERBOOK:
+        _, _, epoch, n_asks, n_bids, sym_len = _BOOK_HEADER.unpack_from(raw)
+        offset = _BOOK_HEADER.size
+        symbol = raw[offset:offset + sym_len].decode()
+        offset += sym_len
+        end = offset + _LEVEL.size * (n_asks + n_bids)
+        levels = [{"price": price, "vol": vol} for price, vol in _LEVEL.iter_unpack(raw[offset:end])]
+        totals = _TOTALS.unpack_from(raw, end) if len(raw) >= end + _TOTALS.size else (None, None)
+        return {
+            "type": MessageType.ORDERBOOK.value,
+            "timestamp": datetime.fromtimestamp(epoch).isoformat(),
+            "symbol": symbol,
+            "asks": levels[:n_asks],
+            "bids": levels[n_asks:],
+            "total_ask_vol": totals[0],
+            "total_bid_vol": totals[1],
+        }
+
+    if msg_type == TYPE_ORDERBOOK_DELTA:
+        _, _, epoch, seq, flags, n_asks, n_bids, n_ask_chg, n_bid_chg, sym_len = _DELTA_HEADER.unpack_from(raw)
+        offset = _DELTA_HEADER.size
+        symbol = raw[offset:offset + sym_len].decode()
+        offset += sym_len
+        end = offset + _CHANGE.size * (n_ask_chg + n_bid_chg)
+        changes = [list(change) for change in _CHANGE.iter_unpack(raw[offset:end])]
+        totals = _TOTALS.unpack_from(raw, end) if flags & 2 else (None, None)
+        return {
+            "type": MessageType.ORDERBOOK_DELTA.value,
+            "timestamp": datetime.fromtimestamp(epoch).isoformat(),
+            "symbol": symbol,
+            "seq": seq,
+            "snapshot": bool(flags & 1),
+            "n_asks": n_asks,
+            "n_bids": n_bids,
+            "asks": changes[:n_ask_chg],
+            "bids": changes[n_ask_chg:],
+            "total_ask_vol": totals[0],
+            "total_bid_vol": totals[1],
+        }
+
+    raise ValueError(f"Unknown wire message type: {msg_type}")
+
+
+def decode_message(raw: Union[str, bytes]) -> dict:
+    """JSON/Binary 자동 판별 후 dict로 디코딩"""
+    if is_binary(raw):
+        return decode_binary(raw)
+    return json.loads(raw)
+
+
+def to_json_text(raw: Union[str, bytes]) -> str:
+    """외부 클라이언트(WebSocket) 전달용 JSON 문자열로 정규화 (내부 지연 계측 "lat" 필드 제거)"""
+    if is_binary(raw):
+        data = decode_binary(raw)
+        data.pop("lat", None)
+        return json.dumps(data)
+    text = raw.decode() if isinstance(raw, (bytes, bytearray)) else raw
+    # attach_latency는 항상 마지막 필드로 덧붙이므로 꼬리만 잘라낸다
+    cut = text.rfind(',"lat":[')
+    if cut != -1 and text.endswith("]}"):
+        return text[:cut] + "}"
+    return text
@@ -8,8 +8,9 @@ import os
 import asyncio
 import asyncpg
 import shutil
-from datetime import datetime, timedelta
-import src.analysis.indicators as ind
+from datetime import datetime, timedelta, timezone
+from src.analysis.incremental import IndicatorSeries
+from src.api.candle_service import CANDLE_INTERVALS, fetch_bucketed_candles
 
 # --- 설정 (Configuration) ---
 TICKS_DB = os.getenv("TICKS_DB", "data/ticks.duckdb")
@@ -55,9 +56,26 @@ def get_duckdb_conn(db_path):
         return duckdb.connect(temp_path, read_only=True)
     except: return None
 
+def get_indicator_series(symbol, interval, hours):
+    """
+    종목/주기/조회 범위별 증분 지표 상태를 반환한다 (세션 내 재실행 간 유지).
+
+    Args:
+        symbol (str): 종목 심볼
+        interval (str): 데이터 주기
+        hours (int): 조회 범위 (범위마다 보관 구간이 달라 별도 상태)
+
+    Returns:
+        IndicatorSeries: RSI/MACD/볼린저 밴드 증분 상태
+    """
+    key = f"indicators:{symbol}:{interval}:{hours}"
+    if key not in st.session_state:
+        st.session_state[key] = IndicatorSeries()
+    return st.session_state[key]
+
 async def load_ohlc_data(symbol, interval="1m", hours=6):
     """
-    TimescaleDB의 Continuous Aggregates로부터 OHLC(Open, High, Low, Close, Volume) 데이터를 로드한다.
+    TimescaleDB의 1m 캔들/틱을 주기별로 집계하여 OHLC(Open, High, Low, Close, Volume) 데이터를 로드한다.
     추가로 SMA(이동평균선) 기술 지표를 계산하여 데이터프레임에 포함한다.
 
     Args:
@@ -71,16 +89,10 @@ async def load_ohlc_data(symbol, interval="1m", hours=6):
     try:
         conn = await asyncpg.connect(TIMESCALEDB_URL)
         
-        # 인터벌에 따른 뷰 선택
-        view_name = "candles_1m" if interval == "1m" else "candles_5m"
-        
-        query = f"""
-            SELECT bucket as time, open, high, low, close, volume
-            FROM {view_name}
-            WHERE symbol = $1 AND bucket > NOW() - INTERVAL '{hours} hours'
-            ORDER BY bucket ASC
-        """
-        rows = await conn.fetch(query, symbol)
+        # API 캔들 서비스와 동일한 집계 (1m 캔들 + 최근 틱 -> time_bucket)
+        bucket_sec = CANDLE_INTERVALS.get(interval, 60)
+        start = datetime.now(timezone.utc) - timedelta(hours=hours)
+        rows = await fetch_bucketed_candles(conn, symbol, bucket_sec, hours * 3600 // bucket_sec, start)
         await conn.close()
         
         df = pd.DataFrame(rows, columns=['time', 'open', 'high', 'low', 'close', 'volume'])
@@ -89,10 +101,10 @@ async def load_ohlc_data(symbol, interval="1m", hours=6):
             df['sma20'] = df['close'].rolling(window=20).mean()
             df['sma50'] = df['close'].rolling(window=50).mean()
             
-            # 고급 기술 지표 추가
-            df['rsi'] = ind.calculate_rsi(df)
-            df['macd'], df['macd_signal'], df['macd_hist'] = ind.calculate_macd(df)
-            df['bb_upper'], df['bb_mid'], df['bb_lower'] = ind.calculate_bollinger_bands(df)
+            # 고급 기술 지표 추가 (증분 상태: 재실행 시 새로 마감된 봉만 계산)
+            indicators = get_indicator_series(symbol, interval, hours).update(df['time'], df['close'])
+            for column, values in indicators.items():
+                df[column] = values
             
         return df
     except Exception as e:
@@ -110,7 +122,7 @@ async def get_active_symbols():
 # --- 사이드바 (Sidebar Controls) ---
 with st.sidebar:
     st.header("⚙️ 터미널 설정")
-    selected_interval = st.selectbox("봉 주기", ["1m", "5m"], index=0)
+    selected_interval = st.selectbox("봉 주기", ["1m", "3m", "5m", "15m", "1h"], index=0)
     window_hours = st.slider("조회 범위 (시간)", 1, 24, 6)
     
     st.divider()
@@ -121,7 +133,7 @@ with st.sidebar:
     show_macd = st.checkbox("MACD 인디케이터", value=True)
     
     st.divider()
-    st.info("💡 Continuous Aggregates 기술을 사용하여 대용량 데이터를 지연 없이 렌더링합니다.")
+    st.info("💡 1m 캔들과 최신 틱을 time_bucket으로 집계하여 원하는 주기로 렌더링합니다.")
 
 # --- 메인 화면 (Main Terminal) ---
 st.title("⚡ Antigravity Pro Terminal")
@@ -2,9 +2,14 @@ import asyncio
 import logging
 import json
 import os
+import time
 import asyncpg
 import redis.asyncio as redis
 from datetime import datetime
+from src.core.wire_format import decode_message
+from src.core.stream_transport import StreamConsumer, consumes_streams, REDIS_TRANSPORT
+from src.core.latency import LatencyRecorder, LATENCY_TRACKING, now_ns
+from src.core.orderbook_delta import OrderbookRebuilder
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
@@ -18,17 +23,84 @@ DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "password")
 DB_NAME = os.getenv("DB_NAME", "stockval")
 
-BATCH_SIZE = 100
+BATCH_SIZE = 100  # 초기 배치 크기 (이후 유입 속도/커밋 지연에 따라 조정)
 FLUSH_INTERVAL = 5  # seconds
 
+# Writer (Double Buffer) 설정
+MIN_BATCH_SIZE = int(os.getenv("ARCHIVER_MIN_BATCH", "50"))
+MAX_BATCH_SIZE = int(os.getenv("ARCHIVER_MAX_BATCH", "5000"))
+MAX_BUFFERED_ROWS = int(os.getenv("ARCHIVER_MAX_BUFFERED_ROWS", "50000"))  # 활성 버퍼 상한 (초과 시 수신 대기)
+FLUSH_TARGET_SEC = float(os.getenv("ARCHIVER_FLUSH_TARGET_SEC", "0.25"))  # 배치 1개를 채우는 목표 시간
+FLUSH_RETRY_DELAY = 1.0  # COPY 실패 시 재시도 대기 (초)
+
+# 호가 적재 정책 (틱과 별도: 고빈도/저중요도 -> 큰 배치, 짧은 주기)
+ORDERBOOK_BATCH_SIZE = int(os.getenv("ORDERBOOK_BATCH_SIZE", "500"))
+ORDERBOOK_FLUSH_INTERVAL = float(os.getenv("ORDERBOOK_FLUSH_INTERVAL", "1.0"))
+ORDERBOOK_MAX_BUFFERED_ROWS = int(os.getenv("ORDERBOOK_MAX_BUFFERED_ROWS", "20000"))
+THROUGHPUT_REPORT_INTERVAL = int(os.getenv("ARCHIVER_THROUGHPUT_INTERVAL", "10"))
+
+# 호가 저장 레이아웃
+#   columns : market_orderbook (5레벨, 레벨별 20개 컬럼) - 기존 호환
+#   arrays  : market_orderbook_depth (전체 레벨, 스냅샷당 packed REAL[4][n] 1개 + 총잔량) + 압축 정책
+ORDERBOOK_STORAGE = os.getenv("ORDERBOOK_STORAGE", "columns")
+if ORDERBOOK_STORAGE not in ("columns", "arrays"):
+    raise ValueError(f"Unknown ORDERBOOK_STORAGE: {ORDERBOOK_STORAGE} (expected columns or arrays)")
+ORDERBOOK_COMPRESS_AFTER = os.getenv("ORDERBOOK_COMPRESS_AFTER", "1 day")
+
+ORDERBOOK_DEPTH = 5
+DEPTH_TABLE = "market_orderbook_depth"
+DEPTH_COLUMNS = ['time', 'symbol', 'levels', 'total_ask_vol', 'total_bid_vol']
+ORDERBOOK_COLUMNS = (
+    ['time', 'symbol']
+    + [f'ask_{field}{i}' for i in range(1, ORDERBOOK_DEPTH + 1) for field in ('price', 'vol')]
+    + [f'bid_{field}{i}' for i in range(1, ORDERBOOK_DEPTH + 1) for field in ('price', 'vol')]
+)
+
 class TimescaleArchiver:
-    """Redis에서 데이터를 구독하여 TimescaleDB에 시계열로 저장하는 아카이버"""
+    """
+    Redis에서 데이터를 구독하여 TimescaleDB에 시계열로 저장하는 아카이버
+
+    틱 적재는 Double Buffer 구조:
+    - 수신 루프는 활성 버퍼(self.batch)에 추가만 수행 (COPY 중에도 수신 계속)
+    - 전용 writer 태스크가 활성 버퍼를 봉인(swap)한 뒤 COPY
+    - 배치 크기는 유입 속도 x 커밋 지연으로 조정, 활성 버퍼는 MAX_BUFFERED_ROWS로 상한
+    """
     def __init__(self):
         self.redis = None
         self.db_pool = None
-        self.batch = []
+        self.batch = []  # 활성 버퍼
+        self.pending_acks = []  # Streams 모드: batch에 담긴 틱의 (channel, entry_id), DB 적재 후 XACK
+        self.batch_latency = []  # 지연 계측: batch에 담긴 틱의 (market, recv_ns, dequeue_ns)
+        self.latency = LatencyRecorder("archiver") if LATENCY_TRACKING else None
+        self.stream_consumer = None
         self.running = True
 
+        # Writer 상태
+        self.batch_size = BATCH_SIZE
+        self._flush_lock = asyncio.Lock()  # COPY는 한 번에 하나 (writer/직접 호출 간 중복 적재 방지)
+        self._flush_requested = asyncio.Event()
+        self._buffer_drained = asyncio.Event()
+        self._last_sealed = time.monotonic()
+        self.backpressure_waits = 0
+
+        # 호가 버퍼 (틱과 별도 writer/플러시 정책)
+        self.orderbook_batch = []
+        self.orderbook_acks = []  # Streams 모드: (channel, entry_id)
+        self._orderbook_lock = asyncio.Lock()
+        self._orderbook_requested = asyncio.Event()
+        self._orderbook_drained = asyncio.Event()
+        self.orderbooks = OrderbookRebuilder()  # orderbook_delta 메시지 -> 전체 호가 재구성
+
+        if ORDERBOOK_STORAGE == "arrays":
+            self.orderbook_table, self.orderbook_columns = DEPTH_TABLE, DEPTH_COLUMNS
+            self._orderbook_record = self.depth_row
+        else:
+            self.orderbook_table, self.orderbook_columns = "market_orderbook", ORDERBOOK_COLUMNS
+            self._orderbook_record = self.orderbook_row
+
+        # 처리량 지표 (테이블별 누적 적재 행 수)
+        self.rows_written = {"market_ticks": 0, self.orderbook_table: 0}
+
     async def init_db(self):
         """틱 데이터용 하이퍼테이블(Hypertable) 초기화"""
         conn = await asyncpg.connect(
@@ -69,12 +141,45 @@ class TimescaleArchiver:
             except Exception as e:
                 logger.warning(f"Hypertable creation msg (system_metrics): {e}")
 
+            if ORDERBOOK_STORAGE == "arrays":
+                await self.init_depth_table(conn)
+
         finally:
             await conn.close()
 
+    @staticmethod
+    async def init_depth_table(conn):
+        """전체 레벨 호가 하이퍼테이블 + 네이티브 압축 (symbol 세그먼트, time 역순)"""
+        # levels: [[ask_price...], [ask_vol...], [bid_price...], [bid_vol...]] (1-based: levels[1][1] = 매도1호가)
+        await conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {DEPTH_TABLE} (
+                time TIMESTAMPTZ NOT NULL,
+                symbol TEXT NOT NULL,
+                levels REAL[] NOT NULL,
+                total_ask_vol REAL,
+                total_bid_vol REAL
+            );
+        """)
+        try:
+            await conn.execute(f"SELECT create_hypertable('{DEPTH_TABLE}', 'time', if_not_exists => TRUE);")
+            await conn.execute(f"""
+                ALTER TABLE {DEPTH_TABLE} SET (
+                    timescaledb.compress,
+                    timescaledb.compress_segmentby = 'symbol',
+                    timescaledb.compress_orderby = 'time DESC'
+                );
+            """)
+            await conn.execute(
+                f"SELECT add_compression_policy('{DEPTH_TABLE}', INTERVAL '{ORDERBOOK_COMPRESS_AFTER}', if_not_exists => TRUE);"
+            )
+            logger.info(f"Hypertable '{DEPTH_TABLE}' ensured (compress after {ORDERBOOK_COMPRESS_AFTER}).")
+        except Exception as e:
+            logger.warning(f"Hypertable creation msg ({DEPTH_TABLE}): {e}")
+
     async def start(self):
         # 1. Connect to Resources
-        self.redis = await redis.from_url(REDIS_URL, encoding="utf-8", decode_responses=True)
+        # decode_responses=False: Binary wire format 채널 수신 지원 (JSON/Binary는 decode_message가 판별)
+        self.redis = await redis.from_url(REDIS_URL, decode_responses=False)
         # Create DB Pool
         self.db_pool = await asyncpg.create_pool(
             user=DB_USER, password=DB_PASSWORD, database=DB_NAME, host=DB_HOST, port=DB_PORT
@@ -84,13 +189,26 @@ class TimescaleArchiver:
         logger.info("TimescaleArchiver started. Connected to Redis & DB.")
 
 
-        # 2. Subscribe to pattern (ticker.kr, ticker.us, orderbook.kr, orderbook.us, system.*)
+        # 2. Subscribe
+        # Streams 모드: 시장 데이터(ticker/orderbook)는 Consumer Group으로 수신, system.*만 Pub/Sub
         pubsub = self.redis.pubsub()
-        await pubsub.psubscribe("ticker.*", "orderbook.*", "system.*")
-        logger.info("📡 Subscribed to: ticker.*, orderbook.*, system.*")
+        if consumes_streams():
+            self.stream_consumer = StreamConsumer(self.redis, group="archiver")
+            await self.stream_consumer.ensure_groups()
+            asyncio.create_task(self.consume_streams())
+            asyncio.create_task(self.stream_consumer.report_lag())
+            await pubsub.psubscribe("system.*")
+            logger.info(f"📡 Transport={REDIS_TRANSPORT}: consuming streams {list(self.stream_consumer.channels.values())}, subscribed system.*")
+        else:
+            await pubsub.psubscribe("ticker.*", "orderbook.*", "system.*")
+            logger.info("📡 Subscribed to: ticker.*, orderbook.*, system.*")
         
-        # 3. Flush Task
-        asyncio.create_task(self.periodic_flush())
+        # 3. Writer Tasks (봉인된 버퍼 COPY 전담: 틱 / 호가)
+        asyncio.create_task(self.writer_loop())
+        asyncio.create_task(self.orderbook_writer_loop())
+        asyncio.create_task(self.report_throughput())
+        if self.latency:
+            asyncio.create_task(self.latency.report_loop(self.redis))
 
         # 4. Listen Loop
         logger.info("🔧 DEBUG: Entering listen loop...")
@@ -100,23 +218,15 @@ class TimescaleArchiver:
             
             if msg_type == "pmessage":  # Pattern message
                 try:
-                    channel = message["channel"]
-                    data = json.loads(message["data"])
+                    channel = message["channel"].decode()
+                    data = decode_message(message["data"])
                     
                     if channel.startswith("ticker."):
-                        # Extract market from channel (ticker.kr -> KR, ticker.us -> US)
-                        market = channel.split('.')[-1].upper()
-                        
-                        # Ticks
-                        ts = datetime.fromisoformat(data['timestamp']) if 'timestamp' in data else datetime.now()
-                        row = (ts, data['symbol'], float(data['price']), float(data.get('volume', 0)), float(data.get('change', 0)))
-                        self.batch.append(row)
-                        
-                        if len(self.batch) >= BATCH_SIZE:
-                            await self.flush()
+                        self.queue_tick(channel, data)
+                        await self.tick_queued()
                     
                     elif channel.startswith("orderbook."):
-                        await self.save_orderbook(data)
+                        await self.queue_orderbook(data)
                         
                     elif channel == "system.metrics":
                         await self.save_system_metrics(data)
@@ -126,17 +236,79 @@ class TimescaleArchiver:
             
             elif msg_type == "message":  # Direct message
                 try:
-                    channel = message["channel"]
-                    data = json.loads(message["data"])
+                    channel = message["channel"].decode()
+                    data = decode_message(message["data"])
                     
                     if channel == "market_orderbook":
-                        await self.save_orderbook(data)
+                        await self.queue_orderbook(data)
                     elif channel == "system.metrics": # Direct message fallback
                         await self.save_system_metrics(data)
                         
                 except Exception as e:
                     logger.error(f"Parse/Queue Error (direct): {e}")
 
+    async def consume_streams(self):
+        """Streams 모드 수신 루프 (XREADGROUP 배치 -> DB 적재 성공 후 XACK)"""
+        while self.running:
+            try:
+                entries = await self.stream_consumer.read()
+            except Exception as e:
+                logger.error(f"Stream Read Error: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            done = []  # 즉시 확인 가능한 엔트리 (트리밍/파싱 불가 메시지)
+            for channel, entry_id, raw in entries:
+                try:
+                    if raw is None:  # 트리밍된 엔트리
+                        done.append((channel, entry_id))
+                        continue
+                    data = decode_message(raw)
+                    if channel.startswith("ticker."):
+                        self.queue_tick(channel, data)
+                        self.pending_acks.append((channel, entry_id))
+                    elif channel.startswith("orderbook."):
+                        # COPY 성공 후 XACK (실패 시 미확인 상태로 남겨 재시작 시 재처리)
+                        if not await self.queue_orderbook(data, (channel, entry_id)):
+                            done.append((channel, entry_id))  # 재동기화 대기 중인 delta
+                except Exception as e:
+                    logger.error(f"Parse/Queue Error (stream {channel}): {e}")
+                    done.append((channel, entry_id))
+
+            try:
+                await self.stream_consumer.ack(done)
+            except Exception as e:
+                logger.error(f"Stream Ack Error: {e}")
+
+            await self.tick_queued()
+
+    def queue_tick(self, channel: str, data: dict):
+        """틱을 적재 버퍼에 추가 (지연 계측 타임스탬프가 있으면 transport 단계 기록)"""
+        self.batch.append(self.tick_row(data))
+        lat = data.get("lat")
+        if lat and self.latency:
+            dequeued_ns = now_ns()
+            market = channel.rsplit(".", 1)[-1].upper()
+            self.latency.record("transport", market, dequeued_ns - lat[2])
+            self.batch_latency.append((market, lat[0], dequeued_ns))
+
+    async def tick_queued(self):
+        """배치 크기 도달 시 writer에 플러시 요청, 활성 버퍼 상한 초과 시 봉인될 때까지 대기 (backpressure)"""
+        if len(self.batch) >= self.batch_size:
+            self._flush_requested.set()
+        if len(self.batch) >= MAX_BUFFERED_ROWS:
+            self.backpressure_waits += 1
+            logger.warning(f"⚠️  Tick buffer full ({len(self.batch)} rows). Waiting for writer...")
+            self._buffer_drained.clear()
+            self._flush_requested.set()
+            await self._buffer_drained.wait()
+
+    @staticmethod
+    def tick_row(data: dict) -> tuple:
+        """틱 메시지 -> market_ticks 레코드"""
+        ts = datetime.fromisoformat(data['timestamp']) if 'timestamp' in data else datetime.now()
+        return (ts, data['symbol'], float(data['price']), float(data.get('volume', 0)), float(data.get('change', 0)))
+
     async def save_system_metrics(self, data):
         """시스템 메트릭 저장 (Generic)"""
         async with self.db_pool.acquire() as conn:
@@ -166,19 +338,63 @@ class TimescaleArchiver:
             except Exception as e:
                 logger.error(f"System Metric Save Error: {e}")
 
+    @staticmethod
+    def orderbook_row(data: dict) -> tuple:
+        """
+        호가 메시지 -> market_orderbook 레코드 [time, symbol, ask1, avol1... bid1, bvol1...]
+        수신 레벨이 ORDERBOOK_DEPTH보다 적으면 (US 호가 축소 수신 등) 나머지 컬럼은 NULL
+        """
+        row = [datetime.fromisoformat(data['timestamp']), data['symbol']]
+        for side in ('asks', 'bids'):
+            levels = data[side]
+            for i in range(ORDERBOOK_DEPTH):
+                if i < len(levels):
+                    row.append(levels[i]['price'])
+                    row.append(levels[i]['vol'])
+                else:
+                    row.extend((None, None))
+        return tuple(row)
+
+    @staticmethod
+    def depth_row(data: dict) -> tuple:
+        """호가 메시지 -> market_orderbook_depth 레코드 (전체 레벨을 REAL[4][n] 배열 1개로 압축)"""
+        asks, bids = data['asks'], data['bids']
+        depth = min(len(asks), len(bids))
+        levels = [
+            [unit['price'] for unit in asks[:depth]],
+            [unit['vol'] for unit in asks[:depth]],
+            [unit['price'] for unit in bids[:depth]],
+            [unit['vol'] for unit in bids[:depth]],
+        ]
+        return (datetime.fromisoformat(data['timestamp']), data['symbol'], levels,
+                data.get('total_ask_vol'), data.get('total_bid_vol'))
+
+    async def queue_orderbook(self, data: dict, ack=None) -> bool:
+        """
+        호가 스냅샷을 버퍼에 추가 (COPY 배치 적재, ack: Streams 모드 (channel, entry_id))
+        orderbook_delta 메시지는 전체 호가로 재구성 후 적재 (snapshot 수신 전/누락 시 False)
+        """
+        book = self.orderbooks.apply(data)
+        if book is None:
+            return False
+        self.orderbook_batch.append(self._orderbook_record(book))
+        if ack:
+            self.orderbook_acks.append(ack)
+        if len(self.orderbook_batch) >= ORDERBOOK_BATCH_SIZE:
+            self._orderbook_requested.set()
+        if len(self.orderbook_batch) >= ORDERBOOK_MAX_BUFFERED_ROWS:
+            self.backpressure_waits += 1
+            logger.warning(f"⚠️  Orderbook buffer full ({len(self.orderbook_batch)} rows). Waiting for writer...")
+            self._orderbook_drained.clear()
+            self._orderbook_requested.set()
+            await self._orderbook_drained.wait()
+        return True
+
     async def save_orderbook(self, data):
-        """호가 스냅샷 데이터를 DB에 즉시 저장"""
+        """호가 스냅샷 데이터를 DB에 즉시 저장 (단건 INSERT, 수신 루프는 queue_orderbook 사용)"""
         async with self.db_pool.acquire() as conn:
             try:
-                ts = datetime.fromisoformat(data['timestamp'])
-                # flattened row: [time, symbol, ask1, avol1... bid1, bvol1...]
-                row = [ts, data['symbol']]
-                # Add Asks
-                for i in range(5):
-                    row.extend([data['asks'][i]['price'], data['asks'][i]['vol']])
-                # Add Bids
-                for i in range(5):
-                    row.extend([data['bids'][i]['price'], data['bids'][i]['vol']])
+                row = self.orderbook_row(data)
                 
                 await conn.execute("""
                     INSERT INTO market_orderbook (
@@ -187,34 +403,147 @@ class TimescaleArchiver:
                         bid_price1, bid_vol1, bid_price2, bid_vol2, bid_price3, bid_vol3, bid_price4, bid_vol4, bid_price5, bid_vol5
                     ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19, $20, $21, $22)
                 """, *row)
+                return True
             except Exception as e:
                 logger.error(f"Orderbook Save Error: {e}")
+                return False
+
+    async def orderbook_writer_loop(self):
+        """호가 전용 writer: ORDERBOOK_BATCH_SIZE 도달 또는 ORDERBOOK_FLUSH_INTERVAL 경과 시 COPY"""
+        while self.running or self.orderbook_batch:
+            try:
+                await asyncio.wait_for(self._orderbook_requested.wait(), timeout=ORDERBOOK_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._orderbook_requested.clear()
+            if not await self.flush_orderbooks():
+                await asyncio.sleep(FLUSH_RETRY_DELAY)
+
+    async def flush_orderbooks(self) -> bool:
+        """호가 버퍼를 봉인하고 copy_records_to_table로 일괄 적재"""
+        async with self._orderbook_lock:
+            if not self.orderbook_batch:
+                return True
+
+            batch, acks = self.orderbook_batch, self.orderbook_acks
+            self.orderbook_batch, self.orderbook_acks = [], []
+
+            async with self.db_pool.acquire() as conn:
+                try:
+                    await conn.copy_records_to_table(
+                        self.orderbook_table, records=batch, columns=self.orderbook_columns
+                    )
+                except Exception as e:
+                    logger.error(f"Orderbook Flush Error: {e}")
+                    self.orderbook_batch = batch + self.orderbook_batch
+                    self.orderbook_acks = acks + self.orderbook_acks
+                    return False
+
+            self._orderbook_drained.set()
+            self.rows_written[self.orderbook_table] += len(batch)
+            logger.debug(f"Flushed {len(batch)} orderbook snapshots to TimescaleDB")
+
+        if acks:
+            try:
+                await self.stream_consumer.ack(acks)
+            except Exception as e:
+                logger.error(f"Stream Ack Error: {e}")
+        return True
 
-    async def periodic_flush(self):
-        """지정된 기간(FLUSH_INTERVAL)마다 주기적으로 배치 데이터 적재"""
+    async def report_throughput(self, interval: int = THROUGHPUT_REPORT_INTERVAL):
+        """테이블별 적재 처리량(rows/sec)을 system.metrics로 발행 (type: archiver_rows_per_sec)"""
+        last = dict(self.rows_written)
         while self.running:
-            await asyncio.sleep(FLUSH_INTERVAL)
-            if self.batch:
-                await self.flush()
-
-    async def flush(self):
-        """메모리 버퍼에 쌓인 틱 데이터를 DB에 벌크 인서트"""
-        if not self.batch:
-            return
-            
-        async with self.db_pool.acquire() as conn:
+            await asyncio.sleep(interval)
+            try:
+                ts = datetime.now().isoformat()
+                for table, total in self.rows_written.items():
+                    rate = (total - last[table]) / interval
+                    last[table] = total
+                    payload = {
+                        "timestamp": ts,
+                        "type": "archiver_rows_per_sec",
+                        "value": round(rate, 1),
+                        "meta": {"table": table, "rows_total": total},
+                    }
+                    await self.redis.publish("system.metrics", json.dumps(payload))
+            except Exception as e:
+                logger.error(f"Throughput Report Error: {e}")
+
+    async def writer_loop(self):
+        """전용 writer: 플러시 요청(배치 크기 도달) 또는 FLUSH_INTERVAL 경과 시 활성 버퍼를 봉인하여 COPY"""
+        while self.running or self.batch:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            if not await self.flush():
+                await asyncio.sleep(FLUSH_RETRY_DELAY)
+
+    async def flush(self) -> bool:
+        """
+        활성 버퍼를 봉인(swap)하고 DB에 벌크 인서트
+
+        Returns:
+            bool: 성공 여부 (실패 시 봉인 버퍼를 활성 버퍼 앞쪽으로 복원)
+        """
+        async with self._flush_lock:
+            if not self.batch:
+                return True
+
+            # 봉인: 적재 중 수신되는 틱은 새 활성 버퍼에 쌓임
+            batch, acks, stamps = self.batch, self.pending_acks, self.batch_latency
+            self.batch, self.pending_acks, self.batch_latency = [], [], []
+            sealed_at = time.monotonic()
+            fill_sec = sealed_at - self._last_sealed
+            self._last_sealed = sealed_at
+
+            async with self.db_pool.acquire() as conn:
+                try:
+                    # asyncpg copy_records_to_table is fast
+                    await conn.copy_records_to_table(
+                        'market_ticks',
+                        records=batch,
+                        columns=['time', 'symbol', 'price', 'volume', 'change']
+                    )
+                except Exception as e:
+                    logger.error(f"DB Flush Error: {e}")
+                    # 다음 플러시에서 재시도 (Streams 모드는 미확인 상태 유지 -> 재시작 시 재처리)
+                    self.batch = batch + self.batch
+                    self.pending_acks = acks + self.pending_acks
+                    self.batch_latency = stamps + self.batch_latency
+                    return False
+
+            # 대기 해제는 COPY 성공 후에만 (실패 시 복원된 버퍼가 상한을 넘어 계속 불어나지 않도록)
+            self._buffer_drained.set()
+            commit_sec = time.monotonic() - sealed_at
+            self.rows_written["market_ticks"] += len(batch)
+            self._adapt_batch_size(len(batch), fill_sec, commit_sec)
+            logger.info(f"Flushed {len(batch)} ticks to TimescaleDB in {commit_sec * 1000:.1f}ms (next batch: {self.batch_size})")
+
+        if stamps:
+            committed_ns = now_ns()
+            for market, received_ns, dequeued_ns in stamps:
+                self.latency.record("write", market, committed_ns - dequeued_ns)
+                self.latency.record("end_to_end", market, committed_ns - received_ns)
+
+        if acks:
             try:
-                # asyncpg copy_records_to_table is fast
-                await conn.copy_records_to_table(
-                    'market_ticks',
-                    records=self.batch,
-                    columns=['time', 'symbol', 'price', 'volume', 'change']
-                )
-                logger.info(f"Flushed {len(self.batch)} ticks to TimescaleDB")
-                self.batch = []
+                await self.stream_consumer.ack(acks)
             except Exception as e:
-                logger.error(f"DB Flush Error: {e}")
-                # In production, might want retry logic or DLQ
+                logger.error(f"Stream Ack Error: {e}")
+        return True
+
+    def _adapt_batch_size(self, rows: int, fill_sec: float, commit_sec: float):
+        """
+        배치 크기 조정: COPY 1회 동안 유입되는 행 수에 맞춤
+        - 유입 속도(rows/s) x max(커밋 지연, 목표 적재 주기), EWMA 평활 후 [MIN, MAX] 범위로 제한
+        """
+        rate = rows / max(fill_sec, 1e-3)
+        target = rate * max(commit_sec, FLUSH_TARGET_SEC)
+        smoothed = 0.7 * self.batch_size + 0.3 * target
+        self.batch_size = int(min(MAX_BATCH_SIZE, max(MIN_BATCH_SIZE, smoothed)))
 
 if __name__ == "__main__":
     archiver = TimescaleArchiver()
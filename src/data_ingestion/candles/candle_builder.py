@@ -0,0 +1,303 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import asyncpg
+import numpy as np
+import redis.asyncio as redis
+
+from src.core.schema import CandleData
+from src.core.stream_transport import StreamConsumer, consumes_streams, queue_publish, MARKET_STREAMS, REDIS_TRANSPORT
+from src.core.wire_format import decode_message
+
+# Setup Logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("CandleBuilder")
+
+# Config
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_PORT = os.getenv("DB_PORT", "5432")
+DB_USER = os.getenv("DB_USER", "postgres")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "password")
+DB_NAME = os.getenv("DB_NAME", "stockval")
+
+INTERVAL_SECONDS = {"1m": 60, "3m": 180, "5m": 300, "15m": 900, "1h": 3600}
+CANDLE_INTERVALS = [i.strip() for i in os.getenv("CANDLE_INTERVALS", "1m,5m").split(",") if i.strip()]
+CANDLE_CLOSE_GRACE = float(os.getenv("CANDLE_CLOSE_GRACE", "2"))  # 구간 종료 후 지연 틱 대기 (초)
+CANDLE_FLUSH_INTERVAL = float(os.getenv("CANDLE_FLUSH_INTERVAL", "1.0"))
+CANDLE_MAX_BUFFERED_ROWS = int(os.getenv("CANDLE_MAX_BUFFERED_ROWS", "50000"))  # COPY 실패 누적 상한
+CANDLE_COLUMNS = ['time', 'symbol', 'interval', 'open', 'high', 'low', 'close', 'volume']
+
+# 진행 중 봉 배열 컬럼
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(5)
+EMPTY = -1  # 진행 중 봉 없음
+
+
+class OpenBars:
+    """
+    주기 1개의 종목별 진행 중 봉 (배열 기반 상태)
+    - 종목 슬롯 i -> bucket[i] (구간 시작 epoch 초), ohlcv[i] (open, high, low, close, volume), ticks[i]
+    - last_closed[i]: 마지막으로 마감한 구간 (이후 도착한 지연 틱은 버림 -> 같은 봉 중복 발행 방지)
+    """
+
+    def __init__(self, seconds: int, capacity: int = 256):
+        self.seconds = seconds
+        self.bucket = np.full(capacity, EMPTY, dtype=np.int64)
+        self.last_closed = np.full(capacity, EMPTY, dtype=np.int64)
+        self.ohlcv = np.zeros((capacity, 5), dtype=np.float64)
+        self.ticks = np.zeros(capacity, dtype=np.int32)
+        self.late = 0
+
+    def ensure(self, size: int):
+        capacity = len(self.bucket)
+        if size <= capacity:
+            return
+        grow = max(size, capacity * 2) - capacity
+        self.bucket = np.concatenate([self.bucket, np.full(grow, EMPTY, dtype=np.int64)])
+        self.last_closed = np.concatenate([self.last_closed, np.full(grow, EMPTY, dtype=np.int64)])
+        self.ohlcv = np.concatenate([self.ohlcv, np.zeros((grow, 5))])
+        self.ticks = np.concatenate([self.ticks, np.zeros(grow, dtype=np.int32)])
+
+    def add(self, i: int, epoch: float, price: float, volume: float) -> Optional[tuple]:
+        """
+        틱 반영
+
+        Returns:
+            다음 구간 틱으로 마감된 이전 봉 (bucket, open, high, low, close, volume, ticks) 또는 None
+        """
+        bucket = int(epoch // self.seconds) * self.seconds
+        current = self.bucket[i]
+        if bucket <= self.last_closed[i] or (current != EMPTY and bucket < current):
+            self.late += 1
+            return None
+
+        if bucket == current:
+            bar = self.ohlcv[i]
+            if price > bar[HIGH]:
+                bar[HIGH] = price
+            if price < bar[LOW]:
+                bar[LOW] = price
+            bar[CLOSE] = price
+            bar[VOLUME] += volume
+            self.ticks[i] += 1
+            return None
+
+        closed = self._close(i) if current != EMPTY else None
+        self.bucket[i] = bucket
+        self.ohlcv[i] = (price, price, price, price, volume)
+        self.ticks[i] = 1
+        return closed
+
+    def _close(self, i: int) -> tuple:
+        bucket = int(self.bucket[i])
+        bar = (bucket, *self.ohlcv[i].tolist(), int(self.ticks[i]))
+        self.last_closed[i] = bucket
+        self.bucket[i] = EMPTY
+        return bar
+
+    def close_due(self, now: float, grace: float = CANDLE_CLOSE_GRACE) -> List[tuple]:
+        """구간 종료 + grace가 지난 봉 일괄 마감 (틱이 끊긴 종목) -> [(slot, bar), ...]"""
+        due = np.flatnonzero((self.bucket != EMPTY) & (self.bucket + self.seconds + grace <= now))
+        return [(int(i), self._close(int(i))) for i in due]
+
+
+class CandleBuilder:
+    """ticker 메시지 -> 주기별 마감 봉 (CandleData dict)"""
+
+    def __init__(self, intervals: List[str] = CANDLE_INTERVALS):
+        unknown = [i for i in intervals if i not in INTERVAL_SECONDS]
+        if unknown:
+            raise ValueError(f"Unknown CANDLE_INTERVALS: {unknown} (expected {list(INTERVAL_SECONDS)})")
+        self.tables: Dict[str, OpenBars] = {name: OpenBars(INTERVAL_SECONDS[name]) for name in intervals}
+        self.index: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self.markets: List[str] = []  # 슬롯별 시장 (ticker.kr -> kr, candles.kr로 발행)
+
+    def _slot(self, symbol: str, market: str) -> int:
+        i = self.index.get(symbol)
+        if i is None:
+            i = self.index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self.markets.append(market)
+            for table in self.tables.values():
+                table.ensure(len(self.symbols))
+        return i
+
+    def add_tick(self, data: dict, market: str) -> List[tuple]:
+        """틱 반영 후 마감된 봉 목록 [(market, candle dict), ...]"""
+        i = self._slot(data["symbol"], market)
+        epoch = datetime.fromisoformat(data["timestamp"]).timestamp()
+        price, volume = float(data["price"]), float(data.get("volume", 0.0))
+        closed = []
+        for name, table in self.tables.items():
+            bar = table.add(i, epoch, price, volume)
+            if bar:
+                closed.append((market, self._candle(i, name, bar)))
+        return closed
+
+    def close_due(self, now: float) -> List[tuple]:
+        closed = []
+        for name, table in self.tables.items():
+            for i, bar in table.close_due(now):
+                closed.append((self.markets[i], self._candle(i, name, bar)))
+        return closed
+
+    def _candle(self, i: int, interval: str, bar: tuple) -> dict:
+        bucket, open_, high, low, close, volume, ticks = bar
+        return {
+            "type": "candle",
+            "timestamp": datetime.fromtimestamp(bucket, tz=timezone.utc).isoformat(),
+            "symbol": self.symbols[i],
+            "interval": interval,
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+            "ticks": ticks,
+        }
+
+    def late_ticks(self) -> int:
+        return sum(table.late for table in self.tables.values())
+
+
+class CandleBuilderService:
+    """
+    실시간 봉 생성 서비스
+    - ticker.* 수신 -> CandleBuilder로 주기별(CANDLE_INTERVALS) 진행 중 봉 갱신
+    - 마감 봉: candles.{market} 채널로 발행 + market_candles에 COPY 일괄 적재 (CANDLE_FLUSH_INTERVAL)
+    - 틱이 끊긴 종목의 봉은 구간 종료 + CANDLE_CLOSE_GRACE 후 타이머로 마감
+    - 재시작 시 진행 중 봉은 유실 (History Loader 분봉 백필이 저장되지 않은 시각만 채워 복구, 백필 조회 범위 내 구간)
+    """
+
+    def __init__(self, builder: Optional[CandleBuilder] = None):
+        self.builder = builder or CandleBuilder()
+        self.redis = None
+        self.db_pool = None
+        self.stream_consumer = None
+        self.pending_rows = []  # market_candles 적재 대기
+        self._flush_lock = asyncio.Lock()
+
+        # Metrics
+        self.published = 0
+        self.rows_written = 0
+
+    async def start(self):
+        self.redis = await redis.from_url(REDIS_URL, decode_responses=False)
+        self.db_pool = await asyncpg.create_pool(
+            user=DB_USER, password=DB_PASSWORD, database=DB_NAME, host=DB_HOST, port=DB_PORT
+        )
+        logger.info(f"🕯️ CandleBuilder started (intervals={list(self.builder.tables)})")
+
+        asyncio.create_task(self.close_loop())
+        asyncio.create_task(self.writer_loop())
+
+        if consumes_streams():
+            channels = [c for c in MARKET_STREAMS if c.startswith("ticker.")]
+            self.stream_consumer = StreamConsumer(self.redis, group="candles", channels=channels)
+            await self.stream_consumer.ensure_groups()
+            logger.info(f"📡 Transport={REDIS_TRANSPORT}: consuming streams {channels}")
+            await self.consume_streams()
+            return
+
+        pubsub = self.redis.pubsub()
+        await pubsub.psubscribe("ticker.*")
+        logger.info("📡 Subscribed to: ticker.*")
+        async for message in pubsub.listen():
+            if message["type"] != "pmessage":
+                continue
+            try:
+                channel = message["channel"].decode()
+                await self.emit(self.builder.add_tick(decode_message(message["data"]), channel.split(".", 1)[1]))
+            except Exception as e:
+                logger.error(f"Tick Error: {e}")
+
+    async def consume_streams(self):
+        """Streams 모드: 진행 중 봉에 반영 즉시 XACK (마감 봉 적재 실패는 메모리 재시도)"""
+        while True:
+            try:
+                entries = await self.stream_consumer.read()
+            except Exception as e:
+                logger.error(f"Stream Read Error: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            closed = []
+            for channel, _, raw in entries:
+                if raw is None:
+                    continue
+                try:
+                    closed.extend(self.builder.add_tick(decode_message(raw), channel.split(".", 1)[1]))
+                except Exception as e:
+                    logger.error(f"Tick Error ({channel}): {e}")
+            await self.emit(closed)
+            try:
+                await self.stream_consumer.ack((channel, entry_id) for channel, entry_id, _ in entries)
+            except Exception as e:
+                logger.error(f"Stream Ack Error: {e}")
+
+    async def emit(self, closed: List[tuple]):
+        """마감 봉 발행 (파이프라인 1회) + 적재 대기열 추가"""
+        if not closed:
+            return
+        for _, candle in closed:
+            self.pending_rows.append(self.candle_row(candle))
+        if len(self.pending_rows) > CANDLE_MAX_BUFFERED_ROWS:
+            dropped = len(self.pending_rows) - CANDLE_MAX_BUFFERED_ROWS
+            del self.pending_rows[:dropped]
+            logger.warning(f"⚠️  Candle buffer full, dropped {dropped} oldest rows")
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for market, candle in closed:
+                    queue_publish(pipe, f"candles.{market}", CandleData(**candle).model_dump_json())
+                await pipe.execute()
+            self.published += len(closed)
+        except Exception as e:
+            logger.error(f"Candle Publish Error: {e}")
+
+    @staticmethod
+    def candle_row(candle: dict) -> tuple:
+        """마감 봉 -> market_candles 레코드"""
+        return (
+            datetime.fromisoformat(candle["timestamp"]), candle["symbol"], candle["interval"],
+            candle["open"], candle["high"], candle["low"], candle["close"], candle["volume"],
+        )
+
+    async def close_loop(self):
+        """틱이 끊긴 종목의 봉 마감 (1초 주기)"""
+        while True:
+            await asyncio.sleep(1.0)
+            try:
+                await self.emit(self.builder.close_due(time.time()))
+            except Exception as e:
+                logger.error(f"Close Loop Error: {e}")
+
+    async def writer_loop(self):
+        while True:
+            await asyncio.sleep(CANDLE_FLUSH_INTERVAL)
+            await self.flush()
+
+    async def flush(self) -> bool:
+        """적재 대기 봉 COPY (실패 시 대기열 앞으로 복원 후 다음 주기 재시도)"""
+        async with self._flush_lock:
+            if not self.pending_rows:
+                return True
+            rows, self.pending_rows = self.pending_rows, []
+            try:
+                async with self.db_pool.acquire() as conn:
+                    await conn.copy_records_to_table('market_candles', records=rows, columns=CANDLE_COLUMNS)
+            except Exception as e:
+                logger.error(f"Candle COPY Error ({len(rows)} rows): {e}")
+                self.pending_rows = rows + self.pending_rows
+                return False
+            self.rows_written += len(rows)
+            return True
+
+
+if __name__ == "__main__":
+    service = CandleBuilderService()
+    asyncio.run(service.start())
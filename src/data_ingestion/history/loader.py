@@ -11,6 +11,7 @@ import time
 import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple
+from src.core.daily_snapshot import ensure_daily_snapshot
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
@@ -134,6 +135,8 @@ class HistoryLoader:
                 await conn.execute("SELECT create_hypertable('market_candles', 'time', if_not_exists => TRUE);")
             except Exception:
                 pass
+            # 1d 캔들 적재 시 종목별 최신/직전 종가 스냅샷 갱신 트리거 (market-map/indices 조회용)
+            await ensure_daily_snapshot(conn)
 
     def load_targets(self):
         targets = []
@@ -406,16 +409,17 @@ class HistoryLoader:
         async with self.db_pool.acquire() as conn:
             try:
                 # [Fix] Filter out duplicates to prevent batch failure
-                last_time = await self.get_last_date(symbol, interval)
-                if last_time:
-                     # Ensure timezone awareness (UTC)
-                    if last_time.tzinfo is None:
-                        last_time = last_time.replace(tzinfo=datetime.timezone.utc)
-                    
+                # 이미 저장된 시각만 제외 (MAX(time) 이후만 넣으면 실시간 봉 생성기 재시작 등으로 생긴 중간 공백이 복구되지 않음)
+                index_utc = pd.to_datetime(df.index, utc=True)
+                existing = await conn.fetch(
+                    "SELECT time FROM market_candles WHERE symbol = $1 AND interval = $2 AND time >= $3 AND time <= $4",
+                    symbol, interval, index_utc.min().to_pydatetime(), index_utc.max().to_pydatetime()
+                )
+                if existing:
+                    existing_times = pd.to_datetime([r['time'] for r in existing], utc=True)
                     original_len = len(df)
-                    df = df[df.index > last_time]
-                    if len(df) < original_len:
-                        logger.info(f"Filtered {original_len - len(df)} duplicate rows for {symbol} (Last: {last_time})")
+                    df = df[~index_utc.isin(existing_times)]
+                    logger.info(f"Filtered {original_len - len(df)} duplicate rows for {symbol} (gaps filled: {len(df)})")
                 
                 if df.empty:
                     logger.info(f"No new data to save for {symbol}")
@@ -0,0 +1,134 @@
+"""
+KIS 실시간 프레임 고속 파서 (Fast-Path)
+- '^' 구분 body 전체를 split 하지 않고, tr_id별로 필요한 필드까지만 잘라서 추출
+- pydantic 검증 모델 대신 MarketData와 동일한 JSON을 내보내는 경량 레코드(TickRecord) 생성
+"""
+import logging
+import math
+from datetime import datetime
+from json.encoder import encode_basestring
+from typing import NamedTuple, Optional
+
+from src.core.schema import MarketData, MessageType
+
+logger = logging.getLogger(__name__)
+
+FIELD_SEP = '^'
+
+
+class TickLayout(NamedTuple):
+    """tr_id별 체결 body 필드 인덱스"""
+    symbol: int
+    price: int
+    change: int
+    volume: int
+    change_is_diff: bool = False  # True: 전일대비(diff) -> 등락률(%) 변환 필요
+
+    @property
+    def depth(self) -> int:
+        """필요한 마지막 필드까지의 maxsplit 값"""
+        return max(self.symbol, self.price, self.change, self.volume) + 1
+
+
+# 기존 parse_tick 구현과 동일한 인덱스 (kr/us real_collector 참조)
+KR_TICK_LAYOUT = TickLayout(symbol=0, price=2, change=5, volume=7)
+US_TICK_LAYOUT = TickLayout(symbol=1, price=11, change=12, volume=13, change_is_diff=True)
+
+
+class TickRecord(NamedTuple):
+    """
+    검증 없이 생성되는 경량 체결 레코드
+    - MarketData와 같은 속성(symbol/price/change/volume/timestamp/type)을 제공
+    - model_dump_json()은 MarketData.model_dump_json()과 동일한 JSON을 반환
+    """
+    symbol: str
+    price: float
+    change: float
+    volume: float
+    timestamp: datetime
+    type: str = MessageType.TICKER.value
+
+    def model_dump_json(self) -> str:
+        return (
+            f'{{"type":"{self.type}","timestamp":"{self.timestamp.isoformat()}",'
+            f'"symbol":{encode_basestring(self.symbol)},"price":{self.price!r},'
+            f'"change":{self.change!r},"volume":{self.volume!r}}}'
+        )
+
+    def to_market_data(self) -> MarketData:
+        """검증된 MarketData 모델로 변환 (테스트/디버깅용)"""
+        return MarketData(
+            symbol=self.symbol,
+            price=self.price,
+            change=self.change,
+            volume=self.volume,
+            timestamp=self.timestamp
+        )
+
+
+def parse_tick_fields(body_str: str, layout: TickLayout) -> Optional[TickRecord]:
+    """
+    체결 body에서 layout이 지정한 필드만 추출하여 TickRecord 생성
+
+    Args:
+        body_str: WebSocket 메시지 body ('^' 구분)
+        layout: tr_id별 필드 인덱스
+
+    Returns:
+        TickRecord or None (필드 부족/값 오류 시)
+    """
+    fields = body_str.split(FIELD_SEP, layout.depth)
+    try:
+        symbol = fields[layout.symbol]
+        price = float(fields[layout.price])
+        change = float(fields[layout.change])
+        volume = float(fields[layout.volume])
+    except (IndexError, ValueError) as e:
+        logger.error(f"Fast Parsing Error: {e} | Raw: {body_str}")
+        return None
+
+    if layout.change_is_diff:
+        # 전일종가 = 현재가 - 전일대비
+        prev_close = price - change
+        change = round(change / prev_close * 100, 2) if prev_close != 0 else 0.0
+
+    # MarketData 제약조건(symbol min_length=1, price > 0, volume >= 0) + 유한값(JSON 직렬화 가능) 검증
+    if not symbol or not (price > 0 and volume >= 0) or not math.isfinite(price + change + volume):
+        logger.error(f"Fast Parsing Error: invalid values | Raw: {body_str}")
+        return None
+
+    return TickRecord(symbol, price, change, volume, datetime.now())
+
+
+def parse_record_count(raw: str) -> int:
+    """프레임 헤더(parts[2])의 레코드 수 파싱 (예: '003' -> 3, 오류 시 1)"""
+    try:
+        count = int(raw)
+    except ValueError:
+        return 1
+    return count if count > 0 else 1
+
+
+def split_records(body_str: str, count: int) -> list:
+    """
+    다건 프레임 body를 레코드별 body 문자열로 분리
+    - KIS는 parts[2]에 레코드 수를 싣고, 레코드들을 같은 '^' 구분자로 이어 붙여 전송
+    - 레코드 폭 = 전체 필드 수 // 레코드 수 (tr_id별 필드 수 상수 불필요)
+
+    Args:
+        body_str: WebSocket 메시지 body (parts[3])
+        count: 레코드 수 (parts[2])
+
+    Returns:
+        list[str]: 레코드별 body
+    """
+    if count <= 1:
+        return [body_str]
+
+    fields = body_str.split(FIELD_SEP)
+    width = len(fields) // count
+    if width == 0:
+        logger.error(f"Record Split Error: {len(fields)} fields for {count} records")
+        return []
+
+    return [FIELD_SEP.join(fields[i * width:(i + 1) * width]) for i in range(count)]
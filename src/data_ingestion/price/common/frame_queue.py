@@ -0,0 +1,119 @@
+"""
+수신 프레임 링 버퍼 (Reader / Consumer 분리)
+- Reader(WebSocket 수신 루프)는 raw 프레임을 적재만 하고 즉시 다음 프레임 수신
+- Consumer 태스크가 파싱/발행을 담당 (Redis 지연이 소켓 수신/PING 응답을 막지 않음)
+- 종류별(tick/orderbook) 오버플로 정책 설정 가능
+    - drop_oldest : 가장 오래된 프레임 제거 후 적재 (호가 기본값)
+    - drop_newest : 신규 프레임 거부
+    - keep        : 상한을 넘어도 적재 (체결 기본값, 절대 드롭하지 않음)
+"""
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+FRAME_QUEUE_SIZE = int(os.getenv("FRAME_QUEUE_SIZE", "10000"))
+FRAME_CONSUMERS = int(os.getenv("FRAME_CONSUMERS", "1"))
+FRAME_TICK_OVERFLOW = os.getenv("FRAME_TICK_OVERFLOW", "keep")
+FRAME_ORDERBOOK_OVERFLOW = os.getenv("FRAME_ORDERBOOK_OVERFLOW", "drop_oldest")
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "keep")
+FRAME_KINDS = ("tick", "orderbook")  # Consumer 우선순위 순서
+
+
+class FrameQueue:
+    """종류별 deque로 구성된 bounded 프레임 큐 (체결 우선 소비)"""
+
+    def __init__(self, maxsize: int = FRAME_QUEUE_SIZE,
+                 tick_policy: str = FRAME_TICK_OVERFLOW,
+                 orderbook_policy: str = FRAME_ORDERBOOK_OVERFLOW):
+        for policy in (tick_policy, orderbook_policy):
+            if policy not in OVERFLOW_POLICIES:
+                raise ValueError(f"Unknown overflow policy: {policy} (expected one of {OVERFLOW_POLICIES})")
+
+        self.maxsize = maxsize
+        self.policies: Dict[str, str] = {"tick": tick_policy, "orderbook": orderbook_policy}
+        self._queues: Dict[str, deque] = {kind: deque() for kind in FRAME_KINDS}
+        self._not_empty = asyncio.Event()
+
+        # Metrics
+        self.high_water = 0
+        self.dropped: Dict[str, int] = {kind: 0 for kind in FRAME_KINDS}
+        self.overflow = 0  # 'keep' 정책으로 상한을 넘겨 적재된 횟수
+
+    def depth(self) -> int:
+        return len(self._queues["tick"]) + len(self._queues["orderbook"])
+
+    def put(self, message: str, kind: str = "tick", received_ns: int = 0) -> bool:
+        """
+        프레임 적재 (non-blocking)
+
+        Args:
+            received_ns: 소켓 수신 시각 (monotonic ns, 지연 계측용)
+
+        Returns:
+            bool: 적재 여부 (drop_newest 정책으로 거부되면 False)
+        """
+        if kind not in self._queues:
+            kind = "tick"
+
+        if self.depth() >= self.maxsize and not self._make_room(kind):
+            return False
+
+        self._queues[kind].append((message, received_ns))
+        depth = self.depth()
+        if depth > self.high_water:
+            self.high_water = depth
+        self._not_empty.set()
+        return True
+
+    def _make_room(self, incoming: str) -> bool:
+        """상한 도달 시 정책에 따라 공간 확보 (적재 가능하면 True)"""
+        # 1. drop_oldest 정책 종류(기본: 호가)에서 가장 오래된 프레임 제거
+        for kind in reversed(FRAME_KINDS):
+            if self.policies[kind] == "drop_oldest" and self._queues[kind]:
+                self._queues[kind].popleft()
+                self._count_drop(kind)
+                return True
+
+        # 2. 제거할 대상이 없으면 신규 프레임 종류의 정책 적용
+        if self.policies[incoming] == "keep":
+            self.overflow += 1
+            if self.overflow % 1000 == 1:
+                logger.warning(f"⚠️  Frame queue over capacity ({self.depth()}/{self.maxsize}), keeping {incoming} frames")
+            return True
+
+        self._count_drop(incoming)
+        return False
+
+    def _count_drop(self, kind: str):
+        self.dropped[kind] += 1
+        if self.dropped[kind] % 1000 == 1:
+            logger.warning(f"⚠️  Frame queue full: dropped {self.dropped[kind]} {kind} frames so far")
+
+    async def get(self) -> Tuple[str, str, int]:
+        """다음 프레임 반환 (message, kind, received_ns) - 체결 우선, 비어 있으면 대기"""
+        while True:
+            for kind in FRAME_KINDS:
+                queue = self._queues[kind]
+                if queue:
+                    message, received_ns = queue.popleft()
+                    return message, kind, received_ns
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+    def stats(self) -> dict:
+        """큐 지표 스냅샷"""
+        return {
+            "depth": self.depth(),
+            "depth_tick": len(self._queues["tick"]),
+            "depth_orderbook": len(self._queues["orderbook"]),
+            "high_water": self.high_water,
+            "maxsize": self.maxsize,
+            "dropped_tick": self.dropped["tick"],
+            "dropped_orderbook": self.dropped["orderbook"],
+            "overflow": self.overflow,
+        }
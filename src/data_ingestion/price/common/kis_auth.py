@@ -16,7 +16,10 @@ APP_SECRET = os.getenv("KIS_APP_SECRET")
 class KISAuthManager:
     """KIS API 인증 관리자 (KR/US 공용)"""
     
-    def __init__(self):
+    def __init__(self, app_key: Optional[str] = None, app_secret: Optional[str] = None):
+        # 샤드별 별도 앱키 사용 시 주입 (기본: 환경변수 KIS_APP_KEY/KIS_APP_SECRET)
+        self.app_key = app_key or APP_KEY
+        self.app_secret = app_secret or APP_SECRET
         self.approval_key: Optional[str] = None
     
     async def get_approval_key(self) -> str:
@@ -33,8 +36,8 @@ class KISAuthManager:
         headers = {"content-type": "application/json; utf-8"}
         body = {
             "grant_type": "client_credentials",
-            "appkey": APP_KEY,
-            "secretkey": APP_SECRET
+            "appkey": self.app_key,
+            "secretkey": self.app_secret
         }
         
         async with aiohttp.ClientSession() as session:
@@ -56,8 +59,8 @@ class KISAuthManager:
         headers = {"content-type": "application/json; utf-8"}
         body = {
             "grant_type": "client_credentials",
-            "appkey": APP_KEY,
-            "appsecret": APP_SECRET
+            "appkey": self.app_key,
+            "appsecret": self.app_secret
         }
         
         async with aiohttp.ClientSession() as session:
@@ -0,0 +1,157 @@
+"""
+Redis 파이프라인 발행기 (Publisher Stage)
+- WebSocket 수신 루프는 메모리 큐에 적재만 하고 즉시 반환 (Redis 지연에 블로킹되지 않음)
+- 별도 태스크가 큐를 모아 Redis pipeline 1회 왕복으로 발행
+- 플러시 조건: 배치 크기 도달 또는 첫 메시지 적재 후 마이크로초 단위 데드라인 경과
+- 큐 상한 초과 시 신규 메시지 드롭 + 카운터 기록
+- 전송 방식(PUBLISH / XADD)은 REDIS_TRANSPORT 설정을 따름 (src.core.stream_transport)
+"""
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import Optional
+
+from src.core.stream_transport import queue_publish
+from src.core.wire_format import attach_latency
+from src.core.latency import LatencyRecorder, now_ns
+
+logger = logging.getLogger(__name__)
+
+PUBLISH_BATCH_SIZE = int(os.getenv("PUBLISH_BATCH_SIZE", "256"))
+PUBLISH_MAX_DELAY_US = int(os.getenv("PUBLISH_MAX_DELAY_US", "500"))
+PUBLISH_QUEUE_SIZE = int(os.getenv("PUBLISH_QUEUE_SIZE", "20000"))
+BACKPRESSURE_RATIO = 0.8  # 큐 사용률이 이 비율을 넘으면 backpressure로 집계
+
+
+class PipelinedPublisher:
+    """큐 기반 배치 발행기 (UnifiedWebSocketManager / DualWebSocketManager 공용)"""
+
+    def __init__(self, redis_client, batch_size: int = PUBLISH_BATCH_SIZE,
+                 max_delay_us: int = PUBLISH_MAX_DELAY_US, max_queue: int = PUBLISH_QUEUE_SIZE,
+                 latency: Optional[LatencyRecorder] = None):
+        self.redis = redis_client
+        self.latency = latency
+        self.batch_size = batch_size
+        self.max_delay = max_delay_us / 1_000_000
+        self.max_queue = max_queue
+        self.backpressure_limit = int(max_queue * BACKPRESSURE_RATIO)
+
+        self.queue: deque = deque()
+        self._has_data = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.running = False
+
+        # Counters
+        self.enqueued = 0
+        self.published = 0
+        self.dropped = 0
+        self.backpressure = 0
+        self.flushes = 0
+        self.errors = 0
+        self.high_water = 0
+
+    def publish(self, channel: str, message, stamps: Optional[tuple] = None) -> bool:
+        """
+        발행 요청 적재 (non-blocking)
+
+        Args:
+            stamps: (recv_ns, parse_ns) 지연 계측 타임스탬프 - 플러시 시각을 publish 단계로 덧붙여 발행
+
+        Returns:
+            bool: 적재 성공 여부 (큐 포화 시 False, dropped 증가)
+        """
+        depth = len(self.queue)
+        if depth >= self.max_queue:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"⚠️  Publisher queue full ({depth}). Dropped so far: {self.dropped}")
+            return False
+
+        if depth >= self.backpressure_limit:
+            self.backpressure += 1
+
+        self.queue.append((channel, message, stamps))
+        self.enqueued += 1
+        depth += 1
+        if depth > self.high_water:
+            self.high_water = depth
+
+        self._has_data.set()
+        if depth >= self.batch_size:
+            self._batch_full.set()
+        return True
+
+    def start(self):
+        """발행 태스크 시작"""
+        if self._task is None or self._task.done():
+            self.running = True
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"🚚 Publisher started (batch={self.batch_size}, delay={self.max_delay * 1e6:.0f}us, queue={self.max_queue})")
+
+    async def stop(self):
+        """발행 태스크 종료 (잔여 메시지 플러시 후)"""
+        self.running = False
+        self._has_data.set()
+        self._batch_full.set()  # 데드라인 대기 중인 배치도 즉시 플러시
+        if self._task:
+            await self._task
+            self._task = None
+
+    async def _run(self):
+        while self.running or self.queue:
+            if not self.queue:
+                self._has_data.clear()
+                await self._has_data.wait()
+                continue
+
+            # 배치가 덜 찼으면 데드라인까지 추가 적재 대기
+            if self.running and len(self.queue) < self.batch_size:
+                self._batch_full.clear()
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), timeout=self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+
+            await self.flush()
+
+    async def flush(self):
+        """큐에서 최대 batch_size 만큼 꺼내 파이프라인으로 발행"""
+        if not self.queue:
+            return
+
+        count = min(len(self.queue), self.batch_size)
+        popleft = self.queue.popleft
+        batch = [popleft() for _ in range(count)]
+
+        flushed_ns = now_ns()
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for channel, message, stamps in batch:
+                    if stamps:
+                        message = attach_latency(message, (stamps[0], stamps[1], flushed_ns))
+                        if self.latency:
+                            self.latency.record("publish", channel.rsplit(".", 1)[-1].upper(), flushed_ns - stamps[1])
+                    queue_publish(pipe, channel, message)
+                await pipe.execute()
+            self.published += count
+            self.flushes += 1
+        except Exception as e:
+            # Redis 장애 시 해당 배치는 유실 처리 (수신 루프 보호 우선)
+            self.errors += 1
+            self.dropped += count
+            logger.error(f"Publisher Flush Error: {e} (dropped {count})")
+
+    def stats(self) -> dict:
+        """발행 카운터 스냅샷"""
+        return {
+            "queue_depth": len(self.queue),
+            "high_water": self.high_water,
+            "enqueued": self.enqueued,
+            "published": self.published,
+            "dropped": self.dropped,
+            "backpressure": self.backpressure,
+            "flushes": self.flushes,
+            "errors": self.errors,
+        }
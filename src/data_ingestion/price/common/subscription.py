@@ -0,0 +1,113 @@
+"""
+병렬 구독 엔진 (Pipelined Subscription)
+- 여러 구독 요청을 동시에 in-flight 상태로 유지 (응답 대기 중에도 다음 요청 전송)
+- 전송 속도는 Token Bucket으로 제한 (KIS 초당 요청 한도 보호)
+- 구독 응답은 (tr_id, tr_key) 기준으로 도착 순서와 무관하게 매칭 (UnifiedWebSocketManager.handle_message)
+- 실패/타임아웃 요청만 라운드 단위로 재시도
+- 결과: 전체 구독 완료까지 걸린 시간(time-to-subscribed) 리포트
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBE_RATE = float(os.getenv("SUBSCRIBE_RATE", "10"))      # 초당 요청 수
+SUBSCRIBE_BURST = int(os.getenv("SUBSCRIBE_BURST", "10"))      # 순간 허용 요청 수
+SUBSCRIBE_INFLIGHT = int(os.getenv("SUBSCRIBE_INFLIGHT", "20"))  # 동시 응답 대기 상한
+SUBSCRIBE_RETRY_DELAY = 1.0  # 재시도 라운드 간 대기 (초)
+
+
+class TokenBucket:
+    """비동기 Token Bucket (rate: 초당 토큰, burst: 최대 적립 토큰)"""
+
+    def __init__(self, rate: float = SUBSCRIBE_RATE, burst: int = SUBSCRIBE_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+@dataclass
+class SubscriptionReport:
+    """구독 결과 리포트"""
+    market: str
+    total: int = 0
+    confirmed: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)  # (tr_id, tr_key)
+    requests: int = 0  # 재시도 포함 전송 횟수
+    rounds: int = 0
+    elapsed: float = 0.0  # time-to-subscribed (초)
+
+    def to_meta(self) -> dict:
+        return {
+            "market": self.market,
+            "total": self.total,
+            "confirmed": self.confirmed,
+            "failed": len(self.failed),
+            "requests": self.requests,
+            "rounds": self.rounds,
+        }
+
+
+async def subscribe_all(send: Callable[[str, str], Awaitable[bool]], requests: List[Tuple[str, str]],
+                        market: str = "", max_retries: int = 3,
+                        bucket: TokenBucket = None, max_inflight: int = SUBSCRIBE_INFLIGHT,
+                        retry_delay: float = SUBSCRIBE_RETRY_DELAY) -> SubscriptionReport:
+    """
+    구독 요청 목록을 병렬로 전송하고 확인
+
+    Args:
+        send: (tr_id, tr_key) -> 구독 확인 여부 (전송 + 응답 대기)
+        requests: [(tr_id, tr_key), ...]
+        max_retries: 요청당 최대 시도 횟수 (실패분만 재시도)
+
+    Returns:
+        SubscriptionReport
+    """
+    bucket = bucket or TokenBucket()
+    inflight = asyncio.Semaphore(max_inflight)
+    report = SubscriptionReport(market=market, total=len(requests))
+    started = time.monotonic()
+
+    async def attempt(tr_id: str, tr_key: str) -> bool:
+        async with inflight:
+            await bucket.acquire()
+            report.requests += 1
+            try:
+                return await send(tr_id, tr_key)
+            except Exception as e:
+                logger.error(f"[{market}] Subscribe error {tr_id}/{tr_key}: {e}")
+                return False
+
+    remaining = list(requests)
+    for round_no in range(1, max_retries + 1):
+        if not remaining:
+            break
+        if round_no > 1:
+            logger.warning(f"[{market}] Retry {round_no - 1}/{max_retries - 1}: {len(remaining)} failed subscriptions")
+            await asyncio.sleep(retry_delay)
+
+        report.rounds = round_no
+        results = await asyncio.gather(*(attempt(tr_id, tr_key) for tr_id, tr_key in remaining))
+        report.confirmed += sum(results)
+        remaining = [req for req, ok in zip(remaining, results) if not ok]
+
+    report.failed = remaining
+    report.elapsed = time.monotonic() - started
+    return report
@@ -4,14 +4,28 @@ KIS WebSocket 통합 수집 및 관리 모듈
 import asyncio
 import logging
 import json
+import os
+import time
+from datetime import datetime
 import redis.asyncio as redis
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from src.core.schema import MarketData
+from src.core.wire_format import attach_latency, get_encoder
+from src.core.stream_transport import queue_publish
+from src.core.latency import LatencyRecorder, LATENCY_TRACKING, now_ns
 from src.data_ingestion.logger.raw_logger import RawWebSocketLogger
+from src.data_ingestion.price.common.publisher import PipelinedPublisher
+from src.data_ingestion.price.common.frame_queue import FrameQueue, FRAME_CONSUMERS
+from src.data_ingestion.price.common.frame_parser import parse_record_count, split_records
+from src.data_ingestion.price.common.subscription import subscribe_all, TokenBucket, SubscriptionReport
 
 logger = logging.getLogger(__name__)
 
+# 시장 전환 방식: standby(make-before-break, 기본) | reconnect(기존: 끊고 재연결)
+MARKET_SWITCH_MODE = os.getenv("MARKET_SWITCH_MODE", "standby")
+WS_CONNECT_OPTIONS = {"ping_interval": 20, "ping_timeout": 30, "close_timeout": 30}
+
 class BaseCollector(ABC):
     """
     시장별 수집기 인터페이스 (로직 정의용)
@@ -21,14 +35,50 @@ class BaseCollector(ABC):
         self.market = market
         self.tr_id = tr_id
         self.symbols = []
+        self.shard_symbols: Optional[set] = None  # 샤드 모드: 이 프로세스 담당 심볼 (None=전체)
+        self.delta_encoder = None  # 호가 수집기: OrderbookDeltaEncoder (ORDERBOOK_DELTA 활성 시)
 
     @abstractmethod
     def parse_tick(self, body_str: str) -> Optional[MarketData]:
          pass
+
+    def parse_fast(self, body_str: str):
+        """
+        발행 경로용 Fast-Path 파서
+        - 기본 구현은 parse_tick()에 위임
+        - 고빈도 tr_id는 frame_parser 기반으로 오버라이드 (검증 모델 생성 생략)
+        - 반환 객체는 symbol 속성과 model_dump_json()을 제공해야 함
+        """
+        return self.parse_tick(body_str)
+
+    def parse_frame(self, body_str: str, count: int = 1) -> list:
+        """
+        다건 프레임 파싱 (parts[2] 레코드 수 기준)
+        - 레코드별로 parse_fast()를 적용, 파싱 실패 레코드는 제외
+        - delta_encoder 설정 시 변경분(OrderbookDelta)으로 변환 (변경 없는 레코드는 제외)
+
+        Returns:
+            list: 파싱된 레코드 목록 (발행 순서 유지)
+        """
+        records = []
+        for record_body in split_records(body_str, count):
+            data_obj = self.parse_fast(record_body)
+            if data_obj:
+                records.append(data_obj)
+        if self.delta_encoder:
+            return self.delta_encoder.encode_all(records)
+        return records
     
     @abstractmethod
     def load_symbols(self) -> list:
         pass
+
+    def refresh_symbols(self) -> list:
+        """load_symbols() 후 샤드 할당 필터 적용 (매니저는 이 메서드로 심볼을 로드)"""
+        self.load_symbols()
+        if self.shard_symbols is not None:
+            self.symbols = [s for s in self.symbols if s in self.shard_symbols]
+        return self.symbols
         
     @abstractmethod
     def get_channel(self) -> str:
@@ -47,6 +97,8 @@ class UnifiedWebSocketManager:
         self.collectors: Dict[str, BaseCollector] = {c.tr_id: c for c in collectors}
         self.redis_url = redis_url
         self.redis: Optional[redis.Redis] = None
+        self.publisher: Optional[PipelinedPublisher] = None
+        self.latency: Optional[LatencyRecorder] = LatencyRecorder("collector") if LATENCY_TRACKING else None
         
         # WebSocket State
         self.websocket = None
@@ -56,16 +108,27 @@ class UnifiedWebSocketManager:
         # Subscription State (to prevent redundant requests)
         self.active_markets = set()
 
-        # 구독 확인 상태 추적 (NEW)
-        self.pending_subscriptions: Dict[str, asyncio.Event] = {}  # tr_key -> Event
-        self.subscription_results: Dict[str, bool] = {}  # tr_key -> success
+        # 구독 확인 상태 추적: 같은 종목이 여러 tr_id(체결/호가)로 동시에 in-flight 될 수 있으므로 (tr_id, tr_key) 기준
+        self.pending_subscriptions: Dict[Tuple[str, str], asyncio.Event] = {}  # (tr_id, tr_key) -> Event
+        self.subscription_results: Dict[Tuple[str, str], bool] = {}  # (tr_id, tr_key) -> success
+        self.subscribe_bucket = TokenBucket()  # 구독 요청 속도 제한 (연결 전체 공유)
+        self.subscription_reports: Dict[str, SubscriptionReport] = {}  # market -> 최근 구독 리포트
         self.connection_ready = asyncio.Event()  # 연결 완료 신호
 
         # Raw Logger
         self.raw_logger = RawWebSocketLogger(retention_hours=120)  # 5일 보존
+
+        # Reader/Consumer 분리용 프레임 큐
+        self.frame_queue = FrameQueue()
+        self._consumer_tasks: List[asyncio.Task] = []
         
         # Dynamic URL State
         self.current_ws_url: Optional[str] = None
+
+        # Warm Standby (make-before-break) 상태
+        self._standby_reader: Optional[asyncio.Task] = None  # 승격된 standby 소켓의 reader (run()이 인계)
+        self._switch_started: Optional[float] = None  # reconnect 방식 전환 시작 시각 (gap 측정용)
+        self.unrouted_frames = 0  # 활성 소켓이 아닌 소켓(cut-over 전 standby / 직후 구 소켓)에서 버려진 데이터 프레임 수
         
         # Auto-Refresh Callback
         self.key_refresh_callback = None
@@ -78,9 +141,22 @@ class UnifiedWebSocketManager:
     async def connect_redis(self):
         self.redis = await redis.from_url(self.redis_url, decode_responses=True)
         logger.info("✅ Redis Connected")
+        # Publisher Stage: 수신 루프와 Redis 왕복 분리
+        self.publisher = PipelinedPublisher(self.redis, latency=self.latency)
+        self.publisher.start()
+        if self.latency:
+            asyncio.create_task(self.latency.report_loop(self.redis))
         await self.raw_logger.start()
 
-    async def handle_message(self, message: str) -> Optional[str]:
+    async def handle_message(self, message: str, received_ns: int = 0) -> Optional[str]:
+        """
+        수신 메시지 처리 (제어 메시지 응답 / 데이터 프레임 파싱 및 발행)
+
+        Args:
+            received_ns: 소켓 수신 시각 (monotonic ns, 0이면 지연 계측 생략)
+        """
+        dequeued_ns = now_ns() if received_ns else 0
+
         # 💾 RAW LOGGING
         await self.raw_logger.log(message, direction="RX")
 
@@ -104,17 +180,19 @@ class UnifiedWebSocketManager:
 
                     logger.info(f"[API MSG] tr_id={tr_id}, tr_key={tr_key}, msg={msg1}")
 
-                    # 🎯 구독 응답 처리 (NEW)
-                    if tr_key and tr_key in self.pending_subscriptions:
-                        if "SUCCESS" in msg1.upper() or msg1 == "SUBSCRIBE SUCCESS":
-                            self.subscription_results[tr_key] = True
-                            logger.info(f"✅ SUBSCRIBE CONFIRMED: {tr_key}")
+                    # 🎯 구독 응답 처리 (도착 순서와 무관하게 (tr_id, tr_key)로 매칭)
+                    pending_key = (tr_id, tr_key)
+                    if tr_key and pending_key in self.pending_subscriptions:
+                        # 재구독 시 "ALREADY IN SUBSCRIBE" 응답도 구독 유효로 간주
+                        if "SUCCESS" in msg1.upper() or "ALREADY" in msg1.upper():
+                            self.subscription_results[pending_key] = True
+                            logger.info(f"✅ SUBSCRIBE CONFIRMED: {tr_id}/{tr_key}")
                         else:
-                            self.subscription_results[tr_key] = False
-                            logger.error(f"❌ SUBSCRIBE FAILED: {tr_key} - {msg1}")
+                            self.subscription_results[pending_key] = False
+                            logger.error(f"❌ SUBSCRIBE FAILED: {tr_id}/{tr_key} - {msg1}")
 
                         # 대기 중인 구독 요청에 신호
-                        self.pending_subscriptions[tr_key].set()
+                        self.pending_subscriptions[pending_key].set()
 
                     # 🚨 KEY EXPIRED DETECTION
                     if "invalid tr_key" in msg1 or "Expired" in msg1:
@@ -125,8 +203,8 @@ class UnifiedWebSocketManager:
                 pass
             return None
         
-        # 메시지 파싱
-        parts = message.split('|')
+        # 메시지 파싱 (body 내부에는 '|'가 없으므로 헤더 3개만 분리)
+        parts = message.split('|', 3)
         logger.debug(f"🔢 PARTS: {len(parts)} parts, tr_id candidate: {parts[1] if len(parts) > 1 else 'N/A'}")
         
         if len(parts) < 4:
@@ -134,30 +212,78 @@ class UnifiedWebSocketManager:
             return None
         
         tr_id = parts[1]
+        count = parse_record_count(parts[2])
         body = parts[3]
         
         # 라우팅
         collector = self.collectors.get(tr_id)
         if collector:
-            logger.debug(f"✅ MATCH: tr_id={tr_id}, parsing...")
-            # 파싱 위임
-            data_obj = collector.parse_tick(body)
-            if data_obj and self.redis:
+            logger.debug(f"✅ MATCH: tr_id={tr_id}, records={count}, parsing...")
+            # 파싱 위임 (Fast-Path, 다건 프레임 포함)
+            records = collector.parse_frame(body, count)
+            if records and self.redis:
                 # Redis 발행 (동적 채널)
                 channel = collector.get_channel()
-                await self.redis.publish(channel, data_obj.model_dump_json())
+                stamps = None
+                if dequeued_ns and self.latency and channel.startswith("ticker."):
+                    parsed_ns = now_ns()
+                    self.latency.record("queue", collector.market, dequeued_ns - received_ns)
+                    self.latency.record("parse", collector.market, parsed_ns - dequeued_ns)
+                    stamps = (received_ns, parsed_ns)
+                await self.publish_batch(channel, records, stamps)
+                data_obj = records[-1]
                 price = getattr(data_obj, 'price', None)
-                if price is not None:
+                if len(records) > 1:
+                    logger.info(f"📤 PUBLISHED: {channel} | {len(records)} records (last: {data_obj.symbol})")
+                elif price is not None:
                     logger.info(f"📤 PUBLISHED: {channel} | {data_obj.symbol} @ {price}")
                 else:
                     logger.info(f"📤 PUBLISHED: {channel} | {data_obj.symbol} (Type: {data_obj.type})")
-            elif not data_obj:
+            elif not records and not collector.delta_encoder:
                 logger.warning(f"⚠️  PARSE FAILED: tr_id={tr_id}")
         else:
             logger.warning(f"❌ UNKNOWN tr_id: {tr_id}")
         
         return tr_id
 
+    async def publish_batch(self, channel: str, records: list, stamps: Optional[tuple] = None):
+        """
+        프레임 단위 일괄 발행 (Publisher 큐 적재, 미기동 시 단일 파이프라인 왕복)
+
+        Args:
+            stamps: (recv_ns, parse_ns) 지연 계측 타임스탬프 (ticker 채널만)
+        """
+        encode = get_encoder(channel)  # JSON or Binary (BINARY_CHANNELS)
+        if self.publisher:
+            # Non-blocking: 큐 적재만 수행, 실제 발행은 Publisher 태스크가 배치 처리
+            for data_obj in records:
+                self.publisher.publish(channel, encode(data_obj), stamps)
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for data_obj in records:
+                message = encode(data_obj)
+                if stamps:
+                    message = attach_latency(message, (stamps[0], stamps[1], now_ns()))
+                queue_publish(pipe, channel, message)
+            await pipe.execute()
+
+    def _frame_kind(self, message: str) -> str:
+        """데이터 프레임의 종류(tick/orderbook) 판별 (큐 오버플로 정책용)"""
+        collector = self.collectors.get(message[2:message.find('|', 2)])
+        if collector and collector.get_channel().startswith('orderbook'):
+            return 'orderbook'
+        return 'tick'
+
+    async def _consume_frames(self):
+        """Consumer: 큐에서 프레임을 꺼내 파싱/발행"""
+        while True:
+            message, _, received_ns = await self.frame_queue.get()
+            try:
+                await self.handle_message(message, received_ns)
+            except Exception as e:
+                logger.error(f"Frame Consumer Error: {e}")
+
     async def trigger_refresh(self):
         """Trigger key refresh with cooldown"""
         import time
@@ -173,7 +299,8 @@ class UnifiedWebSocketManager:
         else:
             logger.error("❌ No key_refresh_callback set!")
 
-    async def _send_request(self, tr_id: str, tr_key: str, tr_type: str, wait_confirm: bool = True) -> bool:
+    async def _send_request(self, tr_id: str, tr_key: str, tr_type: str, wait_confirm: bool = True,
+                            timeout: float = 5.0, websocket=None) -> bool:
         """
         내부 요청 전송 헬퍼 (응답 확인 포함)
 
@@ -182,19 +309,23 @@ class UnifiedWebSocketManager:
             tr_key: 심볼 키
             tr_type: "1"=Subscribe, "2"=Unsubscribe
             wait_confirm: 서버 응답 대기 여부 (기본 True)
+            timeout: 응답 대기 시간 (초)
+            websocket: 전송 대상 소켓 (기본: 활성 소켓, warm standby 구독 시 지정)
 
         Returns:
             bool: 성공 여부 (응답 확인 포함)
         """
         async with self.ws_lock:
-            if not self.websocket or not self.approval_key:
+            target_ws = websocket or self.websocket
+            if not target_ws or not self.approval_key:
                 logger.warning("WebSocket not connected or no key")
                 return False
 
             # 구독 요청인 경우 응답 대기 준비
+            pending_key = (tr_id, tr_key)
             if tr_type == "1" and wait_confirm:
-                self.pending_subscriptions[tr_key] = asyncio.Event()
-                self.subscription_results[tr_key] = False
+                self.pending_subscriptions[pending_key] = asyncio.Event()
+                self.subscription_results[pending_key] = False
 
             req = {
                 "header": {
@@ -212,28 +343,28 @@ class UnifiedWebSocketManager:
             }
 
             try:
-                await self.websocket.send(json.dumps(req))
+                await target_ws.send(json.dumps(req))
             except Exception as e:
                 logger.error(f"Failed to send request: {e}")
-                if tr_key in self.pending_subscriptions:
-                    del self.pending_subscriptions[tr_key]
+                self.pending_subscriptions.pop(pending_key, None)
+                self.subscription_results.pop(pending_key, None)
                 return False
 
-        # 구독 요청인 경우 응답 대기 (최대 5초)
+        # 구독 요청인 경우 응답 대기 (ws_lock 해제 후 대기 -> 다른 요청 동시 진행 가능)
         if tr_type == "1" and wait_confirm:
             try:
                 await asyncio.wait_for(
-                    self.pending_subscriptions[tr_key].wait(),
-                    timeout=5.0
+                    self.pending_subscriptions[pending_key].wait(),
+                    timeout=timeout
                 )
-                success = self.subscription_results.get(tr_key, False)
+                success = self.subscription_results.get(pending_key, False)
             except asyncio.TimeoutError:
-                logger.warning(f"⏰ SUBSCRIBE TIMEOUT: {tr_key} (no response in 5s)")
+                logger.warning(f"⏰ SUBSCRIBE TIMEOUT: {tr_id}/{tr_key} (no response in {timeout:.0f}s)")
                 success = False
             finally:
                 # 정리
-                self.pending_subscriptions.pop(tr_key, None)
-                self.subscription_results.pop(tr_key, None)
+                self.pending_subscriptions.pop(pending_key, None)
+                self.subscription_results.pop(pending_key, None)
 
             return success
 
@@ -241,7 +372,7 @@ class UnifiedWebSocketManager:
     
     async def subscribe_market(self, market: str, max_retries: int = 3) -> bool:
         """
-        특정 시장(KR/US)의 모든 Collectors 구독 (재시도 포함)
+        특정 시장(KR/US)의 모든 Collectors 구독 (병렬 전송 + 실패분만 재시도)
 
         Args:
             market: 시장 코드 (KR/US)
@@ -263,49 +394,75 @@ class UnifiedWebSocketManager:
                 logger.error(f"[{market}] WebSocket connection timeout!")
                 return False
 
-        logger.info(f"[{market}] Starting SUBSCRIPTION (with confirmation)...")
-        success_count = 0
-        fail_count = 0
-        failed_symbols = []
-
-        for tr_id, collector in self.collectors.items():
-            if collector.market == market:
-                # 심볼 로드가 안되어 있으면 로드
-                if not collector.symbols:
-                    collector.load_symbols()
-
-                for sym in collector.symbols:
-                    # 재시도 루프
-                    subscribed = False
-                    for attempt in range(1, max_retries + 1):
-                        if await self._send_request(tr_id, sym, "1"):
-                            subscribed = True
-                            success_count += 1
-                            break
-                        else:
-                            logger.warning(f"[{market}] Retry {attempt}/{max_retries} for {sym}")
-                            await asyncio.sleep(1.0)  # 재시도 전 대기
-
-                    if not subscribed:
-                        fail_count += 1
-                        failed_symbols.append(sym)
-
-                    await asyncio.sleep(0.2)  # Rate Limit
+        report = await self._subscribe_collectors(market, max_retries)
 
         # 결과 판정
-        total = success_count + fail_count
-        if fail_count == 0:
+        success_count, total = report.confirmed, report.total
+        failed_symbols = [sym for _, sym in report.failed]
+        if not report.failed:
             self.active_markets.add(market)
-            logger.info(f"✅ [{market}] ALL SUBSCRIBED: {success_count}/{total} symbols confirmed.")
+            await self._finish_switch(market)
+            logger.info(f"✅ [{market}] ALL SUBSCRIBED: {success_count}/{total} symbols confirmed in {report.elapsed:.2f}s ({report.requests} requests)")
             return True
         elif success_count > 0:
             self.active_markets.add(market)
-            logger.warning(f"⚠️ [{market}] PARTIAL: {success_count}/{total} OK, {fail_count} FAILED: {failed_symbols[:5]}...")
+            await self._finish_switch(market)
+            logger.warning(f"⚠️ [{market}] PARTIAL: {success_count}/{total} OK in {report.elapsed:.2f}s, {len(failed_symbols)} FAILED: {failed_symbols[:5]}...")
             return True
         else:
             logger.error(f"❌ [{market}] SUBSCRIPTION FAILED: 0/{total} symbols confirmed.")
             return False
 
+    async def _subscribe_collectors(self, market: str, max_retries: int = 3, websocket=None) -> SubscriptionReport:
+        """시장의 전체 (tr_id, 심볼) 구독 요청을 병렬 전송 (websocket 미지정 시 활성 소켓)"""
+        requests = []
+        for tr_id, collector in self.collectors.items():
+            if collector.market == market:
+                # 심볼 로드가 안되어 있으면 로드
+                if not collector.symbols:
+                    collector.refresh_symbols()
+                requests.extend((tr_id, sym) for sym in collector.symbols)
+
+        logger.info(f"[{market}] Starting SUBSCRIPTION: {len(requests)} requests (pipelined, with confirmation)...")
+        report = await subscribe_all(
+            lambda tr_id, tr_key: self._send_request(tr_id, tr_key, "1", websocket=websocket),
+            requests, market=market, max_retries=max_retries, bucket=self.subscribe_bucket
+        )
+        self.subscription_reports[market] = report
+        await self._publish_subscription_report(report)
+        return report
+
+    async def _publish_metric(self, metric_type: str, value: float, meta: dict):
+        """system.metrics 발행 (Generic 포맷)"""
+        if not self.redis:
+            return
+        payload = {
+            "timestamp": datetime.now().isoformat(),
+            "type": metric_type,
+            "value": value,
+            "meta": meta,
+        }
+        try:
+            await self.redis.publish("system.metrics", json.dumps(payload))
+        except Exception as e:
+            logger.error(f"Failed to publish {metric_type}: {e}")
+
+    async def _publish_subscription_report(self, report: SubscriptionReport):
+        """구독 완료 시간(time-to-subscribed)을 system.metrics로 발행"""
+        await self._publish_metric("subscription_time", round(report.elapsed, 3), report.to_meta())
+
+    async def _report_switch_gap(self, market: str, mode: str, gap: float, **meta):
+        """시장 전환 시 데이터 라우팅이 중단된 구간(gap)을 system.metrics로 발행"""
+        logger.info(f"⏱️  [{market}] Market switch gap ({mode}): {gap * 1000:.1f}ms")
+        await self._publish_metric("market_switch_gap_ms", round(gap * 1000, 3), {"market": market, "mode": mode, **meta})
+
+    async def _finish_switch(self, market: str):
+        """reconnect 방식 전환: 재연결 후 구독 완료 시점에 gap 기록"""
+        if self._switch_started is not None:
+            gap = time.monotonic() - self._switch_started
+            self._switch_started = None
+            await self._report_switch_gap(market, "reconnect", gap)
+
     async def unsubscribe_market(self, market: str):
         """특정 시장(KR/US)의 모든 Collectors 구독 해제"""
         if market not in self.active_markets:
@@ -317,9 +474,9 @@ class UnifiedWebSocketManager:
         for tr_id, collector in self.collectors.items():
             if collector.market == market:
                 for sym in collector.symbols:
+                    await self.subscribe_bucket.acquire()  # Rate Limit
                     if await self._send_request(tr_id, sym, "2", wait_confirm=False):  # 2=Unsubscribe
                         count += 1
-                    await asyncio.sleep(0.2)
         
         self.active_markets.discard(market)
         logger.info(f"[{market}] Unsubscribed {count} symbols.")
@@ -335,6 +492,7 @@ class UnifiedWebSocketManager:
         """WebSocket URL 동적 변경 및 재연결 요청"""
         logger.info(f"🔄 Switching WebSocket URL to: {new_url}")
         self.current_ws_url = new_url
+        self._switch_started = time.monotonic()
 
         # 연결 대기 이벤트 초기화
         self.connection_ready.clear()
@@ -347,6 +505,82 @@ class UnifiedWebSocketManager:
                 self.websocket = None
                 self.active_markets.clear()
 
+    async def switch_url_standby(self, new_url: str, market: str) -> bool:
+        """
+        Warm Standby 전환 (make-before-break)
+        1. 새 URL로 standby 소켓을 미리 연결하고 대상 시장 구독 완료까지 대기
+        2. ws_lock 안에서 활성 소켓/구독 상태를 원자적으로 교체 (라우팅 cut-over)
+        3. 교체 후에만 기존 소켓 종료 -> run() 루프는 standby reader를 인계받아 계속 수신
+
+        Returns:
+            bool: 전환 성공 여부 (실패 시 기존 소켓 유지, 호출자는 switch_url로 폴백 가능)
+        """
+        import websockets
+
+        logger.info(f"🔥 [{market}] Warm standby: connecting {new_url} ahead of switch...")
+        prepare_started = time.monotonic()
+        try:
+            standby = await websockets.connect(new_url, **WS_CONNECT_OPTIONS)
+        except Exception as e:
+            logger.error(f"[{market}] Standby connect failed: {e}")
+            return False
+
+        reader = asyncio.create_task(self._read_loop(standby))
+        report = await self._subscribe_collectors(market, websocket=standby)
+        if report.confirmed == 0:
+            logger.error(f"❌ [{market}] Standby subscription failed. Keeping current socket.")
+            reader.cancel()
+            await standby.close()
+            return False
+
+        # Cut-over: 활성 소켓 교체 (이 시점부터 데이터 프레임은 standby 소켓에서만 라우팅)
+        cutover_started = time.monotonic()
+        async with self.ws_lock:
+            old = self.websocket
+            self.websocket = standby
+            self.current_ws_url = new_url
+            self.active_markets = {market}
+            self._standby_reader = reader
+            self._switch_started = None
+            self.last_traffic_time = time.time()
+        gap = time.monotonic() - cutover_started
+        self.connection_ready.set()
+
+        # Break: cut-over 이후에만 기존 소켓 종료
+        if old:
+            await old.close()
+
+        await self._report_switch_gap(
+            market, "standby", gap,
+            prepare_sec=round(cutover_started - prepare_started, 3),
+            confirmed=report.confirmed, total=report.total,
+        )
+        return True
+
+    async def _read_loop(self, websocket):
+        """소켓 수신 루프 (Reader: 데이터 프레임은 큐 적재만 수행)"""
+        async for message in websocket:
+            if message and message[0] in ('0', '1'):
+                if websocket is not self.websocket:
+                    # 활성 소켓의 데이터만 라우팅 (cut-over 전 standby / 직후 구 소켓 프레임 제외)
+                    self.unrouted_frames += 1
+                    continue
+
+                # 파싱/발행은 Consumer 태스크가 처리 -> Redis 지연이 소켓 수신을 막지 않음
+                self.frame_queue.put(message, self._frame_kind(message), now_ns())
+
+                # Watchdog Feed: 실제 데이터 수신 시에만 갱신
+                # (PINGPONG만 오가는 연결은 zombie로 간주)
+                self.last_traffic_time = time.time()
+                continue
+
+            # 제어 메시지(PINGPONG/구독 응답)는 즉시 처리 (구독 확인/PONG 지연 방지)
+            res = await self.handle_message(message)
+            if res == "PONG":
+                await websocket.send(message)
+                # NOTE: We do NOT update last_traffic_time on PONG. 
+                # This enforces actual data reception.
+
     async def _watchdog_loop(self):
         """🐶 Traffic Watchdog: Monitors data flow and triggers recovery"""
         import time
@@ -406,14 +640,13 @@ class UnifiedWebSocketManager:
     async def run(self, ws_url: str, approval_key: str):
         """메인 실행 루프"""
         import websockets
-        import time
         
         self.approval_key = approval_key
         await self.connect_redis()
         
         # Load Symbols Initially (without subscribing)
         for c in self.collectors.values():
-            c.load_symbols()
+            c.refresh_symbols()
             logger.info(f"[{c.market}] Loaded {len(c.symbols)} symbols")
 
         # Set initial URL
@@ -422,60 +655,62 @@ class UnifiedWebSocketManager:
         # Start Watchdog
         self._watchdog_task = asyncio.create_task(self._watchdog_loop())
 
+        # Start Frame Consumers (파싱/발행 담당)
+        self._consumer_tasks = [
+            asyncio.create_task(self._consume_frames()) for _ in range(FRAME_CONSUMERS)
+        ]
+
         try:
             while True:
+                current = None
                 try:
+                    if self._standby_reader:
+                        # Warm standby 소켓이 활성 소켓으로 승격됨 -> 해당 reader 종료(소켓 끊김)까지 대기
+                        reader, self._standby_reader = self._standby_reader, None
+                        current = self.websocket
+                        logger.info("🔁 Adopted warm standby socket.")
+                        await reader
+                        continue
+
                     # Use current dynamic URL
                     target_url = self.current_ws_url
                     logger.info(f"Connecting to {target_url}...")
                     
-                    async with websockets.connect(
-                        target_url,
-                        ping_interval=20,
-                        ping_timeout=30,  # 10 -> 30초로 증가
-                        close_timeout=30   # 10 -> 30초로 증가
-                    ) as websocket:
+                    async with websockets.connect(target_url, **WS_CONNECT_OPTIONS) as websocket:
                         logger.info("✅ WebSocket Connected.")
 
                         async with self.ws_lock:
+                            if self._standby_reader:
+                                # 연결 중 standby cut-over가 완료됨 -> 이 소켓은 폐기
+                                continue
                             self.websocket = websocket
                             self.active_markets.clear()  # Reset state on reconnect
                             self.last_traffic_time = time.time()  # Reset watchdog timer
+                        current = websocket
 
                         # 🎯 연결 완료 신호 (NEW)
                         self.connection_ready.set()
                         logger.info("🎯 Connection ready signal sent.")
 
                         # Note: 구독은 외부 스케줄러(schedule_market_switch)가 수행함.
-                        
-                        # 메시지 루프
-                        async for message in websocket:
-                            res = await self.handle_message(message)
-                            
-                            # Watchdog Feed: Only feed on valid data or PONG? 
-                            # PINGPONG keeps connection alive, but we want DATA.
-                            # So we update only if 'res' is tr_id (data) OR 'PONG' (connection)
-                            # WAIT, our goal is "Data Flow". If only PingPong, it's a zombie.
-                            # So we should ONLY update on Data (tr_id).
-                            # handle_message returns: "PONG", tr_id (data), or None (error/skip)
-                            
-                            if res and res != "PONG":
-                                self.last_traffic_time = time.time()
-                            
-                            if res == "PONG":
-                                await websocket.send(message)
-                                # NOTE: We do NOT update last_traffic_time on PONG. 
-                                # This enforces actual data reception.
+                        await self._read_loop(websocket)
                                 
                 except Exception as e:
                     logger.error(f"WS Connection Error: {e}")
                     async with self.ws_lock:
-                        self.websocket = None
-                        self.active_markets.clear()
-                    # 연결 끊김 -> 대기 상태로 전환
-                    self.connection_ready.clear()
-                    await asyncio.sleep(5)
+                        if self.websocket is current:
+                            self.websocket = None
+                            self.active_markets.clear()
+                    if not self._standby_reader:
+                        # 연결 끊김 -> 대기 상태로 전환
+                        self.connection_ready.clear()
+                        await asyncio.sleep(5)
         finally:
             if self._watchdog_task:
                 self._watchdog_task.cancel()
+            for task in self._consumer_tasks:
+                task.cancel()
+            if self.publisher:
+                # 큐에 남은 메시지 플러시 후 발행 태스크 종료
+                await self.publisher.stop()
 
@@ -6,11 +6,20 @@ Dual WebSocket Manager Module
 import asyncio
 import logging
 import json
+import time
 import websockets
 import redis.asyncio as redis
-from typing import Optional, List, Dict
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple
 from src.data_ingestion.price.common.websocket_base import BaseCollector
+from src.data_ingestion.price.common.frame_parser import parse_record_count
+from src.core.wire_format import attach_latency, get_encoder
+from src.core.stream_transport import queue_publish
+from src.core.latency import LatencyRecorder, LATENCY_TRACKING, now_ns
 from src.data_ingestion.logger.raw_logger import RawWebSocketLogger
+from src.data_ingestion.price.common.publisher import PipelinedPublisher
+from src.data_ingestion.price.common.frame_queue import FrameQueue, FRAME_CONSUMERS
+from src.data_ingestion.price.common.subscription import TokenBucket, SubscriptionReport, subscribe_all
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +33,8 @@ class DualWebSocketManager:
         self.collectors: Dict[str, BaseCollector] = {c.tr_id: c for c in collectors}
         self.redis_url = redis_url
         self.redis: Optional[redis.Redis] = None
+        self.publisher: Optional[PipelinedPublisher] = None
+        self.latency: Optional[LatencyRecorder] = LatencyRecorder("collector") if LATENCY_TRACKING else None
         
         # Connection State
         self.ws_tick: Optional[websockets.WebSocketClientProtocol] = None
@@ -34,13 +45,26 @@ class DualWebSocketManager:
         
         self.approval_key = None
         self.active_markets = set()
+
+        # Pipelined subscription: responses matched by (tr_id, tr_key), rate limited by a shared token bucket
+        self.pending_subscriptions: Dict[Tuple[str, str], asyncio.Event] = {}
+        self.subscription_results: Dict[Tuple[str, str], bool] = {}
+        self.subscribe_bucket = TokenBucket()
+        self.subscription_reports: Dict[str, SubscriptionReport] = {}  # market -> latest report
         
         # Raw Logger (Shared)
         self.raw_logger = RawWebSocketLogger(retention_hours=120)  # 5일 보존
+
+        # Shared frame queue: socket readers enqueue, consumer tasks parse/publish
+        self.frame_queue = FrameQueue()
         
         # Current URL (Both sockets use the same endpoint, just separate sessions)
         self.current_ws_url: Optional[str] = None
 
+        # Warm standby (make-before-break): promoted sockets + readers, adopted by _maintain_connection
+        self._standby_readers: Dict[str, Tuple[object, asyncio.Task]] = {}
+        self.unrouted_frames = 0  # data frames dropped from non-active sockets (standby before / old after cut-over)
+
         self.tick_tr_ids = {'H0STCNT0', 'HDFSCNT0'}
         self.orderbook_tr_ids = {'H0STASP0', 'HDFSASP0', 'HHDFS00000300'} # Add legacy/fallback IDs if needed
         
@@ -67,9 +91,20 @@ class DualWebSocketManager:
         else:
             logger.error("❌ No key_refresh_callback set!")
 
+    async def update_key(self, new_key: str):
+        """Updates the approval key used for subsequent (re)subscriptions"""
+        async with self.lock_tick, self.lock_orderbook:
+            self.approval_key = new_key
+        logger.info("🔐 Approval Key updated dynamically.")
+
     async def connect_redis(self):
         self.redis = await redis.from_url(self.redis_url, decode_responses=True)
         logger.info("✅ Redis Connected")
+        # Publisher Stage: decouples the receive loop from Redis round-trips
+        self.publisher = PipelinedPublisher(self.redis, latency=self.latency)
+        self.publisher.start()
+        if self.latency:
+            asyncio.create_task(self.latency.report_loop(self.redis))
         await self.raw_logger.start()
 
     def _determine_socket_type(self, tr_id: str) -> str:
@@ -83,8 +118,9 @@ class DualWebSocketManager:
         # Actually, let's look at the tr_id strictly.
         return 'unknown'
 
-    async def _handle_message(self, message: str, source: str) -> Optional[str]:
-        """Generic message handler for both sockets"""
+    async def _handle_message(self, message: str, source: str, received_ns: int = 0) -> Optional[str]:
+        """Generic message handler for both sockets (received_ns: socket receive time for latency tracking)"""
+        dequeued_ns = now_ns() if received_ns else 0
         # PINGPONG Check First (Fast Path)
         if message[0] not in ['0', '1']:
             # PINGPONG Check
@@ -95,6 +131,16 @@ class DualWebSocketManager:
             if message.startswith('{'):
                 try:
                     data = json.loads(message)
+                    # Subscription response for an in-flight request (matched regardless of arrival order)
+                    header = data.get('header', {})
+                    pending_key = (header.get('tr_id', ''), header.get('tr_key', ''))
+                    if pending_key in self.pending_subscriptions and 'body' in data:
+                        msg = (data['body'].get('msg1') or '').upper()
+                        confirmed = "SUCCESS" in msg or "ALREADY" in msg  # re-subscribe answers ALREADY IN SUBSCRIBE
+                        self.subscription_results[pending_key] = confirmed
+                        self.pending_subscriptions[pending_key].set()
+                        if confirmed:
+                            return "SUBSCRIBED"
                     # Check for KIS Error Format
                     # Usually found in body -> msg1 or msg_cd
                     if 'body' in data:
@@ -116,45 +162,87 @@ class DualWebSocketManager:
         # Logging (Sampled or Full)
         # await self.raw_logger.log(message, direction="RX") # Optional: High load logging
 
-        parts = message.split('|')
+        parts = message.split('|', 3)
         if len(parts) < 4:
             return None
 
         tr_id = parts[1]
+        count = parse_record_count(parts[2])
         body = parts[3]
         
         collector = self.collectors.get(tr_id)
         if collector:
-            # Delegate Parsing
-            data_obj = collector.parse_tick(body)
-            if data_obj and self.redis:
+            # Delegate Parsing (Fast-Path, multi-record frames)
+            records = collector.parse_frame(body, count)
+            if records and self.redis:
                 channel = collector.get_channel()
-                await self.redis.publish(channel, data_obj.model_dump_json())
+                stamps = None
+                if dequeued_ns and self.latency and channel.startswith("ticker."):
+                    parsed_ns = now_ns()
+                    self.latency.record("queue", collector.market, dequeued_ns - received_ns)
+                    self.latency.record("parse", collector.market, parsed_ns - dequeued_ns)
+                    stamps = (received_ns, parsed_ns)
+                await self.publish_batch(channel, records, stamps)
                 
                 # Simple Logging (prevent flood)
-                # logger.debug(f"[{source.upper()}] PUSH: {data_obj.symbol}")
+                # logger.debug(f"[{source.upper()}] PUSH: {len(records)} records")
         
         return tr_id
 
-    async def _send_request(self, socket_type: str, tr_id: str, tr_key: str, tr_type: str):
-        """Routes request to the correct socket"""
-        target_ws = None
-        target_lock = None
-        
+    async def publish_batch(self, channel: str, records: list, stamps: Optional[tuple] = None):
+        """Publishes all records of one frame (via publisher stage, or one direct pipeline round-trip)
+
+        stamps: (recv_ns, parse_ns) latency timestamps, ticker channels only
+        """
+        encode = get_encoder(channel)  # JSON or Binary (BINARY_CHANNELS)
+        if self.publisher:
+            # Non-blocking: enqueue only, the publisher task flushes in pipelined batches
+            for data_obj in records:
+                self.publisher.publish(channel, encode(data_obj), stamps)
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for data_obj in records:
+                message = encode(data_obj)
+                if stamps:
+                    message = attach_latency(message, (stamps[0], stamps[1], now_ns()))
+                queue_publish(pipe, channel, message)
+            await pipe.execute()
+
+    async def _consume_frames(self):
+        """Consumer: drains the frame queue (ticks first) and parses/publishes"""
+        while True:
+            message, kind, received_ns = await self.frame_queue.get()
+            try:
+                await self._handle_message(message, kind, received_ns)
+            except Exception as e:
+                logger.error(f"Frame Consumer Error [{kind.upper()}]: {e}")
+
+    async def _send_request(self, socket_type: str, tr_id: str, tr_key: str, tr_type: str,
+                            wait_confirm: bool = True, timeout: float = 5.0, websocket=None) -> bool:
+        """Routes request to the correct socket (or an explicit one), waiting for the subscribe response
+
+        Returns:
+            bool: True if sent (and confirmed, for subscribe requests with wait_confirm)
+        """
         if socket_type == 'tick':
-            target_ws = self.ws_tick
+            target_ws = websocket or self.ws_tick
             target_lock = self.lock_tick
         elif socket_type == 'orderbook':
-            target_ws = self.ws_orderbook
+            target_ws = websocket or self.ws_orderbook
             target_lock = self.lock_orderbook
-            
+        else:
+            return False
+
         if not target_ws:
             logger.warning(f"⚠️  Cannot send request: {socket_type} socket not connected.")
-            return
+            return False
 
+        pending_key = (tr_id, tr_key)
+        confirm = tr_type == "1" and wait_confirm
         async with target_lock:
-            if not target_ws or not self.approval_key:
-                return
+            if not self.approval_key:
+                return False
             
             req = {
                 "header": {
@@ -170,34 +258,110 @@ class DualWebSocketManager:
                     }
                 }
             }
-            await target_ws.send(json.dumps(req))
+            if confirm:
+                self.pending_subscriptions[pending_key] = asyncio.Event()
+                self.subscription_results[pending_key] = False
+            try:
+                await target_ws.send(json.dumps(req))
+            except Exception as e:
+                logger.error(f"Failed to send request [{socket_type.upper()}]: {e}")
+                self.pending_subscriptions.pop(pending_key, None)
+                self.subscription_results.pop(pending_key, None)
+                return False
             logger.info(f"📤 SENT [{socket_type.upper()}]: tr_id={tr_id} key={tr_key} type={tr_type}")
 
-    async def subscribe_market(self, market: str):
-        """Subscribes to all collectors for the given market, routing appropriately"""
-        if market in self.active_markets:
-            return
+        if not confirm:
+            return True
 
-        logger.info(f"[{market}] Starting DUAL-SOCKET Subscription...")
-        
+        # Wait outside the socket lock so other requests stay in flight
+        try:
+            await asyncio.wait_for(self.pending_subscriptions[pending_key].wait(), timeout=timeout)
+            return self.subscription_results.get(pending_key, False)
+        except asyncio.TimeoutError:
+            logger.warning(f"⏰ SUBSCRIBE TIMEOUT [{socket_type.upper()}]: {tr_id}/{tr_key}")
+            return False
+        finally:
+            self.pending_subscriptions.pop(pending_key, None)
+            self.subscription_results.pop(pending_key, None)
+
+    async def _subscribe_collectors(self, market: str, max_retries: int = 3, socket_type: Optional[str] = None,
+                                    sockets: Optional[Dict[str, object]] = None) -> SubscriptionReport:
+        """Pipelined subscribe of every (tr_id, symbol) of the market
+
+        socket_type: only collectors routed to this socket (re-subscribe after reconnect)
+        sockets: explicit target sockets per socket type (default: active sockets)
+        """
+        requests = []
         for tr_id, collector in self.collectors.items():
-            if collector.market == market:
-                # Load Symbols
-                if not collector.symbols:
-                    collector.load_symbols()
-                
-                # Determine Socket Type
-                socket_type = self._determine_socket_type(tr_id)
-                if socket_type == 'unknown':
-                    logger.warning(f"❌ Unknown TR_ID type {tr_id}, skipping subscription.")
-                    continue
-                
-                for sym in collector.symbols:
-                    await self._send_request(socket_type, tr_id, sym, "1") # 1=Subscribe
-                    await asyncio.sleep(0.1) # Gentle rate limit
-        
+            if collector.market != market:
+                continue
+            detected = self._determine_socket_type(tr_id)
+            if detected == 'unknown':
+                logger.warning(f"❌ Unknown TR_ID type {tr_id}, skipping subscription.")
+                continue
+            if socket_type and detected != socket_type:
+                continue
+            if not collector.symbols:
+                collector.refresh_symbols()
+            requests.extend((tr_id, sym) for sym in collector.symbols)
+
+        sockets = sockets or {}
+
+        async def send(tr_id: str, tr_key: str) -> bool:
+            target = self._determine_socket_type(tr_id)
+            return await self._send_request(target, tr_id, tr_key, "1", websocket=sockets.get(target))
+
+        logger.info(f"[{market}] Starting DUAL-SOCKET Subscription: {len(requests)} requests (pipelined)...")
+        report = await subscribe_all(send, requests, market=market, max_retries=max_retries,
+                                     bucket=self.subscribe_bucket)
+        self.subscription_reports[market] = report
+        await self._publish_metric("subscription_time", round(report.elapsed, 3), report.to_meta())
+        return report
+
+    async def subscribe_market(self, market: str, max_retries: int = 3) -> bool:
+        """Subscribes to all collectors for the given market, routing appropriately
+
+        Returns:
+            bool: True if at least one subscription was confirmed (or the market has no symbols)
+        """
+        if market in self.active_markets:
+            return True
+
+        report = await self._subscribe_collectors(market, max_retries)
+        if report.total and not report.confirmed:
+            logger.error(f"❌ [{market}] SUBSCRIPTION FAILED: 0/{report.total} confirmed.")
+            return False
+
         self.active_markets.add(market)
-        logger.info(f"[{market}] Subscription Setup Complete.")
+        if report.failed:
+            logger.warning(f"⚠️ [{market}] PARTIAL: {report.confirmed}/{report.total} OK in {report.elapsed:.2f}s")
+        else:
+            logger.info(f"✅ [{market}] Subscription Setup Complete: {report.confirmed}/{report.total} in {report.elapsed:.2f}s")
+        return True
+
+    async def _resubscribe(self, socket_type: str):
+        """Re-subscribes the active markets on a freshly (re)connected socket"""
+        logger.info(f"🔄 [{socket_type.upper()}] Re-subscribing to {len(self.active_markets)} active markets...")
+        for market in list(self.active_markets):
+            await self._subscribe_collectors(market, socket_type=socket_type)
+
+    async def subscribe_symbols(self, tr_id: str, symbols: List[str]):
+        """Adds symbols to a collector at runtime (shard rebalancing), subscribing if its market is active"""
+        collector = self.collectors.get(tr_id)
+        if not collector:
+            logger.warning(f"❌ Unknown TR_ID {tr_id}, cannot add symbols.")
+            return
+
+        new_symbols = [sym for sym in symbols if sym not in collector.symbols]
+        collector.symbols.extend(new_symbols)
+
+        socket_type = self._determine_socket_type(tr_id)
+        if collector.market in self.active_markets and socket_type != 'unknown':
+            await subscribe_all(
+                lambda tid, key: self._send_request(socket_type, tid, key, "1"),
+                [(tr_id, sym) for sym in new_symbols], market=collector.market, bucket=self.subscribe_bucket
+            )
+        logger.info(f"➕ [{collector.market}] {tr_id}: added {len(new_symbols)} symbols")
 
     async def unsubscribe_market(self, market: str):
         """Unsubscribes, routing appropriately"""
@@ -211,14 +375,64 @@ class DualWebSocketManager:
                 if socket_type == 'unknown': continue
 
                 for sym in collector.symbols:
+                    await self.subscribe_bucket.acquire()  # Rate limit
                     await self._send_request(socket_type, tr_id, sym, "2")
-                    await asyncio.sleep(0.1)
         
         self.active_markets.discard(market)
 
+    async def _publish_metric(self, metric_type: str, value: float, meta: dict):
+        """Publishes a generic system.metrics event"""
+        if not self.redis:
+            return
+        payload = {
+            "timestamp": datetime.now().isoformat(),
+            "type": metric_type,
+            "value": value,
+            "meta": meta,
+        }
+        try:
+            await self.redis.publish("system.metrics", json.dumps(payload))
+        except Exception as e:
+            logger.error(f"Failed to publish {metric_type}: {e}")
+
+    def _active_socket(self, socket_type: str):
+        return self.ws_tick if socket_type == 'tick' else self.ws_orderbook
+
+    async def _read_socket(self, ws, socket_type: str):
+        """Read loop: data frames are enqueued only while ws is the active socket of its type"""
+        async for message in ws:
+            if message and message[0] in ('0', '1'):
+                if ws is not self._active_socket(socket_type):
+                    self.unrouted_frames += 1
+                    continue
+                # Data frame: enqueue only, consumers parse/publish off the read path
+                self.frame_queue.put(message, socket_type, now_ns())
+                continue
+
+            # Control messages (PINGPONG / subscribe responses / protocol errors) are handled inline
+            res = await self._handle_message(message, socket_type)
+            if res == "PONG":
+                await ws.send(message)
+
     async def _maintain_connection(self, socket_type: str):
         """Dedicated loop for a single socket connection"""
+        lock = self.lock_tick if socket_type == 'tick' else self.lock_orderbook
         while True:
+            promoted = self._standby_readers.pop(socket_type, None)
+            if promoted:
+                # Warm standby socket became active: keep reading it until it drops
+                ws, reader = promoted
+                logger.info(f"🔁 [{socket_type.upper()}] Adopted warm standby socket.")
+                try:
+                    await reader
+                except Exception as e:
+                    logger.error(f"⚠️ [{socket_type.upper()}] Error: {e}")
+                async with lock:
+                    if self._active_socket(socket_type) is ws:
+                        self._set_socket(socket_type, None)
+                continue
+
+            ws = None
             try:
                 target_url = self.current_ws_url
                 logger.info(f"🔌 [{socket_type.upper()}] Connecting to {target_url}...")
@@ -230,39 +444,34 @@ class DualWebSocketManager:
                     logger.info(f"✅ [{socket_type.upper()}] Connected.")
                     
                     # Update State
-                    if socket_type == 'tick':
-                        async with self.lock_tick: self.ws_tick = ws
-                    else:
-                        async with self.lock_orderbook: self.ws_orderbook = ws
+                    async with lock:
+                        if socket_type in self._standby_readers:
+                            # A standby cut-over completed while connecting -> discard this socket
+                            continue
+                        self._set_socket(socket_type, ws)
                     
-                    # ✅ Auto-Resubscribe Logic
-                    logger.info(f"🔄 [{socket_type.upper()}] Re-subscribing to {len(self.active_markets)} active markets...")
-                    for market in list(self.active_markets):
-                         # We call internal logical sender to avoid 'already active' check
-                         for tr_id, collector in self.collectors.items():
-                            if collector.market == market:
-                                detected_type = self._determine_socket_type(tr_id)
-                                if detected_type == socket_type:
-                                    for sym in collector.symbols:
-                                        await self._send_request(socket_type, tr_id, sym, "1")
-                                        await asyncio.sleep(0.01) # Faster recovery
+                    # ✅ Auto-Resubscribe Logic (background: confirmations arrive via the read loop below)
+                    asyncio.create_task(self._resubscribe(socket_type))
                     
-                    async for message in ws:
-                        res = await self._handle_message(message, socket_type)
-                        if res == "PONG":
-                            await ws.send(message)
+                    await self._read_socket(ws, socket_type)
                             
             except Exception as e:
                 logger.error(f"⚠️ [{socket_type.upper()}] Error: {e}")
                 
             finally:
-                # Cleanup
-                if socket_type == 'tick':
-                    async with self.lock_tick: self.ws_tick = None
-                else:
-                    async with self.lock_orderbook: self.ws_orderbook = None
+                # Cleanup (a promoted standby socket is left in place)
+                async with lock:
+                    if ws is not None and self._active_socket(socket_type) is ws:
+                        self._set_socket(socket_type, None)
                 
-                await asyncio.sleep(5) # Reconnect delay
+                if socket_type not in self._standby_readers:
+                    await asyncio.sleep(5) # Reconnect delay
+
+    def _set_socket(self, socket_type: str, ws):
+        if socket_type == 'tick':
+            self.ws_tick = ws
+        else:
+            self.ws_orderbook = ws
 
     async def switch_url(self, new_url: str):
         """Updates the URL and forces reconnection for both sockets."""
@@ -275,6 +484,62 @@ class DualWebSocketManager:
         if self.ws_orderbook:
             await self.ws_orderbook.close()
 
+    async def switch_url_standby(self, new_url: str, market: str) -> bool:
+        """Warm standby switch (make-before-break) for both sockets
+
+        1. Connect standby tick/orderbook sockets to new_url and subscribe the target market on them
+        2. Swap the active sockets/markets under both locks (routing cut-over)
+        3. Close the old sockets only after the swap; _maintain_connection adopts the standby readers
+
+        Returns:
+            bool: True on success (on failure the current sockets are kept, callers may fall back to switch_url)
+        """
+        logger.info(f"🔥 [{market}] Warm standby: connecting tick/orderbook sockets to {new_url} ahead of switch...")
+        prepare_started = time.monotonic()
+        standby = {}
+        try:
+            for socket_type in ('tick', 'orderbook'):
+                standby[socket_type] = await websockets.connect(
+                    new_url, ping_interval=20, ping_timeout=10, close_timeout=10
+                )
+        except Exception as e:
+            logger.error(f"[{market}] Standby connect failed: {e}")
+            for ws in standby.values():
+                await ws.close()
+            return False
+
+        readers = {t: asyncio.create_task(self._read_socket(ws, t)) for t, ws in standby.items()}
+        report = await self._subscribe_collectors(market, sockets=standby)
+        if report.total and not report.confirmed:
+            logger.error(f"❌ [{market}] Standby subscription failed. Keeping current sockets.")
+            for socket_type, ws in standby.items():
+                readers[socket_type].cancel()
+                await ws.close()
+            return False
+
+        # Cut-over: from here data frames are routed only from the standby sockets
+        cutover_started = time.monotonic()
+        async with self.lock_tick, self.lock_orderbook:
+            old = [self.ws_tick, self.ws_orderbook]
+            self.ws_tick, self.ws_orderbook = standby['tick'], standby['orderbook']
+            self.current_ws_url = new_url
+            self.active_markets = {market}
+            self._standby_readers = {t: (ws, readers[t]) for t, ws in standby.items()}
+        gap = time.monotonic() - cutover_started
+
+        # Break: close the old sockets only after the cut-over
+        for ws in old:
+            if ws:
+                await ws.close()
+
+        logger.info(f"⏱️  [{market}] Market switch gap (standby): {gap * 1000:.1f}ms")
+        await self._publish_metric("market_switch_gap_ms", round(gap * 1000, 3), {
+            "market": market, "mode": "standby",
+            "prepare_sec": round(cutover_started - prepare_started, 3),
+            "confirmed": report.confirmed, "total": report.total,
+        })
+        return True
+
     async def run(self, ws_url: str, approval_key: str):
         """Main entry point: Launches parallel connection loops"""
         self.approval_key = approval_key
@@ -284,13 +549,20 @@ class DualWebSocketManager:
         
         # Load Symbols
         for c in self.collectors.values():
-            c.load_symbols()
+            c.refresh_symbols()
             logger.info(f"[{c.market}] Loaded {len(c.symbols)} symbols for {c.tr_id}")
 
         logger.info("🚀 Starting DUAL-SOCKET Manager...")
         
-        # Run both sockets concurrently
-        await asyncio.gather(
-            self._maintain_connection('tick'),
-            self._maintain_connection('orderbook')
-        )
+        # Run both sockets concurrently (+ frame consumers)
+        consumers = [self._consume_frames() for _ in range(FRAME_CONSUMERS)]
+        try:
+            await asyncio.gather(
+                self._maintain_connection('tick'),
+                self._maintain_connection('orderbook'),
+                *consumers
+            )
+        finally:
+            if self.publisher:
+                # Flush messages still queued before shutting down
+                await self.publisher.stop()
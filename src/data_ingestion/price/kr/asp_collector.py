@@ -4,18 +4,23 @@ import yaml
 import os
 from datetime import datetime
 from src.core.schema import OrderbookData, OrderbookUnit
+from src.core.orderbook_delta import OrderbookDeltaEncoder, ORDERBOOK_DELTA
 from src.data_ingestion.price.common.websocket_base import BaseCollector
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("KRASPCollector")
 
 CONFIG_FILE = os.getenv("CONFIG_FILE", "configs/kr_symbols.yaml")
+KR_MAX_LEVELS = 9  # H0STASP0: 매도/매수 9레벨 (kis_orderbook_schema.OrderbookResponseBody)
+ORDERBOOK_LEVELS = min(int(os.getenv("ORDERBOOK_LEVELS", str(KR_MAX_LEVELS))), KR_MAX_LEVELS)
 
 class KRASPCollector(BaseCollector):
     """한국 시장 실시간 호가 수집기 (핸들러)"""
     
     def __init__(self):
         super().__init__(market="KR", tr_id="H0STASP0")
+        if ORDERBOOK_DELTA:
+            self.delta_encoder = OrderbookDeltaEncoder()
         
     def get_channel(self) -> str:
         return "orderbook.kr"
@@ -55,20 +60,22 @@ class KRASPCollector(BaseCollector):
             asks = []
             bids = []
             
-            for i in range(5):
+            for i in range(ORDERBOOK_LEVELS):
                 asks.append(OrderbookUnit(
-                    price=float(fields[3+i]),    # ASKP1~5: Index 3~7
-                    vol=float(fields[21+i])      # ASKP_RSQN1~5: Index 21~25 (수정: 23→21)
+                    price=float(fields[3+i]),    # ASKP1~9: Index 3~11
+                    vol=float(fields[21+i])      # ASKP_RSQN1~9: Index 21~29 (수정: 23→21)
                 ))
                 bids.append(OrderbookUnit(
-                    price=float(fields[12+i]),   # BIDP1~5: Index 12~16 (수정: 13→12)
-                    vol=float(fields[30+i])      # BIDP_RSQN1~5: Index 30~34 (수정: 33→30)
+                    price=float(fields[12+i]),   # BIDP1~9: Index 12~20 (수정: 13→12)
+                    vol=float(fields[30+i])      # BIDP_RSQN1~9: Index 30~38 (수정: 33→30)
                 ))
                 
             return OrderbookData(
                 symbol=symbol,
                 asks=asks,
-                bids=bids
+                bids=bids,
+                total_ask_vol=float(fields[39]),  # TOTAL_ASKP_RSQN
+                total_bid_vol=float(fields[40]),  # TOTAL_BIDP_RSQN
             )
             
         except Exception as e:
@@ -19,6 +19,7 @@ CONFIG_FILE = os.getenv("CONFIG_FILE", "configs/kr_symbols.yaml")
 
 
 from src.data_ingestion.price.common.websocket_base import BaseCollector
+from src.data_ingestion.price.common.frame_parser import KR_TICK_LAYOUT, parse_tick_fields
 
 class KRRealCollector(BaseCollector):
     """한국 시장 실시간 데이터 수집기 (핸들러)"""
@@ -90,4 +91,13 @@ class KRRealCollector(BaseCollector):
         except (IndexError, ValueError) as e:
             logger.error(f"KR Parsing Error: {e} | Raw: {body_str}")
             return None
-    
+
+    def parse_fast(self, body_str: str):
+        """
+        H0STCNT0 Fast-Path 파싱 (발행 경로용)
+        - parse_tick()과 동일한 필드를 maxsplit 분리로 추출, 검증 모델 생성 생략
+
+        Returns:
+            TickRecord or None
+        """
+        return parse_tick_fields(body_str, KR_TICK_LAYOUT)
@@ -0,0 +1,311 @@
+"""
+샤드(Sharded) 실시간 수집기 엔트리포인트
+- 전체 구독 대상 (market, tr_id, symbol)을 N개 워커 프로세스로 분할
+- 워커마다 독립된 DualWebSocketManager 세션 + Approval Key (샤드별 앱키: KIS_APP_KEY_<n>/KIS_APP_SECRET_<n>)
+- Supervisor가 워커 생존/처리량을 감시하고, 워커 종료 시 해당 심볼을 생존 샤드로 재분배
+  (세션당 구독 상한 초과분은 신규 샤드를 띄워 수용)
+
+Usage:
+    COLLECTOR_SHARDS=4 python -m src.data_ingestion.price.unified_collector
+    COLLECTOR_SHARDS=4 python -m src.data_ingestion.price.sharded_collector
+"""
+import asyncio
+import json
+import logging
+import multiprocessing as mp
+import os
+import queue
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("ShardedCollector")
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+KIS_WS_URL = os.getenv("KIS_WS_URL", "ws://ops.koreainvestment.com:21000")
+COLLECTOR_SHARDS = int(os.getenv("COLLECTOR_SHARDS", "2"))
+MAX_SUBSCRIPTIONS_PER_SESSION = int(os.getenv("MAX_SUBSCRIPTIONS_PER_SESSION", "40"))  # KIS 세션당 41건 제한
+SHARD_REPORT_INTERVAL = int(os.getenv("SHARD_REPORT_INTERVAL", "10"))  # seconds
+
+# (market, tr_id, symbol)
+SubscriptionKey = Tuple[str, str, str]
+
+
+# ============================================================
+# Shard Planning (순수 로직)
+# ============================================================
+
+def partition_subscriptions(keys: List[SubscriptionKey], num_shards: int) -> Dict[int, List[SubscriptionKey]]:
+    """
+    구독 대상을 샤드별로 분할 (시장별로 균등 분배)
+    - KR/US는 동시에 구독되지 않으므로 세션 부하는 시장 단위로 균형을 맞춤
+    """
+    plan: Dict[int, List[SubscriptionKey]] = {shard_id: [] for shard_id in range(num_shards)}
+    by_market: Dict[str, List[SubscriptionKey]] = defaultdict(list)
+    for key in sorted(set(keys)):
+        by_market[key[0]].append(key)
+
+    for market_keys in by_market.values():
+        for i, key in enumerate(market_keys):
+            plan[i % num_shards].append(key)
+    return plan
+
+
+def market_load(keys: List[SubscriptionKey], market: str) -> int:
+    return sum(1 for key in keys if key[0] == market)
+
+
+def rebalance_subscriptions(plan: Dict[int, List[SubscriptionKey]], dead_shard: int,
+                            capacity: int = MAX_SUBSCRIPTIONS_PER_SESSION
+                            ) -> Tuple[Dict[int, List[SubscriptionKey]], List[SubscriptionKey]]:
+    """
+    종료된 샤드의 구독을 생존 샤드 중 시장별 부하가 가장 낮은 곳으로 재분배
+
+    Returns:
+        (갱신된 plan, 상한 초과로 수용하지 못한 구독 목록)
+    """
+    orphans = plan.pop(dead_shard, [])
+    overflow: List[SubscriptionKey] = []
+
+    for key in orphans:
+        market = key[0]
+        loads = {shard_id: market_load(keys, market) for shard_id, keys in plan.items()}
+        candidates = [shard_id for shard_id, load in loads.items() if load < capacity]
+        if not candidates:
+            overflow.append(key)
+            continue
+        target = min(candidates, key=lambda shard_id: (loads[shard_id], shard_id))
+        plan[target].append(key)
+
+    return plan, overflow
+
+
+def to_assignment(keys: List[SubscriptionKey]) -> Dict[str, List[str]]:
+    """워커 전달용 {tr_id: [symbols]} 형태로 변환"""
+    assignment: Dict[str, List[str]] = defaultdict(list)
+    for _, tr_id, symbol in keys:
+        assignment[tr_id].append(symbol)
+    return dict(assignment)
+
+
+def shard_credentials(shard_id: int) -> Tuple[Optional[str], Optional[str]]:
+    """샤드 전용 앱키 (없으면 None -> 기본 KIS_APP_KEY/KIS_APP_SECRET 사용)"""
+    return os.getenv(f"KIS_APP_KEY_{shard_id}"), os.getenv(f"KIS_APP_SECRET_{shard_id}")
+
+
+# ============================================================
+# Worker Process
+# ============================================================
+
+def apply_assignment(collectors: list, assignment: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """
+    수집기별 샤드 심볼 필터 갱신
+
+    Returns:
+        dict: 새로 추가된 {tr_id: [symbols]}
+    """
+    added = {}
+    for collector in collectors:
+        new_symbols = set(assignment.get(collector.tr_id, []))
+        previous = collector.shard_symbols or set()
+        collector.shard_symbols = new_symbols
+        diff = sorted(new_symbols - previous)
+        if diff:
+            added[collector.tr_id] = diff
+    return added
+
+
+async def _run_shard(shard_id: int, assignment: Dict[str, List[str]], control_q, report_q):
+    from src.data_ingestion.price.common import KISAuthManager
+    from src.data_ingestion.price.common.websocket_dual import DualWebSocketManager
+    from src.data_ingestion.price.unified_collector import build_collectors, market_scheduler, schedule_key_refresh
+
+    collectors = build_collectors()
+    apply_assignment(collectors, assignment)
+    manager = DualWebSocketManager(collectors=collectors, redis_url=REDIS_URL)
+
+    auth = KISAuthManager(*shard_credentials(shard_id))
+    approval_key = await auth.get_approval_key()
+
+    async def control_listener():
+        """Supervisor 재분배 명령 수신 (blocking Queue.get은 executor에서 대기)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            msg = await loop.run_in_executor(None, control_q.get)
+            if msg.get("command") == "assign":
+                added = apply_assignment(collectors, msg["assignment"])
+                for tr_id, symbols in added.items():
+                    await manager.subscribe_symbols(tr_id, symbols)
+                logger.info(f"[Shard {shard_id}] Rebalanced: +{sum(len(v) for v in added.values())} symbols")
+
+    async def reporter():
+        """처리량/큐 지표를 Supervisor로 보고"""
+        while True:
+            await asyncio.sleep(SHARD_REPORT_INTERVAL)
+            publisher = manager.publisher
+            report_q.put({
+                "shard": shard_id,
+                "time": time.time(),
+                "published": publisher.published if publisher else 0,
+                "dropped": (publisher.dropped if publisher else 0) + sum(manager.frame_queue.dropped.values()),
+                "queue_depth": manager.frame_queue.depth(),
+                "symbols": sum(len(c.symbols) for c in collectors),
+            })
+
+    asyncio.create_task(control_listener())
+    asyncio.create_task(reporter())
+    asyncio.create_task(market_scheduler(manager, auth))
+    asyncio.create_task(schedule_key_refresh(manager, auth))
+
+    # Default URL (scheduler가 즉시 보정)
+    await manager.run(f"{KIS_WS_URL}/HDFSCNT0", approval_key)
+
+
+def shard_worker(shard_id: int, assignment: Dict[str, List[str]], control_q, report_q):
+    """워커 프로세스 엔트리포인트 (spawn)"""
+    logging.basicConfig(level=logging.INFO)
+    logger.info(f"🧩 Shard {shard_id} starting: {sum(len(v) for v in assignment.values())} subscriptions")
+    asyncio.run(_run_shard(shard_id, assignment, control_q, report_q))
+
+
+# ============================================================
+# Supervisor
+# ============================================================
+
+class ShardSupervisor:
+    """워커 프로세스 생성/감시, 종료 시 재분배, 샤드별 처리량 보고"""
+
+    def __init__(self, num_shards: int = COLLECTOR_SHARDS, capacity: int = MAX_SUBSCRIPTIONS_PER_SESSION):
+        self.num_shards = num_shards
+        self.capacity = capacity
+        self.ctx = mp.get_context("spawn")
+        self.report_q = self.ctx.Queue()
+
+        self.plan: Dict[int, List[SubscriptionKey]] = {}
+        self.processes: Dict[int, mp.Process] = {}
+        self.control_queues: Dict[int, mp.Queue] = {}
+        self.last_reports: Dict[int, dict] = {}
+        self.throughput: Dict[int, float] = {}
+        self.next_shard_id = num_shards
+
+    def load_subscriptions(self) -> List[SubscriptionKey]:
+        """전체 수집기 심볼 로드 -> 구독 키 목록"""
+        from src.data_ingestion.price.unified_collector import build_collectors
+
+        keys = []
+        for collector in build_collectors():
+            for symbol in collector.load_symbols():
+                keys.append((collector.market, collector.tr_id, symbol))
+        return keys
+
+    def start(self):
+        keys = self.load_subscriptions()
+        self.plan = partition_subscriptions(keys, self.num_shards)
+
+        for shard_id, shard_keys in self.plan.items():
+            for market in ("KR", "US"):
+                load = market_load(shard_keys, market)
+                if load > self.capacity:
+                    logger.warning(f"⚠️  Shard {shard_id} {market}: {load} subscriptions exceed session limit {self.capacity}. Increase COLLECTOR_SHARDS.")
+            self._spawn(shard_id, shard_keys)
+
+        logger.info(f"🚀 Supervisor started {len(self.processes)} shards for {len(keys)} subscriptions")
+
+    def _spawn(self, shard_id: int, shard_keys: List[SubscriptionKey]):
+        control_q = self.ctx.Queue()
+        proc = self.ctx.Process(
+            target=shard_worker,
+            args=(shard_id, to_assignment(shard_keys), control_q, self.report_q),
+            name=f"collector-shard-{shard_id}",
+            daemon=True
+        )
+        proc.start()
+        self.plan[shard_id] = shard_keys
+        self.processes[shard_id] = proc
+        self.control_queues[shard_id] = control_q
+
+    def handle_dead_shard(self, shard_id: int):
+        """종료된 샤드의 구독을 생존 샤드로 재분배 (상한 초과분은 신규 샤드로)"""
+        proc = self.processes.pop(shard_id)
+        self.control_queues.pop(shard_id, None)
+        self.last_reports.pop(shard_id, None)
+        self.throughput.pop(shard_id, None)
+        orphan_count = len(self.plan.get(shard_id, []))
+        logger.error(f"💀 Shard {shard_id} died (exitcode={proc.exitcode}). Rebalancing {orphan_count} subscriptions...")
+
+        self.plan, overflow = rebalance_subscriptions(self.plan, shard_id, self.capacity)
+
+        for live_id, control_q in self.control_queues.items():
+            control_q.put({"command": "assign", "assignment": to_assignment(self.plan[live_id])})
+
+        if overflow:
+            new_id = self.next_shard_id
+            self.next_shard_id += 1
+            logger.warning(f"🧩 Spawning shard {new_id} for {len(overflow)} overflow subscriptions")
+            self._spawn(new_id, overflow)
+
+    def collect_reports(self):
+        """워커 보고 수집 -> 샤드별 초당 발행 건수 계산"""
+        while True:
+            try:
+                report = self.report_q.get_nowait()
+            except queue.Empty:
+                break
+
+            shard_id = report["shard"]
+            previous = self.last_reports.get(shard_id)
+            if previous and report["time"] > previous["time"]:
+                self.throughput[shard_id] = (report["published"] - previous["published"]) / (report["time"] - previous["time"])
+            self.last_reports[shard_id] = report
+
+    async def publish_metrics(self, r: redis.Redis):
+        """샤드별 처리량을 system.metrics 채널로 발행 (Archiver generic 포맷)"""
+        ts = datetime.now().isoformat()
+        for shard_id, rate in sorted(self.throughput.items()):
+            report = self.last_reports.get(shard_id, {})
+            logger.info(f"📊 Shard {shard_id}: {rate:.1f} msg/s | symbols={report.get('symbols')} dropped={report.get('dropped')} queue={report.get('queue_depth')}")
+            await r.publish("system.metrics", json.dumps({
+                "timestamp": ts,
+                "type": "collector_shard_throughput",
+                "value": rate,
+                "meta": {
+                    "shard": shard_id,
+                    "symbols": report.get("symbols"),
+                    "dropped": report.get("dropped"),
+                    "queue_depth": report.get("queue_depth")
+                }
+            }))
+
+    async def run(self):
+        self.start()
+        r = await redis.from_url(REDIS_URL, decode_responses=True)
+        try:
+            while True:
+                await asyncio.sleep(SHARD_REPORT_INTERVAL)
+
+                for shard_id, proc in list(self.processes.items()):
+                    if not proc.is_alive():
+                        self.handle_dead_shard(shard_id)
+
+                self.collect_reports()
+                try:
+                    await self.publish_metrics(r)
+                except Exception as e:
+                    logger.error(f"Failed to publish shard metrics: {e}")
+        finally:
+            for proc in self.processes.values():
+                proc.terminate()
+            await r.close()
+
+
+def main():
+    logger.info(f"🚀 Starting Sharded Collector ({COLLECTOR_SHARDS} shards)...")
+    asyncio.run(ShardSupervisor().run())
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ import pytz
 
 from src.data_ingestion.price.common import KISAuthManager
 from src.data_ingestion.price.common.websocket_dual import DualWebSocketManager
-from src.data_ingestion.price.common.websocket_base import UnifiedWebSocketManager
+from src.data_ingestion.price.common.websocket_base import UnifiedWebSocketManager, MARKET_SWITCH_MODE
 import redis.asyncio as redis
 import json
 import sys
@@ -26,17 +26,20 @@ logger = logging.getLogger("UnifiedCollector")
 # 환경 변수
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 KIS_WS_URL = os.getenv("KIS_WS_URL", "ws://ops.koreainvestment.com:21000")
+STANDBY_LEAD_SEC = int(os.getenv("STANDBY_LEAD_SEC", "60"))  # Warm standby 전환 선행 시간
 
 # 인증 관리자
 auth_manager = KISAuthManager()
 TZ_KST = pytz.timezone('Asia/Seoul')
 
-async def schedule_key_refresh(manager):
+async def schedule_key_refresh(manager, auth: KISAuthManager = None):
     """
     일일 Approval Key 갱신 스케줄러
     - 08:00 KST: 한국장 시작 1시간 전 갱신
     - 22:00 KST: 미국장 시작 1.5시간 전 갱신
+    - auth: 샤드 모드에서 샤드 전용 인증 관리자 주입 (기본: 전역 auth_manager)
     """
+    auth = auth or auth_manager
     while True:
         try:
             now_kst = datetime.now(TZ_KST)
@@ -66,7 +69,7 @@ async def schedule_key_refresh(manager):
             
             # 갱신 실행
             logger.warning(f"🔑 [SCHEDULED] API Key Refresh at {next_refresh.strftime('%H:%M')}")
-            new_key = await auth_manager.get_approval_key()
+            new_key = await auth.get_approval_key()
             
             # Manager에 새 키 주입
             if hasattr(manager, 'approval_key'):
@@ -85,11 +88,18 @@ async def schedule_key_refresh(manager):
             logger.error(f"Key refresh scheduler error: {e}")
             await asyncio.sleep(300)  # 에러 시 5분 후 재시도
 
-async def market_scheduler(manager: DualWebSocketManager):
+async def market_scheduler(manager: DualWebSocketManager, auth: KISAuthManager = None):
     """
     시장 시간 기반 동적 구독 스케줄러 (Dual-Socket Aware)
+    - auth: 샤드 모드에서 샤드 전용 인증 관리자 주입 (기본: 전역 auth_manager)
     """
-    logger.info("📅 Market Scheduler Started")
+    auth = auth or auth_manager
+    # Warm standby: 세션 시작 STANDBY_LEAD_SEC 전에 다음 세션 소켓을 미리 연결/구독 후 cut-over
+    use_standby = MARKET_SWITCH_MODE == "standby" and hasattr(manager, "switch_url_standby")
+    if MARKET_SWITCH_MODE == "standby" and not use_standby:
+        logger.warning(f"⚠️  MARKET_SWITCH_MODE=standby not supported by {type(manager).__name__}, using reconnect switch")
+    lead = STANDBY_LEAD_SEC if use_standby else 0
+    logger.info(f"📅 Market Scheduler Started (switch mode: {'standby' if use_standby else 'reconnect'})")
     
     current_mode = None 
     
@@ -99,11 +109,11 @@ async def market_scheduler(manager: DualWebSocketManager):
             current_time = now_kst.time()
             
             # KR Market: 08:30 ~ 16:00 KST
-            kr_start = time(8, 30)
+            kr_start = shift_time(time(8, 30), lead)
             kr_end = time(16, 0)
             
             # US Market: 17:00 ~ 08:00 KST (Next Day) - Expanded range
-            us_start = time(17, 0)
+            us_start = shift_time(time(17, 0), lead)
             us_end = time(8, 0)
             
             is_kr_time = check_time_cross_midnight(current_time, kr_start, kr_end)
@@ -115,7 +125,7 @@ async def market_scheduler(manager: DualWebSocketManager):
                 if current_mode != 'KR':
                     logger.info("🔁 Market Switch Detected: US/Idle -> KR")
                     kr_url = f"{KIS_WS_URL}/H0STCNT0" # Use Tick Endpoint as Base
-                    await manager.switch_url(kr_url)
+                    await switch_market(manager, kr_url, 'KR', use_standby)
                     current_mode = 'KR'
                 
                 # Subscription Check (Retry Loop)
@@ -131,14 +141,14 @@ async def market_scheduler(manager: DualWebSocketManager):
                     # [Policy] Unconditional Key Refresh at US Start
                     logger.warning("🔑 [POLICY] Force Key Refresh for US Market Start")
                     try:
-                        new_key = await auth_manager.get_approval_key()
+                        new_key = await auth.get_approval_key()
                         await manager.update_key(new_key)
                         logger.info("✅ Key Refreshed for US Session")
                     except Exception as e:
                         logger.error(f"Failed to refresh key at US start: {e}")
 
                     us_url = f"{KIS_WS_URL}/HDFSCNT0" # Use Tick Endpoint as Base
-                    await manager.switch_url(us_url)
+                    await switch_market(manager, us_url, 'US', use_standby)
                     current_mode = 'US'
                 
                 # Subscription Check
@@ -160,6 +170,20 @@ def check_time_cross_midnight(current: time, start: time, end: time) -> bool:
     else: # Cross midnight
         return start <= current or current <= end
 
+def shift_time(t: time, seconds: int) -> time:
+    """시각을 seconds만큼 앞당김 (Warm standby 선행 전환용)"""
+    return (datetime.combine(datetime.today(), t) - timedelta(seconds=seconds)).time()
+
+async def switch_market(manager, url: str, market: str, use_standby: bool):
+    """시장 전환 (standby 가능 시 make-before-break, 실패/미지원 시 기존 재연결 방식)"""
+    if use_standby and await manager.switch_url_standby(url, market):
+        return
+    await manager.switch_url(url)
+
+def build_collectors() -> list:
+    """수집기 인스턴스 생성 (KR/US Tick & Orderbook)"""
+    return [KRRealCollector(), KRASPCollector(), USRealCollector(), USASPCollector()]
+
 async def main():
     logger.info("🚀 Starting Unified Real-time Collector (Dual-Socket Mode)...")
 
@@ -167,10 +191,7 @@ async def main():
     approval_key = await auth_manager.get_approval_key()
     
     # 2. 수집기 인스턴스 생성 (KR/US Tick & Orderbook)
-    kr_tick = KRRealCollector()
-    kr_hoga = KRASPCollector()
-    us_tick = USRealCollector()
-    us_hoga = USASPCollector()
+    collectors = build_collectors()
     
     # 3. Mode Selection (Doomsday Protocol)
     # Check Redis Config
@@ -184,13 +205,13 @@ async def main():
     if use_dual:
         logger.info("⚔️  Mode: DUAL SOCKET (High Performance)")
         manager = DualWebSocketManager(
-            collectors=[kr_tick, kr_hoga, us_tick, us_hoga],
+            collectors=collectors,
             redis_url=REDIS_URL
         )
     else:
         logger.warning("🛡️  Mode: SINGLE SOCKET (Safe Mode)")
         manager = UnifiedWebSocketManager(
-            collectors=[kr_tick, kr_hoga, us_tick, us_hoga],
+            collectors=collectors,
             redis_url=REDIS_URL
         )
 
@@ -251,4 +272,9 @@ async def main():
     await manager.run(ws_url, approval_key)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # COLLECTOR_SHARDS > 1: 심볼을 N개 워커 프로세스로 분할 (sharded_collector 참조)
+    if int(os.getenv("COLLECTOR_SHARDS", "1")) > 1:
+        from src.data_ingestion.price.sharded_collector import main as sharded_main
+        sharded_main()
+    else:
+        asyncio.run(main())
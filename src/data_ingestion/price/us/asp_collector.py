@@ -4,18 +4,22 @@ import yaml
 import os
 from datetime import datetime
 from src.core.schema import OrderbookData, OrderbookUnit
+from src.core.orderbook_delta import OrderbookDeltaEncoder, ORDERBOOK_DELTA
 from src.data_ingestion.price.common.websocket_base import BaseCollector
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("USASPCollector")
 
 CONFIG_FILE = os.getenv("CONFIG_FILE", "configs/us_symbols.yaml")
+ORDERBOOK_LEVELS = int(os.getenv("ORDERBOOK_LEVELS", "9"))  # 수신 필드 수에 따라 자동 축소
 
 class USASPCollector(BaseCollector):
     """미국 시장 실시간 호가 수집기 (핸들러)"""
     
     def __init__(self):
         super().__init__(market="US", tr_id="HHDFS76200100") # 실시간 미국주식 호가 (User Confirmed)
+        if ORDERBOOK_DELTA:
+            self.delta_encoder = OrderbookDeltaEncoder()
 
     def get_channel(self) -> str:
         return "orderbook.us"
@@ -47,7 +51,9 @@ class USASPCollector(BaseCollector):
             asks = []
             bids = []
             
-            for i in range(5):
+            # 레벨당 4개 필드 (10번 인덱스부터), 수신된 레벨까지만 파싱
+            levels = min(ORDERBOOK_LEVELS, (len(fields) - 10) // 4)
+            for i in range(levels):
                 offset = i * 4
                 asks.append(OrderbookUnit(
                     price=float(fields[10 + offset]),
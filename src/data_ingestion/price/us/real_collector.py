@@ -19,6 +19,7 @@ CONFIG_FILE = os.getenv("CONFIG_FILE", "configs/us_symbols.yaml")
 
 
 from src.data_ingestion.price.common.websocket_base import BaseCollector
+from src.data_ingestion.price.common.frame_parser import US_TICK_LAYOUT, parse_tick_fields
 
 class USRealCollector(BaseCollector):
     """미국 시장 실시간 데이터 수집기 (핸들러)"""
@@ -122,4 +123,13 @@ class USRealCollector(BaseCollector):
         except (IndexError, ValueError) as e:
             logger.error(f"US Parsing Error: {e} | Raw: {body_str}")
             return None
-    
+
+    def parse_fast(self, body_str: str):
+        """
+        HDFSCNT0 Fast-Path 파싱 (발행 경로용)
+        - parse_tick()과 동일한 필드를 maxsplit 분리로 추출, 검증 모델 생성 생략
+
+        Returns:
+            TickRecord or None
+        """
+        return parse_tick_fields(body_str, US_TICK_LAYOUT)
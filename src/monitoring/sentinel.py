@@ -8,6 +8,8 @@ import yaml
 import psutil
 from datetime import datetime, timedelta
 from src.core.schema import MarketData
+from src.core.wire_format import decode_message
+from src.core.stream_transport import StreamConsumer, consumes_streams, MARKET_STREAMS
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
@@ -26,6 +28,7 @@ class Sentinel:
         self.startup_time = datetime.now()
         self.is_running = True
         self.config = self.load_config()
+        self.stream_consumer = None
 
     def load_config(self):
         config_path = "configs/sentinel_config.yaml"
@@ -269,13 +272,21 @@ class Sentinel:
         self.last_arrival[f"{market}_ORDERBOOK"] = datetime.now()
 
     async def run(self):
-        self.redis = await redis.from_url(REDIS_URL, decode_responses=True)
+        # decode_responses=False: Binary wire format 채널 수신 지원
+        self.redis = await redis.from_url(REDIS_URL, decode_responses=False)
         pubsub = self.redis.pubsub()
-        # 패턴 구독: ticker.kr, ticker.us 모두 수신
-        await pubsub.psubscribe("ticker.*")
+        if consumes_streams():
+            # Streams 모드: ticker.* 스트림을 전용 Consumer Group으로 수신 (재시작 시 과거 틱은 건너뜀)
+            tickers = [c for c in MARKET_STREAMS if c.startswith("ticker.")]
+            self.stream_consumer = StreamConsumer(self.redis, group="sentinel", channels=tickers, start_id="$")
+            await self.stream_consumer.ensure_groups()
+            asyncio.create_task(self.consume_streams())
+        else:
+            # 패턴 구독: ticker.kr, ticker.us 모두 수신
+            await pubsub.psubscribe("ticker.*")
         await pubsub.subscribe("market_orderbook")  # orderbook은 직접 구독 유지
         
-        logger.info("Sentinel started. Monitoring 'ticker.*' pattern and 'market_orderbook'...")
+        logger.info("Sentinel started. Monitoring 'ticker.*' and 'market_orderbook'...")
         
         # Start heartbeat monitor
         asyncio.create_task(self.monitor_heartbeat())
@@ -288,11 +299,11 @@ class Sentinel:
             
             if msg_type == 'pmessage':  # 패턴 구독 메시지 (ticker.*)
                 try:
-                    channel = message['channel']  # ticker.kr 또는 ticker.us
+                    channel = message['channel'].decode()  # ticker.kr 또는 ticker.us
                     raw_data = message['data']
                     
-                    # ticker.* 채널은 모두 MarketData 포맷
-                    data = MarketData.model_validate_json(raw_data)
+                    # ticker.* 채널은 모두 MarketData 포맷 (JSON 또는 Binary)
+                    data = MarketData.model_validate(decode_message(raw_data))
                     await self.process_ticker(data)
                     
                 except Exception as e:
@@ -300,16 +311,33 @@ class Sentinel:
                     
             elif msg_type == 'message':  # 직접 구독 메시지
                 try:
-                    channel = message['channel']
+                    channel = message['channel'].decode()
                     raw_data = message['data']
                     
                     if channel == "market_orderbook":
-                        data = json.loads(raw_data)
+                        data = decode_message(raw_data)
                         await self.process_orderbook(data)
                         
                 except Exception as e:
                     logger.error(f"Error processing {channel} in Sentinel: {e}")
 
+    async def consume_streams(self):
+        """Streams 모드 ticker 수신 루프 (배치 처리 후 일괄 XACK)"""
+        while self.is_running:
+            try:
+                entries = await self.stream_consumer.read()
+                for channel, _, raw_data in entries:
+                    if raw_data is None:
+                        continue
+                    try:
+                        await self.process_ticker(MarketData.model_validate(decode_message(raw_data)))
+                    except Exception as e:
+                        logger.error(f"Error processing stream message {channel} in Sentinel: {e}")
+                await self.stream_consumer.ack((channel, entry_id) for channel, entry_id, _ in entries)
+            except Exception as e:
+                logger.error(f"Stream Read Error in Sentinel: {e}")
+                await asyncio.sleep(1)
+
 if __name__ == "__main__":
     sentinel = Sentinel()
     asyncio.run(sentinel.run())
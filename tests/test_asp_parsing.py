@@ -1,6 +1,8 @@
 import pytest
 from src.data_ingestion.price.asp_collector import KISASPCollector
 from src.data_ingestion.price.asp_collector_us import KISASPCollectorUS
+from src.data_ingestion.price.kr.asp_collector import KRASPCollector
+from src.data_ingestion.price.us.asp_collector import USASPCollector
 
 def test_kr_orderbook_parsing():
     collector = KISASPCollector()
@@ -45,3 +47,48 @@ def test_us_orderbook_parsing():
     assert parsed.bids[0].vol == 150
     assert len(parsed.asks) == 5
     assert len(parsed.bids) == 5
+
+
+def test_kr_orderbook_full_depth():
+    """H0STASP0 54개 필드 -> 9레벨 + 총잔량 파싱"""
+    fields = ["005930", "093000", "0"]
+    fields += [str(75100 + 100 * i) for i in range(9)]   # ASKP1~9
+    fields += [str(75000 - 100 * i) for i in range(9)]   # BIDP1~9
+    fields += [str(1000 + i) for i in range(9)]          # ASKP_RSQN1~9
+    fields += [str(2000 + i) for i in range(9)]          # BIDP_RSQN1~9
+    fields += ["9036", "18036"] + ["0"] * 13             # TOTAL_ASKP_RSQN, TOTAL_BIDP_RSQN, ...
+
+    parsed = KRASPCollector().parse_tick("^".join(fields))
+
+    assert len(parsed.asks) == len(parsed.bids) == 9
+    assert parsed.asks[8].price == 75900 and parsed.asks[8].vol == 1008
+    assert parsed.bids[8].price == 74200 and parsed.bids[8].vol == 2008
+    assert (parsed.total_ask_vol, parsed.total_bid_vol) == (9036, 18036)
+
+
+def test_us_orderbook_depth_follows_received_fields():
+    fields = ["NAS", "DNASNVDA"] + ["0"] * 8
+    for i in range(3):
+        fields += [str(200.5 + i), "100", str(200.4 - i), "150"]
+
+    parsed = USASPCollector().parse_tick("^".join(fields))
+
+    assert len(parsed.asks) == 3
+    assert parsed.bids[2].price == 198.4
+
+
+def test_us_short_book_is_archived_with_null_levels():
+    """3레벨 US 호가도 market_orderbook(5레벨 컬럼) 레코드로 변환 (없는 레벨은 NULL)"""
+    from src.data_ingestion.archiver.timescale_archiver import TimescaleArchiver
+
+    fields = ["NAS", "DNASNVDA"] + ["0"] * 8
+    for i in range(3):
+        fields += [str(200.5 + i), "100", str(200.4 - i), "150"]
+    book = USASPCollector().parse_tick("^".join(fields)).model_dump(mode="json")
+
+    row = TimescaleArchiver.orderbook_row(book)
+
+    assert len(row) == 22 and row[1] == "DNASNVDA"
+    assert row[2:8] == (200.5, 100.0, 201.5, 100.0, 202.5, 100.0)
+    assert row[8:12] == (None, None, None, None)  # ask 4~5
+    assert row[12] == 200.4 and row[18:22] == (None, None, None, None)  # bid 4~5
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from src.api.broadcaster import Broadcaster
+from src.api.main import app
+
+API_AUTH_SECRET = os.getenv("API_AUTH_SECRET", "super-secret-key")
+
+
+class _FakeWebSocket:
+    """send_text 지연을 조절할 수 있는 WebSocket 대역 (blocked: 전송 멈춤)"""
+
+    def __init__(self, blocked=False):
+        self.sent = []
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+
+def _tick(symbol, price):
+    return json.dumps({"type": "ticker", "symbol": symbol, "price": price})
+
+
+@pytest.mark.asyncio
+async def test_slow_client_is_conflated_without_delaying_others():
+    broadcaster = Broadcaster(max_queue=10)
+    fast, slow = _FakeWebSocket(), _FakeWebSocket(blocked=True)
+    await broadcaster.connect(fast)
+    slow_session = await broadcaster.connect(slow)
+
+    for i in range(100):
+        broadcaster.publish("ticker.kr", "005930", _tick("005930", 100.0 + i))
+        broadcaster.publish("ticker.kr", "000660", _tick("000660", 200.0 + i))
+        await asyncio.sleep(0)
+
+    await asyncio.sleep(0.01)
+    assert fast.sent[-1]["price"] in (199.0, 299.0)
+    assert len(fast.sent) > 100
+    assert len(slow_session.pending) == 2  # 종목별 최신 값만 유지
+
+    slow.gate.set()
+    await asyncio.sleep(0.01)
+    assert sorted(m["price"] for m in slow.sent[-2:]) == [199.0, 299.0]
+    assert slow_session.conflated >= 196
+
+
+@pytest.mark.asyncio
+async def test_symbol_and_channel_subscription_filters():
+    broadcaster = Broadcaster()
+    ws = _FakeWebSocket()
+    session = await broadcaster.connect(ws)
+    await broadcaster.handle_command(session, json.dumps(
+        {"action": "subscribe", "channels": ["ticker"], "symbols": ["005930"]}))
+
+    broadcaster.publish("ticker.kr", "000660", _tick("000660", 1.0))
+    broadcaster.publish("orderbook.kr", "005930", json.dumps({"type": "orderbook", "symbol": "005930"}))
+    broadcaster.publish("ticker.kr", "005930", _tick("005930", 2.0))
+    await asyncio.sleep(0.01)
+
+    assert ws.sent[0] == {"type": "subscription", "channels": ["ticker"], "symbols": ["005930"],
+                          "tick_hz": session.tick_hz}
+    assert ws.sent[1:] == [{"type": "ticker", "symbol": "005930", "price": 2.0}]
+
+    await broadcaster.handle_command(session, '{"action": "bogus"}')
+    await asyncio.sleep(0.01)
+    assert ws.sent[-1]["type"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_orderbook_is_opt_in():
+    """subscribe 명령 전에는 DEFAULT_CHANNELS만 수신, orderbook은 명시적 구독 시에만 전달"""
+    broadcaster = Broadcaster()
+    ws = _FakeWebSocket()
+    session = await broadcaster.connect(ws, tick_hz=0)
+    book = json.dumps({"type": "orderbook", "symbol": "005930"})
+
+    broadcaster.publish("orderbook.kr", "005930", book)
+    broadcaster.publish("market_orderbook", "005930", book)
+    broadcaster.publish("ticker.kr", "005930", _tick("005930", 1.0))
+    await asyncio.sleep(0.01)
+    assert [m["type"] for m in ws.sent] == ["ticker"]
+
+    await broadcaster.handle_command(session, json.dumps({"action": "subscribe", "channels": ["orderbook"]}))
+    broadcaster.publish("orderbook.kr", "005930", book)
+    await asyncio.sleep(0.01)
+    assert ws.sent[-1] == {"type": "orderbook", "symbol": "005930"}
+
+    await broadcaster.handle_command(session, '{"action": "reset"}')
+    await asyncio.sleep(0.01)
+    assert "orderbook" not in ws.sent[-1]["channels"]
+
+
+def test_ws_endpoint_acknowledges_subscription():
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws?tick_hz=0") as ws:
+            ws.send_text(json.dumps({"action": "subscribe", "symbols": ["005930"]}))
+            assert ws.receive_json() == {"type": "subscription", "channels": ["candles", "news", "system", "ticker"],
+                                         "symbols": ["005930"], "tick_hz": 0.0}
+            ws.send_text(json.dumps({"action": "rate", "tick_hz": 2}))
+            assert ws.receive_json()["tick_hz"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_ticks_are_coalesced_into_frames_unless_raw_requested():
+    broadcaster = Broadcaster()
+    ui, analytics = _FakeWebSocket(), _FakeWebSocket()
+    await broadcaster.connect(ui, tick_hz=20)
+    await broadcaster.connect(analytics, tick_hz=0)
+
+    for i in range(30):
+        data = {"type": "ticker", "symbol": "005930", "price": 100.0 + i, "change": 0.1,
+                "volume": 2.0, "timestamp": f"2026-01-02T09:00:{i:02d}"}
+        broadcaster.publish("ticker.kr", "005930", json.dumps(data), data)
+    await asyncio.sleep(0.12)
+
+    assert len(analytics.sent) == 30
+    assert len(ui.sent) == 1
+    assert ui.sent[0]["price"] == 129.0
+    assert ui.sent[0]["volume"] == 60.0  # 프레임 구간 누적 거래량
+    assert ui.sent[0]["ticks"] == 30
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_ingestion.candles.candle_builder import CandleBuilder, CandleBuilderService
+
+BASE = datetime(2026, 3, 2, 0, 0, tzinfo=timezone.utc)
+
+
+def _tick(symbol, seconds, price, volume=1.0):
+    return {"type": "ticker", "symbol": symbol, "price": price, "volume": volume, "change": 0.0,
+            "timestamp": (BASE + timedelta(seconds=seconds)).isoformat()}
+
+
+def test_closed_bars_match_pandas_resample():
+    rng = np.random.default_rng(11)
+    seconds = np.sort(rng.uniform(0, 1800, 400))
+    prices = 100 + rng.normal(0, 0.5, 400).cumsum()
+    volumes = rng.integers(1, 50, 400).astype(float)
+
+    builder = CandleBuilder(["1m", "5m"])
+    closed = []
+    for s, p, v in zip(seconds, prices, volumes):
+        closed.extend(builder.add_tick(_tick("005930", s, p, v), "kr"))
+    closed.extend(builder.close_due(BASE.timestamp() + 3600))
+
+    index = BASE + pd.to_timedelta(seconds, unit="s")
+    for interval, rule in (("1m", "1min"), ("5m", "5min")):
+        bars = [c for _, c in closed if c["interval"] == interval]
+        expected = pd.Series(prices, index=index).resample(rule).ohlc().dropna()
+        expected_volume = pd.Series(volumes, index=index).resample(rule).sum()[expected.index]
+        assert [datetime.fromisoformat(b["timestamp"]) for b in bars] == list(expected.index)
+        for column in ("open", "high", "low", "close"):
+            np.testing.assert_allclose([b[column] for b in bars], expected[column].to_numpy())
+        np.testing.assert_allclose([b["volume"] for b in bars], expected_volume.to_numpy())
+    assert all(market == "kr" for market, _ in closed)
+
+
+def test_timer_close_and_late_ticks_are_dropped():
+    builder = CandleBuilder(["1m"])
+    builder.add_tick(_tick("AAPL", 10, 100.0), "us")
+    builder.add_tick(_tick("AAPL", 50, 101.0), "us")
+
+    assert builder.close_due(BASE.timestamp() + 61) == []  # grace 이전
+    closed = builder.close_due(BASE.timestamp() + 63)
+    assert [(c["close"], c["ticks"]) for _, c in closed] == [(101.0, 2)]
+
+    assert builder.add_tick(_tick("AAPL", 55, 99.0), "us") == []  # 이미 마감한 봉 -> 버림
+    assert builder.late_ticks() == 1
+    builder.add_tick(_tick("AAPL", 70, 102.0), "us")
+    assert builder.close_due(BASE.timestamp() + 200)[0][1]["open"] == 102.0
+
+
+class _Pipe:
+    def __init__(self, sink):
+        self.sink = sink
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def publish(self, channel, message):
+        self.sink.append((channel, message))
+
+    async def execute(self):
+        return []
+
+
+class _Redis:
+    def __init__(self):
+        self.published = []
+
+    def pipeline(self, transaction=False):
+        return _Pipe(self.published)
+
+
+class _Conn:
+    def __init__(self, fail):
+        self.fail = fail
+        self.copied = []
+
+    async def copy_records_to_table(self, table, records, columns):
+        if self.fail:
+            raise RuntimeError("db down")
+        self.copied.append((table, list(records)))
+
+
+class _Pool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        conn = self.conn
+
+        class _Ctx:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+
+@pytest.mark.asyncio
+async def test_service_publishes_candles_and_retries_copy():
+    service = CandleBuilderService(CandleBuilder(["1m"]))
+    service.redis = _Redis()
+    conn = _Conn(fail=True)
+    service.db_pool = _Pool(conn)
+
+    await service.emit(service.builder.add_tick(_tick("005930", 1, 100.0), "kr"))
+    await service.emit(service.builder.add_tick(_tick("005930", 61, 101.0), "kr"))
+
+    assert [channel for channel, _ in service.redis.published] == ["candles.kr"]
+    assert '"interval":"1m"' in service.redis.published[0][1]
+    assert await service.flush() is False and len(service.pending_rows) == 1  # 실패 시 대기열 유지
+
+    conn.fail = False
+    assert await service.flush() is True
+    table, rows = conn.copied[0]
+    assert table == "market_candles" and rows[0][1:3] == ("005930", "1m") and rows[0][0] == BASE
+    assert service.rows_written == 1
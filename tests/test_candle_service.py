@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.resample import resample_ticks
+from src.api.candle_service import CANDLE_LOOKBACK_FACTOR, CandleService
+from src.api.state_cache import LatestStateCache
+
+BASE = datetime(2026, 3, 2, 0, 0, tzinfo=timezone.utc)
+
+
+def test_resample_ticks_matches_pandas_ohlc():
+    rng = np.random.default_rng(3)
+    times = BASE.timestamp() + np.sort(rng.uniform(0, 3600, 500))
+    prices = 100 + rng.normal(0, 1, 500).cumsum()
+    volumes = rng.integers(1, 100, 500).astype(float)
+
+    bars = resample_ticks(times, prices, volumes, 300)
+
+    index = pd.to_datetime(times, unit="s", utc=True)
+    expected = pd.Series(prices, index=index).resample("5min").ohlc().dropna()
+    expected_volume = pd.Series(volumes, index=index).resample("5min").sum()[expected.index]
+    assert list(pd.to_datetime(bars["time"], unit="s", utc=True)) == list(expected.index)
+    for column in ("open", "high", "low", "close"):
+        np.testing.assert_allclose(bars[column], expected[column].to_numpy())
+    np.testing.assert_allclose(bars["volume"], expected_volume.to_numpy())
+
+
+class _CandleConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def fetchval(self, query, *args):
+        return max((r["time"] for r in self.rows), default=None)  # 마지막 저장 시각
+
+    async def fetch(self, query, *args):
+        self.queries.append((query, args))
+        rows = self.rows
+        if "time_bucket" in query:
+            rows = [r for r in rows if r["time"] >= args[2]]  # time >= start
+        return list(reversed(rows))  # ORDER BY time DESC
+
+
+def _bar(minutes, close):
+    return {"time": BASE + timedelta(minutes=minutes), "open": close, "high": close, "low": close,
+            "close": close, "volume": 10.0}
+
+
+def _tick(minutes, price, volume=1.0):
+    return {"type": "ticker", "symbol": "005930", "price": price, "volume": volume, "change": 0.0,
+            "timestamp": (BASE + timedelta(minutes=minutes)).isoformat()}
+
+
+@pytest.mark.asyncio
+async def test_cached_series_patched_by_ticks_and_trimmed_to_limit():
+    conn = _CandleConn([_bar(0, 100.0), _bar(5, 101.0)])
+    service = CandleService()
+
+    rows = await service.get(conn, "005930", "5m", limit=2)
+    assert [r["close"] for r in rows] == [100.0, 101.0]
+    assert "time_bucket" in conn.queries[0][0]
+
+    service.on_tick(_tick(7, 103.0, 2.0))  # 진행 중인 5분봉 갱신
+    service.on_tick(_tick(11, 99.0))  # 새 캔들 -> 가장 오래된 캔들 제거
+    rows = await service.get(conn, "005930", "5m", limit=2)
+
+    assert len(conn.queries) == 1  # 캐시 응답
+    assert rows[0]["close"] == 103.0 and rows[0]["high"] == 103.0 and rows[0]["volume"] == 12.0
+    assert rows[1]["time"] == BASE + timedelta(minutes=10) and rows[1]["open"] == 99.0
+
+
+@pytest.mark.asyncio
+async def test_memory_ticks_replace_fully_covered_buckets():
+    state = LatestStateCache()
+    for minutes, price in ((6, 200.0), (10, 201.0), (12, 205.0), (16, 202.0)):
+        state.update(_tick(minutes, price))
+    conn = _CandleConn([_bar(0, 100.0), _bar(5, 101.0), _bar(10, 150.0)])
+    service = CandleService(state)
+
+    rows = await service.get(conn, "005930", "5m", limit=10)
+
+    # 메모리 첫 틱(6분) 이후 시작하는 10분/15분 캔들은 메모리 틱으로 생성, 5분 캔들은 DB 값 유지
+    assert [r["close"] for r in rows] == [100.0, 101.0, 205.0, 202.0]
+    assert rows[2]["high"] == 205.0 and rows[2]["volume"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_daily_uses_stored_candles_and_lru_evicts():
+    conn = _CandleConn([_bar(0, 100.0)])
+    service = CandleService(capacity=2)
+
+    await service.get(conn, "A", "1d")
+    await service.get(conn, "B", "1d")
+    await service.get(conn, "C", "1d")
+
+    assert "time_bucket" not in conn.queries[0][0]
+    assert [key[0] for key in service.entries] == ["B", "C"]
+    assert "A" not in service.by_symbol
+    service.on_tick({**_tick(1, 1.0), "symbol": "B"})  # 일봉 항목은 틱으로 갱신하지 않음
+    assert service.stats()["patched"] == 0
+
+
+@pytest.mark.asyncio
+async def test_lookback_anchored_to_last_stored_candle_when_market_closed():
+    # 마지막 캔들이 3일 전 (주말/장 마감) -> 현재 시각 기준 창이면 빈 결과
+    closed = datetime.now(timezone.utc).replace(second=0, microsecond=0) - timedelta(days=3)
+    conn = _CandleConn([{**_bar(0, 100.0), "time": closed - timedelta(minutes=1)},
+                        {**_bar(0, 101.0), "time": closed}])
+
+    rows = await CandleService().get(conn, "005930", "1m", limit=200)
+
+    assert [r["close"] for r in rows] == [100.0, 101.0]
+    assert conn.queries[0][1][2] == closed - timedelta(minutes=200 * CANDLE_LOOKBACK_FACTOR)
+
+    assert await CandleService().get(_CandleConn([]), "005930", "1m") == []  # 저장 데이터 없음
@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.correlation import CorrelationEngine
+
+SYMBOLS = ["005930", "000660", "DNASNVDA", "DNASAAPL"]
+
+
+def _rows(n_days, seed=7, start=None, skip=None):
+    """(time, symbol, close) 시간순 레코드, skip: {(day, symbol)} 누락 캔들 (휴장)"""
+    rng = np.random.default_rng(seed)
+    start = start or datetime(2026, 1, 1)
+    base = rng.normal(0, 0.01, n_days)
+    prices = {s: 100.0 + i for i, s in enumerate(SYMBOLS)}
+    rows = []
+    for d in range(n_days):
+        for i, symbol in enumerate(SYMBOLS):
+            prices[symbol] *= 1 + base[d] * (1 - 0.3 * i) + rng.normal(0, 0.005)
+            if skip and (d, symbol) in skip:
+                continue
+            rows.append({"time": start + timedelta(days=d), "symbol": symbol, "close": prices[symbol]})
+    return rows
+
+
+def _pandas_corr(rows, days):
+    """기존 엔드포인트의 pandas 계산"""
+    df = pd.DataFrame(rows, columns=["time", "symbol", "close"])
+    pivot_df = df.pivot_table(index="time", columns="symbol", values="close").tail(days)
+    pivot_df = pivot_df.ffill().dropna(axis=1)
+    return pivot_df.pct_change().dropna().corr()
+
+
+def _assert_matches(result, expected):
+    assert [n["id"] for n in result["nodes"]] == list(expected.columns)
+    for record in result["matrix"]:
+        for other in expected.columns:
+            assert record[other] == pytest.approx(expected.loc[record["symbol"], other], abs=1e-9)
+    expected_links = {
+        (a, b): round(expected.loc[a, b], 2)
+        for i, a in enumerate(expected.columns) for j, b in enumerate(expected.columns)
+        if i < j and abs(expected.loc[a, b]) > 0.5
+    }
+    assert {(l["source"], l["target"]): l["value"] for l in result["links"]} == expected_links
+
+
+def test_matches_pandas_with_holidays():
+    rows = _rows(40, skip={(25, "DNASNVDA"), (26, "DNASNVDA"), (31, "005930")})
+    engine = CorrelationEngine()
+    engine.ingest(rows)
+
+    for days in (5, 10, 30):
+        _assert_matches(engine.result(days), _pandas_corr(rows, days))
+
+
+def test_incremental_days_slide_window():
+    rows = _rows(60)
+    engine = CorrelationEngine()
+    engine.ingest([r for r in rows if r["time"] < datetime(2026, 1, 21)])
+    engine.result(10)  # 창 초기화 후 이후 일자는 누적합 갱신으로만 반영
+    version = engine.version
+
+    engine.ingest([r for r in rows if r["time"] >= datetime(2026, 1, 21)])
+    assert engine.version == version + 40
+    _assert_matches(engine.result(10), _pandas_corr(rows, 10))
+
+
+def test_result_cached_until_new_day():
+    rows = _rows(20)
+    engine = CorrelationEngine()
+    engine.ingest(rows[:-len(SYMBOLS)])
+
+    first = engine.result(10)
+    assert engine.result(10) is first
+    engine.ingest(rows[-len(SYMBOLS):])
+    assert engine.result(10) is not first
+
+
+class _CandleConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def fetch(self, query, *args):
+        self.queries.append(args)
+        if args:
+            return [r for r in self.rows if r["time"] >= args[0]]
+        return list(self.rows)
+
+
+@pytest.mark.asyncio
+async def test_refresh_fetches_only_new_days_and_rebuilds_on_late_candles():
+    rows = _rows(30)
+    conn = _CandleConn(rows[:-2 * len(SYMBOLS)])
+    engine = CorrelationEngine()
+    await engine.refresh(conn, force=True)  # 최초: 전체 적재
+    assert conn.queries == [()]
+
+    conn.rows = rows
+    await engine.refresh(conn, force=True)  # 마지막 일자 이후만 조회
+    assert len(conn.queries[-1]) == 1
+    _assert_matches(engine.result(10), _pandas_corr(rows, 10))
+
+    # 이미 처리한 마지막 일자에 캔들이 추가되면 전체 재구성
+    late = rows[:-1]
+    engine_late = CorrelationEngine()
+    conn_late = _CandleConn(late)
+    await engine_late.refresh(conn_late, force=True)
+    conn_late.rows = rows
+    await engine_late.refresh(conn_late, force=True)
+    assert conn_late.queries[-1] == ()
+    _assert_matches(engine_late.result(10), _pandas_corr(rows, 10))
+
+
+def test_days_longer_than_loaded_history_uses_all_returns():
+    rows = _rows(41)  # 60일 재구성 시 적재되는 거래일 수 수준
+    engine = CorrelationEngine()
+    engine.ingest(rows)
+
+    assert len(engine.history) == 40
+    for days in (41, 42, 60):
+        result = engine.result(days)
+        assert len(result["nodes"]) == len(SYMBOLS)
+        _assert_matches(result, _pandas_corr(rows, days))
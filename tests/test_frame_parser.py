@@ -0,0 +1,64 @@
+import pytest
+import json
+from src.core.schema import MarketData
+from src.data_ingestion.price.kr.real_collector import KRRealCollector
+from src.data_ingestion.price.us.real_collector import USRealCollector
+
+KR_BODY = "005930^093001^75000^2^500^0.67^74900^74500^75200^74400^75100^75000^10^1234567"
+US_FIELDS = ["RS", "DNASAAPL", "130122", "0", "0", "0", "0", "0", "0", "0", "0", "200.50", "2.50", "1500", "0"]
+
+
+def _assert_same_tick(fast, slow):
+    assert fast is not None and slow is not None
+    fast_json = json.loads(fast.model_dump_json())
+    slow_json = json.loads(slow.model_dump_json())
+    # timestamp는 datetime.now() 기준이므로 제외하고 비교
+    fast_json.pop("timestamp")
+    slow_json.pop("timestamp")
+    assert fast_json == slow_json
+
+
+def test_kr_parse_fast_matches_parse_tick():
+    """KR Fast-Path 결과가 기존 parse_tick(pydantic) 결과와 동일한지 검증"""
+    collector = KRRealCollector()
+    _assert_same_tick(collector.parse_fast(KR_BODY), collector.parse_tick(KR_BODY))
+
+
+def test_us_parse_fast_matches_parse_tick():
+    """US Fast-Path 결과(등락률 변환 포함)가 기존 parse_tick 결과와 동일한지 검증"""
+    collector = USRealCollector()
+    body = "^".join(US_FIELDS)
+    fast = collector.parse_fast(body)
+    _assert_same_tick(fast, collector.parse_tick(body))
+    assert fast.symbol == "DNASAAPL"
+    assert fast.change == 1.26
+
+
+def test_parse_fast_json_is_valid_market_data():
+    """Fast-Path JSON을 소비자(Sentinel 등)가 MarketData로 검증 가능한지 확인"""
+    record = KRRealCollector().parse_fast(KR_BODY)
+    data = MarketData.model_validate_json(record.model_dump_json())
+    assert data.symbol == "005930"
+    assert data.price == 75000.0
+    assert data.timestamp == record.timestamp
+
+
+@pytest.mark.parametrize("body", [
+    "005930^093001",                  # 필드 부족
+    "005930^093001^abc^2^500^0.67^0^1",  # 숫자 변환 실패
+    "005930^093001^0^2^500^0.67^0^1",    # price <= 0
+    "005930^093001^nan^2^500^0.67^0^1",  # 비유한값
+])
+def test_parse_fast_rejects_invalid_body(body):
+    """잘못된 body는 None 반환 (기존 parse_tick 정책과 동일)"""
+    assert KRRealCollector().parse_fast(body) is None
+
+
+def test_split_records_uses_record_count():
+    """다건 프레임 body가 레코드 수 기준으로 균등 분리되는지 검증"""
+    from src.data_ingestion.price.common.frame_parser import split_records, parse_record_count
+    body = "A^1^2^B^3^4^C^5^6"
+    assert parse_record_count("003") == 3
+    assert parse_record_count("abc") == 1
+    assert split_records(body, 3) == ["A^1^2", "B^3^4", "C^5^6"]
+    assert split_records(body, 1) == [body]
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+import src.analysis.indicators as ind
+from src.analysis.incremental import INDICATOR_COLUMNS, IndicatorSeries, IndicatorState, batch_indicators
+
+
+def _expected(closes) -> pd.DataFrame:
+    df = pd.DataFrame({"close": closes})
+    out = pd.DataFrame(index=df.index)
+    out["rsi"] = ind.calculate_rsi(df)
+    out["macd"], out["macd_signal"], out["macd_hist"] = ind.calculate_macd(df)
+    out["bb_upper"], out["bb_mid"], out["bb_lower"] = ind.calculate_bollinger_bands(df)
+    return out
+
+
+def _prices(seed, n=300, base=70000.0):
+    rng = np.random.default_rng(seed)
+    return base + rng.normal(0, 50, n).cumsum()
+
+
+def test_streaming_state_matches_pandas():
+    closes = _prices(1)
+    closes[40:45] = closes[39]  # 보합 구간 (상승/하락폭 0)
+    state = IndicatorState()
+
+    rows = [state.update(c) for c in closes]
+
+    expected = _expected(closes)
+    for column in INDICATOR_COLUMNS:
+        np.testing.assert_allclose([r[column] for r in rows], expected[column].to_numpy(), rtol=1e-9)
+
+
+def test_preview_does_not_mutate_state():
+    closes = _prices(2, n=60)
+    state = IndicatorState()
+    for c in closes[:-1]:
+        state.update(c)
+
+    preview = state.preview(closes[-1])
+    assert state.preview(closes[-1]) == preview
+    assert state.update(closes[-1]) == preview
+
+
+def test_batch_matches_pandas_per_symbol():
+    closes = np.column_stack([_prices(3), _prices(4, base=150.0), _prices(5, base=10.0)])
+    closes[:30, 2] = np.nan  # 상장 전 구간
+
+    result = batch_indicators(closes)
+
+    for j in range(closes.shape[1]):
+        expected = _expected(closes[:, j])
+        for column in INDICATOR_COLUMNS:
+            np.testing.assert_allclose(result[column][:, j], expected[column].to_numpy(), rtol=1e-9)
+
+
+def test_series_only_updates_new_closed_bars():
+    closes = _prices(6, n=80)
+    times = list(range(80))
+    series = IndicatorSeries()
+
+    first = series.update(times[:50], closes[:50])
+    assert series.last_time == 48  # 마지막 봉은 진행 중 (preview)
+    second = series.update(times[10:80], closes[10:80])
+
+    expected = _expected(closes)
+    np.testing.assert_allclose(first["rsi"], expected["rsi"].to_numpy()[:50], rtol=1e-9)
+    np.testing.assert_allclose(second["macd"], expected["macd"].to_numpy()[10:80], rtol=1e-9)
+    assert min(series.values) == 10  # 조회 구간 밖 봉 제거
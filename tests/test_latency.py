@@ -0,0 +1,56 @@
+import json
+from datetime import datetime
+from src.core.latency import LatencyHistogram, LatencyRecorder
+from src.core.schema import MarketData
+from src.core.wire_format import attach_latency, decode_message, encode_binary, encode_json, to_json_text
+
+
+def test_histogram_percentiles_within_bucket_error():
+    """로그-선형 버킷 근사치가 정확한 분위수와 상대 오차 2% 이내인지 검증"""
+    histogram = LatencyHistogram()
+    values = list(range(1, 100_001))
+    for v in values:
+        histogram.record(v)
+
+    for q, exact in [(50.0, 50_000), (99.0, 99_000), (99.9, 99_900)]:
+        assert abs(histogram.percentile(q) - exact) / exact < 0.02
+    summary = histogram.summary()
+    assert summary["count"] == 100_000
+    assert summary["max"] == 100_000
+
+
+def test_recorder_groups_by_stage_and_market():
+    recorder = LatencyRecorder("collector")
+    recorder.record("parse", "KR", 5_000)     # 5us
+    recorder.record("parse", "US", 80_000)    # 80us
+    snapshot = recorder.snapshot(reset=True)
+    assert snapshot[("parse", "KR")]["p50"] == 5
+    assert snapshot[("parse", "US")]["p99"] == 80
+    assert recorder.snapshot() == {}
+
+
+def test_attach_latency_roundtrip_json_and_binary():
+    """지연 타임스탬프가 JSON/Binary 양쪽에서 'lat' 필드로 복원되고 MarketData 검증에 영향이 없는지 확인"""
+    tick = MarketData(symbol="005930", price=75000.0, change=0.5, volume=10.0, timestamp=datetime.now())
+    stamps = (1_000, 2_000, 3_000)
+
+    for raw in (attach_latency(encode_json(tick), stamps), attach_latency(encode_binary(tick), stamps)):
+        data = decode_message(raw)
+        assert data["lat"] == list(stamps)
+        assert MarketData.model_validate(data).symbol == "005930"
+
+    assert "lat" not in json.loads(encode_json(tick))
+    assert "lat" not in decode_message(encode_binary(tick))
+
+
+def test_client_payload_strips_latency_stamps():
+    """외부 클라이언트용 JSON에는 내부 계측 'lat' 필드가 남지 않아야 함"""
+    tick = MarketData(symbol="005930", price=75000.0, change=0.5, volume=10.0, timestamp=datetime.now())
+    stamps = (1_000, 2_000, 3_000)
+
+    for encoded in (encode_json(tick), encode_binary(tick)):
+        text = to_json_text(attach_latency(encoded, stamps))
+        data = json.loads(text)
+        assert "lat" not in data
+        assert data["symbol"] == "005930"
+        assert data == json.loads(to_json_text(encoded))
@@ -0,0 +1,71 @@
+import json
+import random
+from datetime import datetime
+
+import pytest
+from src.core.orderbook_delta import OrderbookDeltaEncoder, OrderbookRebuilder
+from src.core.schema import OrderbookData, OrderbookUnit
+from src.core.wire_format import decode_message, encode_binary, encode_json
+
+
+def _books(n, depth=9, seed=7):
+    """1~2개 레벨만 바뀌는 연속 호가 스트림"""
+    rng = random.Random(seed)
+    asks = [[75100.0 + 100 * i, 1000.0 + i] for i in range(depth)]
+    bids = [[75000.0 - 100 * i, 2000.0 + i] for i in range(depth)]
+    for _ in range(n):
+        for _ in range(rng.randint(1, 2)):
+            side = asks if rng.random() < 0.5 else bids
+            side[rng.randrange(depth)][1] = float(rng.randint(1, 5000))
+        yield OrderbookData(
+            symbol="005930", timestamp=datetime.now(),
+            asks=[OrderbookUnit(price=p, vol=v) for p, v in asks],
+            bids=[OrderbookUnit(price=p, vol=v) for p, v in bids],
+            total_ask_vol=sum(v for _, v in asks), total_bid_vol=sum(v for _, v in bids),
+        )
+
+
+@pytest.mark.parametrize("encode", [encode_json, encode_binary])
+def test_rebuilder_reproduces_every_book(encode):
+    encoder = OrderbookDeltaEncoder(snapshot_interval=3600)
+    rebuilder = OrderbookRebuilder()
+    full_bytes = delta_bytes = 0
+
+    for book in _books(200):
+        delta = encoder.encode(book)
+        raw = encode(delta)
+        full_bytes += len(encode(book))
+        delta_bytes += len(raw)
+
+        rebuilt = rebuilder.apply(decode_message(raw))
+        expected = json.loads(book.model_dump_json())
+        assert {k: rebuilt[k] for k in ("asks", "bids", "total_ask_vol", "total_bid_vol")} == \
+               {k: expected[k] for k in ("asks", "bids", "total_ask_vol", "total_bid_vol")}
+
+    assert encoder.stats()["snapshots"] == 1
+    assert full_bytes / delta_bytes > 3
+
+
+def test_unchanged_book_is_suppressed():
+    encoder = OrderbookDeltaEncoder(snapshot_interval=3600)
+    book = next(_books(1))
+    assert encoder.encode(book).snapshot
+    assert encoder.encode(book.model_copy(update={"timestamp": datetime.now()})) is None
+    assert encoder.stats()["suppressed"] == 1
+
+
+def test_gap_waits_for_next_snapshot():
+    encoder = OrderbookDeltaEncoder(snapshot_interval=3600)
+    rebuilder = OrderbookRebuilder()
+    books = list(_books(5))
+    messages = [json.loads(encode_json(encoder.encode(book))) for book in books[:4]]
+
+    assert rebuilder.apply(messages[0]) is not None
+    assert rebuilder.apply(messages[2]) is None  # seq 2 누락
+    assert rebuilder.apply(messages[3]) is None
+    assert rebuilder.gaps == 1
+
+    encoder.snapshot_interval = 0  # 다음 메시지는 snapshot
+    resync = json.loads(encode_json(encoder.encode(books[4])))
+    assert resync["snapshot"]
+    assert rebuilder.apply(resync)["asks"] == json.loads(books[4].model_dump_json())["asks"]
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+import src.analysis.indicators as ind
+from src.analysis.incremental import INDICATOR_COLUMNS
+from src.analysis.panel import latest_indicators, panel_indicators
+
+
+def _loop(series: pd.Series) -> pd.DataFrame:
+    """종목별 기존 방식 (유효 값만으로 계산 후 시간축 복원)"""
+    df = series.dropna().to_frame("close")
+    out = pd.DataFrame(index=df.index)
+    out["rsi"] = ind.calculate_rsi(df)
+    out["macd"], out["macd_signal"], out["macd_hist"] = ind.calculate_macd(df)
+    out["bb_upper"], out["bb_mid"], out["bb_lower"] = ind.calculate_bollinger_bands(df)
+    return out.reindex(series.index)
+
+
+def _panel(n_time=200, n_symbols=6, seed=7):
+    rng = np.random.default_rng(seed)
+    values = 100 * np.exp(rng.normal(0, 0.01, (n_time, n_symbols)).cumsum(axis=0))
+    closes = pd.DataFrame(values, index=pd.date_range("2026-01-01", periods=n_time, freq="D"),
+                          columns=[f"S{i}" for i in range(n_symbols)])
+    closes.iloc[:25, 1] = np.nan  # 상장 전
+    closes.iloc[60:75, 2] = np.nan  # 거래정지
+    closes.iloc[rng.choice(n_time, 30, replace=False), 3] = np.nan  # 산발적 결측
+    closes.iloc[190:, 4] = np.nan  # 마지막 구간 정지
+    closes.iloc[:, 5] = np.nan  # 데이터 없음
+    return closes
+
+
+def test_panel_matches_per_symbol_loop_with_gaps():
+    closes = _panel()
+
+    result = panel_indicators(closes)
+
+    for symbol in closes.columns:
+        expected = _loop(closes[symbol])
+        for column in INDICATOR_COLUMNS:
+            assert result[column].index.equals(closes.index)
+            np.testing.assert_allclose(result[column][symbol].to_numpy(), expected[column].to_numpy(),
+                                       rtol=1e-9, err_msg=f"{symbol} {column}")
+
+
+def test_panel_accepts_plain_arrays():
+    closes = _panel().iloc[:, :1].to_numpy()
+
+    result = panel_indicators(closes[:, 0])
+
+    assert result["rsi"].shape == (200, 1)
+    np.testing.assert_allclose(result["bb_mid"][:, 0], _loop(pd.Series(closes[:, 0]))["bb_mid"], rtol=1e-9)
+
+
+def test_latest_indicators_uses_last_valid_row_per_symbol():
+    closes = _panel()
+
+    latest = latest_indicators(closes)
+
+    assert latest.loc["S4", "close"] == closes["S4"].iloc[189]
+    assert latest.loc["S4", "rsi"] == _loop(closes["S4"])["rsi"].iloc[189]
+    assert latest.loc["S0", "macd"] == panel_indicators(closes)["macd"]["S0"].iloc[-1]
+    assert latest.loc["S5"].isna().all()
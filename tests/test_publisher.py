@@ -0,0 +1,109 @@
+import pytest
+import asyncio
+from unittest.mock import MagicMock
+from src.data_ingestion.price.common.publisher import PipelinedPublisher
+
+
+class _RecordingPipeline:
+    """redis.asyncio pipeline 대역 (execute 단위로 배치 기록)"""
+    def __init__(self, batches, delay=0.0):
+        self.batches = batches
+        self.delay = delay
+        self.items = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def publish(self, channel, data):
+        self.items.append((channel, data))
+
+    async def execute(self):
+        await asyncio.sleep(self.delay)
+        self.batches.append(self.items)
+
+
+def _make_redis(batches, delay=0.0):
+    client = MagicMock()
+    client.pipeline.side_effect = lambda transaction=False: _RecordingPipeline(batches, delay)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_publisher_flushes_on_batch_size():
+    """배치 크기 도달 시 데드라인을 기다리지 않고 파이프라인 1회로 발행"""
+    batches = []
+    publisher = PipelinedPublisher(_make_redis(batches), batch_size=3, max_delay_us=10_000_000, max_queue=100)
+    publisher.start()
+
+    for i in range(3):
+        assert publisher.publish("ticker.kr", f"msg{i}")
+    await asyncio.sleep(0.05)
+
+    assert batches == [[("ticker.kr", "msg0"), ("ticker.kr", "msg1"), ("ticker.kr", "msg2")]]
+    await publisher.stop()
+
+
+@pytest.mark.asyncio
+async def test_publisher_flushes_on_deadline():
+    """배치가 덜 차도 데드라인 경과 후 발행"""
+    batches = []
+    publisher = PipelinedPublisher(_make_redis(batches), batch_size=100, max_delay_us=1000, max_queue=100)
+    publisher.start()
+
+    publisher.publish("ticker.us", "only")
+    await asyncio.sleep(0.05)
+
+    assert batches == [[("ticker.us", "only")]]
+    assert publisher.stats()["published"] == 1
+    await publisher.stop()
+
+
+@pytest.mark.asyncio
+async def test_publisher_drops_when_queue_full():
+    """큐 상한 초과 시 적재 거부 + dropped/backpressure 카운터 증가 (수신 루프는 블로킹되지 않음)"""
+    batches = []
+    publisher = PipelinedPublisher(_make_redis(batches), batch_size=10, max_delay_us=1000, max_queue=5)
+
+    results = [publisher.publish("ticker.kr", str(i)) for i in range(8)]
+
+    assert results == [True] * 5 + [False] * 3
+    stats = publisher.stats()
+    assert stats["dropped"] == 3
+    assert stats["backpressure"] == 1  # 80%(4) 이상에서 적재된 1건
+    assert stats["high_water"] == 5
+
+    # 잔여 메시지는 stop 시 플러시
+    publisher.start()
+    await publisher.stop()
+    assert sum(len(b) for b in batches) == 5
+
+
+@pytest.mark.asyncio
+async def test_dual_manager_flushes_publisher_on_shutdown(monkeypatch, tmp_path):
+    from src.data_ingestion.price.common.websocket_dual import DualWebSocketManager
+
+    monkeypatch.chdir(tmp_path)
+    manager = DualWebSocketManager([], "redis://unused")
+    batches = []
+
+    async def connect_redis():
+        manager.publisher = PipelinedPublisher(_make_redis(batches), max_delay_us=10_000_000)
+        manager.publisher.start()
+
+    async def maintain_connection(socket_type):
+        manager.publisher.publish(f"ticker.{socket_type}", "queued")
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(manager, "connect_redis", connect_redis)
+    monkeypatch.setattr(manager, "_maintain_connection", maintain_connection)
+    task = asyncio.create_task(manager.run("ws://unused", "key"))
+    await asyncio.sleep(0.05)
+    assert batches == []  # 데드라인(10초) 전이라 큐에 대기 중
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert sorted(channel for batch in batches for channel, _ in batch) == ["ticker.orderbook", "ticker.tick"]
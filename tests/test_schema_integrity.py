@@ -55,3 +55,37 @@ def test_news_alert_schema_integrity():
     obj = NewsAlert(**valid_news)
     assert obj.type == MessageType.ALERT
     assert len(obj.keywords) == 2
+
+def test_wire_format_binary_roundtrip():
+    """
+    Binary wire format 인코딩/디코딩 결과가 JSON(model_dump_json) 경로와 동일한지 검증
+    """
+    import json
+    from src.core.schema import OrderbookData, OrderbookUnit
+    from src.core.wire_format import encode_binary, decode_message, to_json_text
+
+    tick = MarketData(symbol="005930", price=75000.0, change=0.67, volume=1234.0, timestamp=datetime.now())
+    raw = encode_binary(tick)
+    assert len(raw) < len(tick.model_dump_json()) / 2
+    assert decode_message(raw) == json.loads(tick.model_dump_json())
+    assert MarketData.model_validate(decode_message(raw)) == tick
+
+    book = OrderbookData(
+        symbol="DNASNVDA",
+        asks=[OrderbookUnit(price=100.0 + i, vol=10.0 * i) for i in range(5)],
+        bids=[OrderbookUnit(price=99.0 - i, vol=5.0 * i) for i in range(5)],
+    )
+    raw = encode_binary(book)
+    assert decode_message(raw) == json.loads(book.model_dump_json())
+    assert json.loads(to_json_text(raw))["asks"][4] == {"price": 104.0, "vol": 40.0}
+
+    # 전체 레벨(9) + 총잔량 포함 호가
+    full = book.model_copy(update={
+        "asks": [OrderbookUnit(price=100.0 + i, vol=1.0) for i in range(9)],
+        "bids": [OrderbookUnit(price=99.0 - i, vol=2.0) for i in range(9)],
+        "total_ask_vol": 9.0, "total_bid_vol": 18.0,
+    })
+    assert decode_message(encode_binary(full)) == json.loads(full.model_dump_json())
+
+    # JSON 메시지(문자열/바이트)는 그대로 처리
+    assert decode_message(tick.model_dump_json().encode())["symbol"] == "005930"
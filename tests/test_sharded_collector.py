@@ -0,0 +1,46 @@
+import pytest
+from src.data_ingestion.price.sharded_collector import (
+    partition_subscriptions, rebalance_subscriptions, apply_assignment, to_assignment
+)
+from src.data_ingestion.price.kr.real_collector import KRRealCollector
+
+
+def _keys(market, tr_id, n):
+    return [(market, tr_id, f"{market}{i:03d}") for i in range(n)]
+
+
+def test_partition_balances_each_market():
+    """시장별로 샤드 부하가 균등하게 분배되는지 검증"""
+    keys = _keys("KR", "H0STCNT0", 10) + _keys("US", "HDFSCNT0", 5)
+    plan = partition_subscriptions(keys, 3)
+
+    assert sorted(k for shard in plan.values() for k in shard) == sorted(keys)
+    kr_loads = [sum(1 for k in shard if k[0] == "KR") for shard in plan.values()]
+    assert max(kr_loads) - min(kr_loads) <= 1
+
+
+def test_rebalance_moves_orphans_to_live_shards_with_capacity():
+    """종료 샤드의 구독은 생존 샤드로, 상한 초과분은 overflow로 반환"""
+    plan = {
+        0: _keys("KR", "H0STCNT0", 3),
+        1: _keys("KR", "H0STASP0", 2),
+        2: [("KR", "H0STCNT0", f"DEAD{i}") for i in range(1, 5)],
+    }
+    plan, overflow = rebalance_subscriptions(plan, dead_shard=2, capacity=4)
+
+    assert 2 not in plan
+    assert len(plan[0]) == 4 and len(plan[1]) == 4
+    assert overflow == [("KR", "H0STCNT0", "DEAD4")]
+
+
+def test_apply_assignment_filters_symbols_and_reports_additions():
+    """샤드 할당이 refresh_symbols 결과를 제한하고, 재할당 시 추가분만 반환"""
+    collector = KRRealCollector()
+    all_symbols = collector.load_symbols()
+    mine, extra = all_symbols[:2], all_symbols[2:3]
+
+    apply_assignment([collector], to_assignment([("KR", "H0STCNT0", s) for s in mine]))
+    assert sorted(collector.refresh_symbols()) == sorted(mine)
+
+    added = apply_assignment([collector], to_assignment([("KR", "H0STCNT0", s) for s in mine + extra]))
+    assert added == {"H0STCNT0": extra}
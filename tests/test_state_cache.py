@@ -0,0 +1,177 @@
+import asyncio
+import os
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from src.api.main import app, latest_state
+from src.api.state_cache import LatestStateCache, TTLCache
+
+API_AUTH_SECRET = os.getenv("API_AUTH_SECRET", "super-secret-key")
+
+
+def _tick(symbol, price):
+    return {"type": "ticker", "symbol": symbol, "price": price, "volume": 1.0, "change": 0.1,
+            "timestamp": datetime.now().isoformat()}
+
+
+def test_tick_ring_answers_within_capacity_only():
+    cache = LatestStateCache(tick_capacity=3)
+    for i in range(5):
+        cache.update(_tick("005930", 100.0 + i))
+
+    rows = cache.recent_ticks("005930", 3)
+    assert [r["price"] for r in rows] == [104.0, 103.0, 102.0]  # 최신순, 오래된 틱은 밀려남
+    assert cache.recent_ticks("005930", 4) is None  # 보유량 초과 -> DB 조회
+    assert cache.recent_ticks("000660", 1) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_endpoints_answer_from_memory_without_db():
+    for i in range(10):
+        latest_state.update(_tick("CACHED", 200.0 + i))
+    latest_state.update({
+        "type": "orderbook", "symbol": "CACHED", "timestamp": datetime.now().isoformat(),
+        "asks": [{"price": 201.0 + i, "vol": 10.0} for i in range(9)],
+        "bids": [{"price": 199.0 - i, "vol": 20.0} for i in range(9)],
+    })
+
+    with TestClient(app) as client:
+        headers = {"x-api-key": API_AUTH_SECRET}
+        ticks = client.get("/api/v1/ticks/CACHED?limit=5", headers=headers)
+        book = client.get("/api/v1/orderbook/CACHED", headers=headers)
+
+    assert ticks.status_code == 200
+    assert [t["price"] for t in ticks.json()] == [209.0, 208.0, 207.0, 206.0, 205.0]
+    assert book.status_code == 200
+    assert book.json()["ask_price1"] == 201.0 and book.json()["bid_vol5"] == 20.0
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_single_flight_and_expiry():
+    calls = []
+
+    async def probe():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return len(calls)
+
+    cache = TTLCache(ttl=0.05)
+    results = await asyncio.gather(*(cache.get("health", probe) for _ in range(20)))
+    assert results == [1] * 20 and len(calls) == 1  # 동시 요청 20건 -> 프로브 1회
+    assert await cache.get("health", probe) == 1
+
+    await asyncio.sleep(0.06)
+    assert await cache.get("health", probe) == 2
+
+
+def test_health_endpoints_are_cached():
+    with TestClient(app) as client:
+        first = client.get("/api/v1/health/detailed").json()
+        second = client.get("/api/v1/health/detailed").json()
+        basic = client.get("/api/v1/health").json()
+
+    assert first == second  # TTL 내 재요청은 캐시 응답 (timestamp 동일)
+    assert set(first) == {"timestamp", "status", "database", "redis", "collectors", "sentinel"}
+    assert basic["status"] in ("healthy", "degraded", "unhealthy")
+
+
+class _SnapshotConn:
+    def __init__(self):
+        self.fetches = 0
+
+    async def fetch(self, query, *args):
+        self.fetches += 1
+        return [{"symbol": "005930", "time": datetime.now(), "close": 110.0, "volume": 5.0, "prev_close": 100.0}]
+
+
+class _SnapshotPool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        pool = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+    async def close(self):
+        pass
+
+
+def test_market_map_served_from_snapshot_with_etag(monkeypatch):
+    import src.api.main as api_main
+
+    conn = _SnapshotConn()
+    monkeypatch.setattr(api_main, "db_pool", _SnapshotPool(conn))
+    monkeypatch.setattr(api_main, "daily_snapshot_ready", True)
+    api_main.snapshot_cache.invalidate()
+
+    with TestClient(app) as client:
+        headers = {"x-api-key": API_AUTH_SECRET}
+        first = client.get("/api/v1/market-map/kr", headers=headers)
+        etag = first.headers["etag"]
+        again = client.get("/api/v1/market-map/kr", headers={**headers, "If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert first.json()["symbols"][0]["change"] == 10.0
+    assert again.status_code == 304  # 데이터 변화 없음 -> 본문 생략
+    assert conn.fetches == 1  # TTL 내 재요청은 스냅샷 조회 생략
+    api_main.snapshot_cache.invalidate()
+
+
+@pytest.mark.asyncio
+async def test_stream_subscriber_feeds_state_cache(monkeypatch):
+    import json
+    import src.api.main as api_main
+    from src.core.stream_transport import STREAM_FIELD, stream_key
+
+    tick = _tick("STREAMED", 123.0)
+
+    class _StreamRedis:
+        def __init__(self):
+            self.responses = [[[stream_key("ticker.kr").encode(),
+                                [(b"1-0", {STREAM_FIELD: json.dumps(tick).encode()})]]]]
+            self.acked = []
+
+        async def xgroup_create(self, *args, **kwargs):
+            pass
+
+        async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+            if self.responses:
+                return self.responses.pop(0)
+            await asyncio.Event().wait()
+
+        def pipeline(self, transaction=False):
+            redis_client = self
+
+            class _Pipe:
+                async def __aenter__(self):
+                    return self
+
+                async def __aexit__(self, *exc):
+                    return False
+
+                def xack(self, key, group, *ids):
+                    redis_client.acked.extend(ids)
+
+                async def execute(self):
+                    return [len(redis_client.acked)]
+
+            return _Pipe()
+
+    published = []
+    monkeypatch.setattr(api_main.manager, "publish", lambda *args: published.append(args[0]))
+    redis_client = _StreamRedis()
+    task = asyncio.create_task(api_main.stream_subscriber(redis_client, api_main.OrderbookRebuilder()))
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert latest_state.recent_ticks("STREAMED", 1)[0]["price"] == 123.0
+    assert published == ["ticker.kr"] and redis_client.acked == [b"1-0"]
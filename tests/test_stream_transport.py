@@ -0,0 +1,109 @@
+import pytest
+from src.core.stream_transport import StreamConsumer, queue_publish, stream_key, STREAM_FIELD
+
+
+class _RecordingPipeline:
+    """redis.asyncio pipeline 대역 (publish/xadd/xack 호출 기록)"""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def publish(self, channel, data):
+        self.calls.append(("publish", channel, data))
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.calls.append(("xadd", key, fields[STREAM_FIELD]))
+
+    def xack(self, key, group, *ids):
+        self.calls.append(("xack", key, ids))
+
+    async def execute(self):
+        return [len(c[2]) for c in self.calls if c[0] == "xack"]
+
+
+class _FakeStreamRedis:
+    """xreadgroup 응답을 순서대로 반환하는 Redis 대역"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.read_ids = []
+        self.calls = []
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        self.read_ids.append(dict(streams))
+        return self.responses.pop(0) if self.responses else []
+
+    def pipeline(self, transaction=False):
+        return _RecordingPipeline(self.calls)
+
+
+@pytest.mark.parametrize("mode, channel, expected", [
+    ("pubsub", "ticker.kr", ["publish"]),
+    ("streams", "ticker.kr", ["xadd"]),
+    ("both", "orderbook.us", ["publish", "xadd"]),
+    ("streams", "system.metrics", ["publish"]),  # Streams 대상이 아닌 채널은 Pub/Sub 유지
+])
+def test_queue_publish_routes_by_mode(mode, channel, expected):
+    calls = []
+    queue_publish(_RecordingPipeline(calls), channel, "{}", mode=mode)
+    assert [c[0] for c in calls] == expected
+
+
+@pytest.mark.asyncio
+async def test_stream_consumer_replays_pending_then_reads_new():
+    """재시작 직후 pending 엔트리를 먼저 재처리하고, 소진되면 신규('>') 수신으로 전환"""
+    key = stream_key("ticker.kr")
+    redis_client = _FakeStreamRedis([
+        [[key.encode(), [(b"1-0", {STREAM_FIELD: b"a"}), (b"2-0", {STREAM_FIELD: b"b"})]]],
+        [[key.encode(), []]],
+        [[key.encode(), [(b"3-0", {STREAM_FIELD: b"c"})]]],
+    ])
+    consumer = StreamConsumer(redis_client, group="archiver", channels=["ticker.kr"])
+
+    replayed = await consumer.read()
+    assert [(ch, payload) for ch, _, payload in replayed] == [("ticker.kr", b"a"), ("ticker.kr", b"b")]
+    assert await consumer.read() == []
+    fresh = await consumer.read()
+
+    assert [ids[key] for ids in redis_client.read_ids] == ["0", b"2-0", ">"]
+    assert fresh == [("ticker.kr", b"3-0", b"c")]
+    assert consumer.stats()["replayed"] == 2
+
+    await consumer.ack([("ticker.kr", b"1-0"), ("ticker.kr", b"2-0"), ("ticker.kr", b"3-0")])
+    assert redis_client.calls == [("xack", key, (b"1-0", b"2-0", b"3-0"))]
+    assert consumer.stats()["acked"] == 3
+
+
+class _GroupRedis(_FakeStreamRedis):
+    """그룹이 이미 존재하는 Redis 대역 (xgroup_create -> BUSYGROUP)"""
+
+    def __init__(self, responses):
+        super().__init__(responses)
+        self.set_ids = []
+
+    async def xgroup_create(self, key, group, id="0", mkstream=False):
+        from redis.exceptions import ResponseError
+        raise ResponseError("BUSYGROUP Consumer Group name already exists")
+
+    async def xgroup_setid(self, key, group, id):
+        self.set_ids.append((key, group, id))
+
+
+@pytest.mark.asyncio
+async def test_live_consumer_skips_backlog_on_restart():
+    key = stream_key("ticker.kr")
+    redis_client = _GroupRedis([[[key.encode(), [(b"9-0", {STREAM_FIELD: b"x"})]]]])
+    consumer = StreamConsumer(redis_client, group="api-host", channels=["ticker.kr"], live=True)
+
+    await consumer.ensure_groups()
+    entries = await consumer.read()
+
+    assert redis_client.set_ids == [(key, "api-host", "$")]  # 기존 그룹 -> 최신 위치로 이동
+    assert redis_client.read_ids == [{key: ">"}]  # pending 재처리 없음
+    assert entries == [("ticker.kr", b"9-0", b"x")]
@@ -0,0 +1,126 @@
+import io
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes import ticks
+
+API_AUTH_SECRET = os.getenv("API_AUTH_SECRET", "super-secret-key")
+BASE = datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc)
+
+
+def _make_rows():
+    rows = []
+    for i in range(10):
+        for symbol in ("000660", "005930"):
+            rows.append({"time": BASE + timedelta(seconds=i), "symbol": symbol,
+                         "price": 100.0 + i, "volume": 1.0, "change": 0.1})
+    # 같은 (time, symbol) 틱 2건 (체결 분할)
+    rows.append({"time": BASE + timedelta(seconds=4), "symbol": "005930", "price": 104.5, "volume": 2.0, "change": 0.1})
+    return sorted(rows, key=lambda r: (r["time"], r["symbol"]))
+
+
+class _Cursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.fetch_sizes = []
+
+    async def fetch(self, n):
+        self.fetch_sizes.append(n)
+        batch, self.rows = self.rows[:n], self.rows[n:]
+        return batch
+
+
+class _Ctx:
+    def __init__(self, value=None):
+        self.value = value
+
+    async def __aenter__(self):
+        return self.value
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Conn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.cursors = []
+
+    def transaction(self):
+        return _Ctx()
+
+    async def cursor(self, query, start, end, symbols, after_time, after_symbol):
+        rows = [r for r in self.rows if start <= r["time"] < end
+                and (symbols is None or r["symbol"] in symbols)
+                and (after_time is None or (r["time"], r["symbol"]) > (after_time, after_symbol))]
+        cursor = _Cursor(rows)
+        self.cursors.append(cursor)
+        return cursor
+
+
+class _Pool:
+    def __init__(self, rows):
+        self.conn = _Conn(rows)
+
+    def acquire(self):
+        return _Ctx(self.conn)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(ticks, "TICK_STREAM_BATCH", 3)
+    app = FastAPI()
+    app.include_router(ticks.router)
+    app.state.db_pool = _Pool(_make_rows())
+    with TestClient(app, headers={"x-api-key": API_AUTH_SECRET}) as test_client:
+        yield test_client
+
+
+def _params(**extra):
+    return {"start": BASE.isoformat(), "end": (BASE + timedelta(minutes=1)).isoformat(), **extra}
+
+
+def test_json_pages_follow_keyset_cursor_without_splitting_ties(client):
+    seen, after = [], None
+    while True:
+        params = _params(limit=4, **({"after": after} if after else {}))
+        body = client.get("/api/v1/ticks/history", params=params).json()
+        seen.extend(body["rows"])
+        after = body["next"]
+        if after is None:
+            break
+
+    assert len(seen) == 21  # 중복 키 틱 포함 전건, 누락/중복 없음
+    keys = [(r["time"], r["symbol"], r["price"]) for r in seen]
+    assert len(set(keys)) == 21
+    assert keys == sorted(keys, key=lambda k: (k[0], k[1]))
+
+
+def test_ndjson_streams_rows_then_cursor(client):
+    response = client.get("/api/v1/ticks/history", params=_params(symbols="005930", format="ndjson", limit=100))
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [r["symbol"] for r in lines[:-1]] == ["005930"] * 11
+    assert lines[-1] == {"next": None}
+    assert client.app.state.db_pool.conn.cursors[-1].fetch_sizes[0] == 3  # 배치 단위 커서 읽기
+
+
+def test_arrow_ipc_stream_roundtrip(client):
+    pa = pytest.importorskip("pyarrow")
+    response = client.get("/api/v1/ticks/history", params=_params(format="arrow", limit=5))
+    table = pa.ipc.open_stream(io.BytesIO(response.content)).read_all()
+
+    assert table.column_names == ["time", "symbol", "price", "volume", "change"]
+    assert table.num_rows == 5
+    assert table.column("symbol").to_pylist()[:2] == ["000660", "005930"]
+
+
+def test_rejects_bad_cursor_and_format(client):
+    assert client.get("/api/v1/ticks/history", params=_params(after="not-a-cursor")).status_code == 400
+    assert client.get("/api/v1/ticks/history", params=_params(format="csv")).status_code == 400
@@ -4,6 +4,7 @@ import json
 import asyncpg
 import redis.asyncio as redis
 from datetime import datetime
+from src.data_ingestion.archiver import timescale_archiver
 from src.data_ingestion.archiver.timescale_archiver import TimescaleArchiver, DB_USER, DB_PASSWORD, DB_NAME, DB_HOST, DB_PORT
 
 @pytest.fixture(scope="module")
@@ -68,3 +69,156 @@ async def test_save_orderbook_to_timescale(archiver):
             await conn.execute("DELETE FROM market_orderbook WHERE symbol = 'TEST_OB'")
     finally:
         await archiver.db_pool.close()
+
+
+class _SlowCopyPool:
+    """asyncpg pool 대역: COPY에 지연을 주고 적재된 배치를 기록 (fail_first: 첫 COPY 실패)"""
+
+    def __init__(self, delay=0.05, fail_first=False):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.copied = []
+        self.tables = []
+
+    def acquire(self):
+        pool = self
+
+        class _Conn:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                return False
+
+            async def copy_records_to_table(self, table, records, columns):
+                await asyncio.sleep(pool.delay)
+                if pool.fail_first:
+                    pool.fail_first = False
+                    raise ConnectionError("db down")
+                pool.copied.append(list(records))
+                pool.tables.append(table)
+
+        return _Conn()
+
+
+def _tick(i):
+    return {"symbol": "005930", "price": 75000.0 + i, "volume": 1.0, "change": 0.0,
+            "timestamp": datetime.now().isoformat()}
+
+
+@pytest.mark.asyncio
+async def test_writer_copies_sealed_buffer_while_listener_appends():
+    """COPY 진행 중에도 활성 버퍼에 계속 적재되고, 모든 틱이 정확히 한 번 적재되는지 검증"""
+    archiver = TimescaleArchiver()
+    archiver.db_pool = _SlowCopyPool(delay=0.05, fail_first=True)
+    archiver.batch_size = 10
+    writer = asyncio.create_task(archiver.writer_loop())
+
+    for i in range(200):
+        archiver.queue_tick("ticker.kr", _tick(i))
+        await archiver.tick_queued()
+        await asyncio.sleep(0.001)
+
+    archiver.running = False
+    archiver._flush_requested.set()
+    await asyncio.wait_for(writer, timeout=10)
+
+    prices = [row[2] for batch in archiver.db_pool.copied for row in batch]
+    assert sorted(prices) == [75000.0 + i for i in range(200)]
+    assert len(prices) == len(set(prices))  # 실패 후 재시도에도 중복 적재 없음
+    assert archiver.batch == []
+
+
+@pytest.mark.asyncio
+async def test_backpressure_holds_until_copy_succeeds(monkeypatch):
+    """COPY 실패 시 수신 대기가 풀리지 않아 복원된 버퍼가 상한을 넘어 불어나지 않는지 검증"""
+    monkeypatch.setattr(timescale_archiver, "MAX_BUFFERED_ROWS", 20)
+    monkeypatch.setattr(timescale_archiver, "FLUSH_RETRY_DELAY", 0.01)
+    archiver = TimescaleArchiver()
+    archiver.db_pool = _SlowCopyPool(delay=0.05, fail_first=True)
+    archiver.batch_size = 1000  # 상한 도달로만 플러시
+    writer = asyncio.create_task(archiver.writer_loop())
+
+    for i in range(60):
+        archiver.queue_tick("ticker.kr", _tick(i))
+        await archiver.tick_queued()
+        await asyncio.sleep(0.001)
+
+    archiver.running = False
+    archiver._flush_requested.set()
+    await asyncio.wait_for(writer, timeout=10)
+
+    assert max(len(batch) for batch in archiver.db_pool.copied) <= 20  # 재시도 배치 = 복원된 봉인 버퍼만
+    prices = [row[2] for batch in archiver.db_pool.copied for row in batch]
+    assert sorted(prices) == [75000.0 + i for i in range(60)]
+
+
+def test_batch_size_adapts_to_arrival_rate():
+    archiver = TimescaleArchiver()
+    archiver._adapt_batch_size(rows=5000, fill_sec=0.5, commit_sec=0.5)  # 10k rows/s
+    grown = archiver.batch_size
+    assert grown > 100
+    for _ in range(20):
+        archiver._adapt_batch_size(rows=10, fill_sec=5.0, commit_sec=0.01)  # 2 rows/s
+    assert archiver.batch_size < grown
+
+
+def _book(i):
+    return {"symbol": "005930", "timestamp": datetime.now().isoformat(),
+            "asks": [{"price": 75100.0 + i + lv, "vol": 10.0} for lv in range(5)],
+            "bids": [{"price": 74900.0 + i - lv, "vol": 20.0} for lv in range(5)]}
+
+
+@pytest.mark.asyncio
+async def test_orderbooks_are_batched_into_copy():
+    """호가 스냅샷이 단건 INSERT 대신 market_orderbook COPY 배치로 적재되는지 검증"""
+    archiver = TimescaleArchiver()
+    archiver.db_pool = _SlowCopyPool(delay=0.01, fail_first=True)
+    writer = asyncio.create_task(archiver.orderbook_writer_loop())
+
+    for i in range(1200):
+        await archiver.queue_orderbook(_book(i))
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+
+    archiver.running = False
+    archiver._orderbook_requested.set()
+    await asyncio.wait_for(writer, timeout=10)
+
+    rows = [row for batch in archiver.db_pool.copied for row in batch]
+    assert set(archiver.db_pool.tables) == {"market_orderbook"}
+    assert len(archiver.db_pool.copied) < 10
+    assert sorted(row[2] for row in rows) == [75100.0 + i for i in range(1200)]  # ask_price1
+    assert len(rows[0]) == 22
+    assert archiver.rows_written["market_orderbook"] == 1200
+
+
+def test_depth_row_packs_all_levels():
+    book = _book(0)
+    book["asks"] += [{"price": 75200.0 + lv, "vol": 1.0} for lv in range(4)]
+    book["bids"] += [{"price": 74800.0 - lv, "vol": 2.0} for lv in range(4)]
+    book["total_ask_vol"], book["total_bid_vol"] = 54.0, 108.0
+
+    _, symbol, levels, total_ask, total_bid = TimescaleArchiver.depth_row(book)
+
+    assert symbol == "005930"
+    assert [len(side) for side in levels] == [9, 9, 9, 9]
+    assert levels[0][0] == 75100.0 and levels[3][8] == 2.0
+    assert (total_ask, total_bid) == (54.0, 108.0)
+
+
+@pytest.mark.asyncio
+async def test_orderbook_deltas_are_rebuilt_before_queueing():
+    from src.core.orderbook_delta import OrderbookDeltaEncoder
+    from src.core.schema import OrderbookData
+
+    archiver = TimescaleArchiver()
+    encoder = OrderbookDeltaEncoder(snapshot_interval=3600)
+    messages = [json.loads(encoder.encode(OrderbookData(**_book(i))).model_dump_json()) for i in range(3)]
+
+    assert not await archiver.queue_orderbook(messages[1])  # snapshot 수신 전 delta는 적재하지 않음
+    for message in messages:
+        await archiver.queue_orderbook(message)
+
+    assert [row[2] for row in archiver.orderbook_batch] == [75100.0, 75101.0, 75102.0]
+    assert len(archiver.orderbook_batch[-1]) == 22
@@ -1,5 +1,6 @@
 import pytest
 import asyncio
+import json
 from unittest.mock import MagicMock, AsyncMock
 from src.data_ingestion.price.common.websocket_dual import DualWebSocketManager
 
@@ -46,3 +47,252 @@ async def test_handle_message_pingpong(manager):
     message = '{"header":{"tr_id":"PINGPONG","datetime":"20230101120000"}}'
     res = await manager._handle_message(message, source="tick")
     assert res == "PONG"
+
+class _FakePipeline:
+    """redis.asyncio pipeline 대역 (publish 호출 기록)"""
+    def __init__(self, sink):
+        self.sink = sink
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def publish(self, channel, data):
+        self.sink.append((channel, data))
+
+    async def execute(self):
+        return []
+
+@pytest.mark.asyncio
+async def test_handle_message_multi_record_frame(manager):
+    """parts[2] 레코드 수만큼 모든 레코드를 파싱하여 한 번에 발행하는지 검증"""
+    from src.data_ingestion.price.kr.real_collector import KRRealCollector
+    manager.collectors["H0STCNT0"] = KRRealCollector()
+
+    published = []
+    manager.redis = MagicMock()
+    manager.redis.pipeline.return_value = _FakePipeline(published)
+
+    records = [
+        "005930^093001^75000^2^500^0.67^74900^100",
+        "000660^093001^180000^2^1000^0.56^179000^200",
+        "005930^093002^75100^2^600^0.80^74900^300",
+    ]
+    message = f"0|H0STCNT0|003|{'^'.join(records)}"
+
+    res = await manager._handle_message(message, source="tick")
+
+    assert res == "H0STCNT0"
+    assert [ch for ch, _ in published] == ["ticker.kr"] * 3
+    assert [json.loads(data)["symbol"] for _, data in published] == ["005930", "000660", "005930"]
+    assert json.loads(published[1][1])["price"] == 180000.0
+
+def test_frame_queue_drops_oldest_orderbook_never_ticks():
+    """큐 포화 시 가장 오래된 호가 프레임만 제거되고 체결 프레임은 유지되는지 검증"""
+    from src.data_ingestion.price.common.frame_queue import FrameQueue
+    queue = FrameQueue(maxsize=3)
+
+    queue.put("ob-1", "orderbook")
+    queue.put("ob-2", "orderbook")
+    queue.put("tick-1", "tick")
+    queue.put("tick-2", "tick")   # 포화 -> ob-1 제거
+    queue.put("tick-3", "tick")   # 포화 -> ob-2 제거
+    queue.put("tick-4", "tick")   # 제거할 호가 없음 -> keep 정책으로 초과 적재
+
+    stats = queue.stats()
+    assert stats["dropped_orderbook"] == 2
+    assert stats["dropped_tick"] == 0
+    assert stats["overflow"] == 1
+    assert stats["depth_tick"] == 4
+    assert stats["high_water"] == 4
+
+@pytest.mark.asyncio
+async def test_frame_queue_serves_ticks_first():
+    """Consumer는 체결 프레임을 호가보다 먼저 소비"""
+    from src.data_ingestion.price.common.frame_queue import FrameQueue
+    queue = FrameQueue(maxsize=10)
+    queue.put("ob-1", "orderbook")
+    queue.put("tick-1", "tick")
+
+    assert await queue.get() == ("tick-1", "tick", 0)
+    assert await queue.get() == ("ob-1", "orderbook", 0)
+
+
+class _ConfirmingWebSocket:
+    """구독 요청마다 KIS 응답을 역순으로 비동기 전송하는 WebSocket 대역 (첫 요청 1건은 실패 응답)"""
+
+    def __init__(self, manager, fail_once):
+        self.manager = manager
+        self.fail_once = set(fail_once)
+        self.sent = []
+
+    async def send(self, raw):
+        header = json.loads(raw)["body"]["input"]
+        key = (header["tr_id"], header["tr_key"])
+        self.sent.append(key)
+        msg = "SUBSCRIBE ERROR" if key in self.fail_once else "SUBSCRIBE SUCCESS"
+        self.fail_once.discard(key)
+        response = json.dumps({"header": {"tr_id": key[0], "tr_key": key[1]}, "body": {"msg1": msg}})
+        # 나중에 보낸 요청의 응답이 먼저 도착하도록 지연 차등
+        asyncio.get_running_loop().call_later(0.05 / len(self.sent), lambda: asyncio.ensure_future(self.manager.handle_message(response)))
+
+
+@pytest.mark.asyncio
+async def test_subscribe_market_pipelines_requests_and_retries_failures():
+    """구독 요청을 병렬 전송하고 (tr_id, tr_key)로 응답을 매칭, 실패분만 재시도"""
+    from src.data_ingestion.price.common.websocket_base import UnifiedWebSocketManager
+    from src.data_ingestion.price.common.subscription import TokenBucket
+
+    tick, book = MagicMock(market="KR", tr_id="H0STCNT0"), MagicMock(market="KR", tr_id="H0STASP0")
+    tick.symbols = ["005930", "000660"]
+    book.symbols = ["005930"]  # 동일 종목이 다른 tr_id로 동시에 in-flight
+    manager = UnifiedWebSocketManager([tick, book], redis_url="redis://localhost:6379")
+    manager.raw_logger = MagicMock(log=AsyncMock())
+    manager.subscribe_bucket = TokenBucket(rate=1000, burst=100)
+    manager.approval_key = "key"
+    manager.websocket = _ConfirmingWebSocket(manager, fail_once=[("H0STASP0", "005930")])
+
+    assert await manager.subscribe_market("KR")
+
+    report = manager.subscription_reports["KR"]
+    assert (report.total, report.confirmed, report.requests, report.rounds) == (3, 3, 4, 2)
+    assert report.failed == []
+    assert manager.websocket.sent[-1] == ("H0STASP0", "005930")  # 재시도는 실패 건만
+    assert "KR" in manager.active_markets
+
+
+@pytest.mark.asyncio
+async def test_dual_subscribe_market_pipelines_per_socket_with_confirmation(manager):
+    """Dual: 체결/호가 요청을 각 소켓으로 병렬 전송, 응답 매칭 후 실패분만 재시도"""
+    from src.data_ingestion.price.common.subscription import TokenBucket
+
+    tick, book = MagicMock(market="KR", tr_id="H0STCNT0"), MagicMock(market="KR", tr_id="H0STASP0")
+    tick.symbols = ["005930", "000660"]
+    book.symbols = ["005930"]
+    manager.collectors = {"H0STCNT0": tick, "H0STASP0": book}
+    manager.handle_message = lambda message: manager._handle_message(message, source="control")
+    manager.subscribe_bucket = TokenBucket(rate=1000, burst=100)
+    manager.approval_key = "key"
+    manager.ws_tick = _ConfirmingWebSocket(manager, fail_once=[])
+    manager.ws_orderbook = _ConfirmingWebSocket(manager, fail_once=[("H0STASP0", "005930")])
+
+    assert await manager.subscribe_market("KR")
+
+    report = manager.subscription_reports["KR"]
+    assert (report.total, report.confirmed, report.requests, report.rounds) == (3, 3, 4, 2)
+    assert sorted(manager.ws_tick.sent) == [("H0STCNT0", "000660"), ("H0STCNT0", "005930")]
+    assert manager.ws_orderbook.sent == [("H0STASP0", "005930")] * 2
+    assert "KR" in manager.active_markets
+
+
+class _QueueSocket(_ConfirmingWebSocket):
+    """async for 수신을 지원하는 WebSocket 대역 (close 시 수신 종료)"""
+
+    def __init__(self, manager, fail_once=()):
+        super().__init__(manager, fail_once)
+        self.inbox = asyncio.Queue()
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.inbox.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+    async def close(self):
+        self.closed = True
+        self.inbox.put_nowait(None)
+
+
+@pytest.mark.asyncio
+async def test_switch_url_standby_cuts_over_before_closing_old_socket(monkeypatch):
+    """Warm standby: 새 소켓 구독 완료 후 활성 소켓 교체, 그 다음에만 구 소켓 종료"""
+    import websockets
+    from src.data_ingestion.price.common.websocket_base import UnifiedWebSocketManager
+    from src.data_ingestion.price.common.subscription import TokenBucket
+
+    tick = MagicMock(market="KR", tr_id="H0STCNT0")
+    tick.symbols = ["005930"]
+    tick.get_channel.return_value = "ticker.kr"
+    manager = UnifiedWebSocketManager([tick], redis_url="redis://localhost:6379")
+    manager.raw_logger = MagicMock(log=AsyncMock())
+    manager.subscribe_bucket = TokenBucket(rate=1000, burst=100)
+    manager.approval_key = "key"
+
+    old = _QueueSocket(manager)
+    manager.websocket = old
+    manager.active_markets = {"US"}
+    standby = _QueueSocket(manager)
+
+    async def fake_connect(url, **kwargs):
+        # 구 소켓이 cut-over 전에 닫히면 안 됨
+        assert not old.closed
+        return standby
+
+    monkeypatch.setattr(websockets, "connect", fake_connect)
+
+    assert await manager.switch_url_standby("ws://kis/H0STCNT0", "KR")
+    assert manager.websocket is standby
+    assert manager.active_markets == {"KR"}
+    assert manager.current_ws_url == "ws://kis/H0STCNT0"
+    assert old.closed and not standby.closed
+    assert standby.sent == [("H0STCNT0", "005930")]
+
+    # cut-over 이후 데이터는 새 소켓에서만 라우팅
+    old_depth = manager.frame_queue.depth()
+    standby.inbox.put_nowait("0|H0STCNT0|001|005930^093001^75000")
+    await asyncio.sleep(0.01)
+    assert manager.frame_queue.depth() == old_depth + 1
+
+    await standby.close()
+    await manager._standby_reader
+
+
+
+@pytest.mark.asyncio
+async def test_dual_switch_url_standby_swaps_both_sockets_then_closes_old(manager, monkeypatch):
+    """Dual warm standby: 두 standby 소켓 구독 완료 후 교체, 구 소켓은 그 다음 종료, 연결 루프는 standby를 인계"""
+    import src.data_ingestion.price.common.websocket_dual as dual
+    from src.data_ingestion.price.common.subscription import TokenBucket
+
+    tick, book = MagicMock(market="KR", tr_id="H0STCNT0"), MagicMock(market="KR", tr_id="H0STASP0")
+    tick.symbols, book.symbols = ["005930"], ["005930"]
+    manager.collectors = {"H0STCNT0": tick, "H0STASP0": book}
+    manager.handle_message = lambda message: manager._handle_message(message, source="control")
+    manager.subscribe_bucket = TokenBucket(rate=1000, burst=100)
+    manager.approval_key = "key"
+
+    old_tick, old_book = _QueueSocket(manager), _QueueSocket(manager)
+    manager.ws_tick, manager.ws_orderbook = old_tick, old_book
+    manager.active_markets = {"US"}
+    standby = [_QueueSocket(manager), _QueueSocket(manager)]
+    connects = []
+
+    async def fake_connect(url, **kwargs):
+        assert not old_tick.closed and not old_book.closed  # 구 소켓은 cut-over 전에 닫히면 안 됨
+        connects.append(url)
+        return standby[len(connects) - 1]
+
+    monkeypatch.setattr(dual.websockets, "connect", fake_connect)
+
+    assert await manager.switch_url_standby("ws://kis/H0STCNT0", "KR")
+    assert (manager.ws_tick, manager.ws_orderbook) == tuple(standby)
+    assert manager.active_markets == {"KR"} and manager.current_ws_url == "ws://kis/H0STCNT0"
+    assert old_tick.closed and old_book.closed
+    assert standby[0].sent == [("H0STCNT0", "005930")] and standby[1].sent == [("H0STASP0", "005930")]
+
+    # 연결 루프는 새로 연결하지 않고 standby reader를 인계, 데이터는 활성 소켓에서만 라우팅
+    loop_task = asyncio.create_task(manager._maintain_connection("tick"))
+    depth = manager.frame_queue.depth()
+    standby[0].inbox.put_nowait("0|H0STCNT0|001|005930^093001^75000")
+    await asyncio.sleep(0.01)
+    assert manager.frame_queue.depth() == depth + 1
+    assert len(connects) == 2 and "tick" not in manager._standby_readers
+
+    loop_task.cancel()
+    await standby[1].close()